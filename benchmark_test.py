@@ -0,0 +1,721 @@
+# These are benchmarks for the hot paths of the sacn library.
+# They are skipped by default and can be run with `python -m pytest -s --run-benchmarks benchmark_test.py`.
+# Each benchmark prints its results to the console, use the -s flag of pytest to see them.
+
+import time
+import pytest
+from sacn.messages.data_packet import DataPacket
+
+
+def measure(function, *args, duration: float = 0.5) -> float:
+    """
+    Calls the function with the given arguments repeatedly for approx. the given duration.
+    :return: the number of calls per second
+    """
+    calls = 0
+    start = time.perf_counter()
+    end = start + duration
+    while time.perf_counter() < end:
+        for _ in range(100):
+            function(*args)
+        calls += 100
+    return calls / (time.perf_counter() - start)
+
+
+def make_raw_data_packet() -> bytes:
+    return bytes(DataPacket(
+        cid=tuple(range(0, 16)),
+        sourceName='Benchmark',
+        universe=1,
+        dmxData=tuple(x % 256 for x in range(0, 512))
+    ).getBytes())
+
+
+@pytest.mark.benchmark
+def test_benchmark_data_packet_decode():
+    raw_data = make_raw_data_packet()
+
+    def decode_with_setters(raw_data: bytes) -> DataPacket:
+        # this is how a packet was decoded before: every field is set through its validating property setter
+        raw_data = list(raw_data)
+        packet = DataPacket(cid=tuple(raw_data[22:38]), sourceName=bytes(raw_data[44:108]).decode('utf-8').replace('\0', ''),
+                            universe=(raw_data[113] << 8) + raw_data[114])
+        packet.priority = raw_data[108]
+        packet.syncAddr = (raw_data[109] << 8) + raw_data[110]
+        packet.sequence = raw_data[111]
+        packet.option_PreviewData = bool(raw_data[112] & 0b10000000)
+        packet.option_StreamTerminated = bool(raw_data[112] & 0b01000000)
+        packet.option_ForceSync = bool(raw_data[112] & 0b00100000)
+        packet.dmxStartCode = raw_data[125]
+        packet.dmxData = raw_data[126:638]
+        return packet
+
+    before = measure(decode_with_setters, raw_data)
+    after = measure(DataPacket.make_data_packet, raw_data)
+    print(f'\nDataPacket decode: validating setters: {before:.0f} packets/s; '
+          f'make_data_packet: {after:.0f} packets/s ({after / before:.1f}x)')
+    assert decode_with_setters(raw_data) == DataPacket.make_data_packet(raw_data)
+
+
+@pytest.mark.benchmark
+def test_benchmark_receiver_handler_on_data():
+    from sacn.receiving.receiver_handler import ReceiverHandler
+    from sacn.receiving.receiver_handler_test import ReceiverHandlerListenerTest
+    from sacn.receiving.receiver_socket_test import ReceiverSocketTest
+    handler = ReceiverHandler('', 0, ReceiverHandlerListenerTest(), ReceiverSocketTest())
+    raw_data = bytearray(make_raw_data_packet())
+
+    def on_data(raw_data: bytearray):
+        # a new sequence number each time, but the same DMX data: no callback has to be fired
+        raw_data[111] = (raw_data[111] + 1) & 0xFF
+        handler.on_data(raw_data, 0)
+
+    result = measure(on_data, raw_data)
+    print(f'\nReceiverHandler.on_data without data change: {result:.0f} packets/s')
+
+
+@pytest.mark.benchmark
+def test_benchmark_receiver_handler_non_data_packets():
+    from sacn.messages.sync_packet import SyncPacket
+    from sacn.receiving.receiver_handler import ReceiverHandler
+    from sacn.receiving.receiver_handler_test import ReceiverHandlerListenerTest
+    from sacn.receiving.receiver_socket_test import ReceiverSocketTest
+    handler = ReceiverHandler('', 0, ReceiverHandlerListenerTest(), ReceiverSocketTest())
+    raw_data = bytes(SyncPacket(cid=tuple(range(0, 16)), syncAddr=1).getBytes())
+
+    def classify_with_exception(raw_data: bytes):
+        # this is how non-data packets were sorted out before: by letting the data packet decoding fail
+        try:
+            DataPacket.make_data_packet(raw_data)
+        except TypeError:
+            pass
+
+    before = measure(classify_with_exception, raw_data)
+    after = measure(handler.on_data, raw_data, 0)
+    print(f'\nSync packet classification: exception: {before:.0f} packets/s; '
+          f'dispatch table: {after:.0f} packets/s ({after / before:.1f}x)')
+
+
+@pytest.mark.benchmark
+def test_benchmark_dmx_data_assignment():
+    from sacn.sending.output import Output
+    output = Output(DataPacket(cid=tuple(range(0, 16)), sourceName='Benchmark', universe=1))
+    data = bytearray(x % 256 for x in range(0, 512))
+
+    def assign(dmx_data):
+        output.dmx_data = dmx_data
+
+    before = measure(assign, tuple(data))
+    after = measure(assign, data)
+    print(f'\nOutput.dmx_data assignment: tuple: {before:.0f}/s; bytearray: {after:.0f}/s ({after / before:.1f}x)')
+
+
+@pytest.mark.benchmark
+def test_benchmark_output_memory():
+    import tracemalloc
+    from sacn.sending.output import Output
+    count = 5000
+    cid = tuple(range(0, 16))
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    outputs = [Output(DataPacket(cid=cid, sourceName='Benchmark', universe=(i % 63999) + 1)) for i in range(0, count)]
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in end.compare_to(start, 'filename'))
+    print(f'\nMemory per Output including its DataPacket: {size / len(outputs):.0f} bytes')
+
+
+@pytest.mark.benchmark
+def test_benchmark_universe_list_conversion():
+    from sacn.messages.root_layer import byte_tuple_to_int, int_to_bytes
+    from sacn.messages.universe_discovery import convert_raw_data_to_universes, convert_universes_to_raw_data
+    universes = tuple(range(1, 513))
+    raw_data = convert_universes_to_raw_data(universes)
+
+    def decode_per_entry(raw_data: bytes) -> tuple:
+        # this is how a page was decoded before: two bytes at a time
+        return tuple(byte_tuple_to_int((raw_data[i], raw_data[i + 1])) for i in range(0, len(raw_data), 2))
+
+    def encode_per_entry(universes: tuple) -> list:
+        # this is how a page was encoded before: one universe at a time
+        raw_data = []
+        for universe in universes:
+            raw_data.extend(int_to_bytes(universe))
+        return raw_data
+
+    before = measure(decode_per_entry, raw_data)
+    after = measure(convert_raw_data_to_universes, raw_data)
+    print(f'\nUniverse list decode of 512 universes: per entry: {1e6 / before:.1f}us; '
+          f'array: {1e6 / after:.1f}us ({after / before:.1f}x)')
+    before = measure(encode_per_entry, universes)
+    after = measure(convert_universes_to_raw_data, universes)
+    print(f'Universe list encode of 512 universes: per entry: {1e6 / before:.1f}us; '
+          f'array: {1e6 / after:.1f}us ({after / before:.1f}x)')
+    assert decode_per_entry(raw_data) == convert_raw_data_to_universes(raw_data)
+    assert bytes(encode_per_entry(universes)) == raw_data
+
+
+@pytest.mark.benchmark
+def test_benchmark_batch_sending():
+    from sacn.sending import mmsg
+    from sacn.sending.sender_socket_udp import SenderSocketUDP
+    if not mmsg.AVAILABLE:
+        pytest.skip('sendmmsg is not available on this system')
+    sender_socket = SenderSocketUDP(None, '127.0.0.1', 0, 30)
+    cid = tuple(range(0, 16))
+    packets = [DataPacket(cid=cid, sourceName='Benchmark', universe=universe) for universe in range(1, 1001)]
+
+    def send_frame():
+        # one frame with 1000 universes, which are send to the loopback interface
+        sender_socket.start_batch()
+        for packet in packets:
+            sender_socket.send_unicast(packet, '127.0.0.1')
+        sender_socket.send_batch()
+
+    sender_socket.batch_sending = False
+    before = measure(send_frame, duration=2)
+    sender_socket.batch_sending = True
+    after = measure(send_frame, duration=2)
+    sender_socket.stop()
+    print(f'\nFrame with 1000 universes: sendto: {1e3 / before:.2f}ms; sendmmsg: {1e3 / after:.2f}ms ({after / before:.1f}x)')
+
+
+@pytest.mark.benchmark
+def test_benchmark_sender_tick_idle_outputs():
+    from sacn.sending.output import Output
+    from sacn.sending.sender_handler import SenderHandler, SEND_OUT_INTERVAL
+    from sacn.sending.sender_socket_test import SenderSocketTest
+    cid = tuple(range(0, 16))
+    outputs = {universe: Output(DataPacket(cid=cid, sourceName='Benchmark', universe=universe))
+               for universe in range(1, 5001)}
+    handler = SenderHandler(cid, 'Benchmark', outputs, '0.0.0.0', 5568, 30, SenderSocketTest())
+    handler.universe_discovery = False
+    handler.on_periodic_callback(100.0)
+    # one output changes every tick, all others are idle
+    changing_output = outputs[1]
+
+    def scan_all_outputs(current_time: float):
+        # this is how a tick was done before: every output is checked
+        changing_output.dmx_data = (1,)
+        [handler.send_out(output, current_time) for output in list(outputs.values())
+            if output._changed or abs(current_time - output._last_time_send) >= SEND_OUT_INTERVAL]
+
+    def scheduled(current_time: float):
+        changing_output.dmx_data = (1,)
+        handler.on_periodic_callback(current_time)
+
+    before = measure(scan_all_outputs, 100.5)
+    after = measure(scheduled, 100.5)
+    print(f'\nSender tick with 5000 idle outputs: scan: {1e6 / before:.1f}us; schedule: {1e6 / after:.1f}us '
+          f'({after / before:.1f}x)')
+
+
+@pytest.mark.benchmark
+def test_benchmark_send_loop_frame_rate():
+    from sacn.sending.sender_socket_base import SenderSocketListener
+    from sacn.sending.sender_socket_udp import SenderSocketUDP
+    fps = 44
+    duration = 3
+
+    class Listener(SenderSocketListener):
+        def __init__(self):
+            self.times = []
+
+        def on_periodic_callback(self, current_time: float) -> None:
+            self.times.append(time.monotonic())
+            # some work for every frame
+            end = time.perf_counter() + 0.001
+            while time.perf_counter() < end:
+                pass
+            if self.times[-1] - self.times[0] >= duration:
+                sender_socket._enabled_flag = False
+
+    def relative_sleep_loop(listener: Listener):
+        # this is how the loop was done before: sleep for the rest of the frame after each frame
+        while sender_socket._enabled_flag:
+            time_stamp = time.time()
+            listener.on_periodic_callback(time_stamp)
+            time.sleep(max(0.0, (1 / fps) - (time.time() - time_stamp)))
+
+    def frame_rate(times: list) -> float:
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def run_send_loop(spin_time: float) -> str:
+        listener = Listener()
+        sender_socket._listener = listener
+        sender_socket.spin_time = spin_time
+        sender_socket.frame_statistics.reset()
+        sender_socket.send_loop()
+        statistics = sender_socket.frame_statistics
+        return f'{frame_rate(listener.times):.2f} fps (lateness: max {statistics.max_lateness * 1e6:.0f}us, ' \
+               f'mean {statistics.mean_lateness * 1e6:.0f}us)'
+
+    before = Listener()
+    sender_socket = SenderSocketUDP(before, '127.0.0.1', 0, fps)
+    relative_sleep_loop(before)
+    after = run_send_loop(0)
+    after_spin = run_send_loop(0.001)
+    sender_socket._socket.close()
+    print(f'\nSend loop at {fps} fps: relative sleep: {frame_rate(before.times):.2f} fps; deadlines: {after}; '
+          f'deadlines with 1ms spin: {after_spin}')
+
+
+@pytest.mark.benchmark
+def test_benchmark_set_channels():
+    from sacn.sending.output import Output
+    output = Output(DataPacket(cid=tuple(range(0, 16)), sourceName='Benchmark', universe=1))
+
+    def read_modify_write(address: int, values: tuple):
+        # this is how a few channels were changed before: read all data, change it and set all data
+        dmx_data = list(output.dmx_data)
+        dmx_data[address - 1:address - 1 + len(values)] = values
+        output.dmx_data = tuple(dmx_data)
+
+    before = measure(read_modify_write, 100, (1, 2, 3, 4))
+    after = measure(output.set_channels, 100, (1, 2, 3, 4))
+    print(f'\nChange of 4 channels: read-modify-write: {before:.0f}/s; set_channels: {after:.0f}/s ({after / before:.1f}x)')
+
+
+@pytest.mark.benchmark
+def test_benchmark_change_detection():
+    from sacn.sending.output import Output
+    from sacn.sending.sender_handler import SenderHandler
+    from sacn.sending.sender_socket_test import SenderSocketTest
+    cid = tuple(range(0, 16))
+    dmx_data = bytes(range(0, 256)) * 2
+
+    def sends_per_minute(change_detection: bool) -> int:
+        output = Output(DataPacket(cid=cid, sourceName='Benchmark', universe=1), change_detection=change_detection)
+        handler = SenderHandler(cid, 'Benchmark', {1: output}, '0.0.0.0', 5568, 60, SenderSocketTest())
+        handler.universe_discovery = False
+        sends = []
+        handler.socket.send_unicast = lambda data, destination: sends.append(data.sequence)
+        # the same frame is assigned on every tick for one minute at 60 fps
+        for tick in range(0, 60 * 60):
+            output.dmx_data = dmx_data
+            handler.on_periodic_callback(100 + tick / 60)
+        return len(sends)
+
+    before = sends_per_minute(False)
+    after = sends_per_minute(True)
+    output = Output(DataPacket(cid=cid, sourceName='Benchmark', universe=1, dmxData=dmx_data), change_detection=True)
+    compare = measure(output._packet.equalsDmxData, dmx_data)
+    print(f'\nSame frame at 60 fps for a minute: sends without change detection: {before}; with: {after}; '
+          f'compare of 512 slots: {1e6 / compare:.2f}us')
+
+
+@pytest.mark.benchmark
+def test_benchmark_frame_bank():
+    import multiprocessing
+    from sacn.sending.frame_bank import FrameBank
+    from sacn.sending.output import Output
+    from sacn.sending.sender_handler import SenderHandler
+    from sacn.sending.sender_socket_test import SenderSocketTest
+    cid = tuple(range(0, 16))
+    universes = 100
+    outputs = {universe: Output(DataPacket(cid=cid, sourceName='Benchmark', universe=universe))
+               for universe in range(1, universes + 1)}
+    handler = SenderHandler(cid, 'Benchmark', outputs, '0.0.0.0', 5568, 30, SenderSocketTest())
+    frames = [bytes((universe + slot) % 256 for slot in range(0, 512)) for universe in range(0, universes)]
+    receiving_end, sending_end = multiprocessing.Pipe(duplex=False)
+
+    def send_through_pipe():
+        # this is how the frames were transferred before: pickled through a pipe and assigned by the sender process
+        for index, frame in enumerate(frames):
+            sending_end.send((index + 1, frame))
+
+    def receive_from_pipe():
+        for _ in range(0, universes):
+            universe, data = receiving_end.recv()
+            outputs[universe].dmx_data = data
+
+    frame_bank = FrameBank(universes)
+    handler.attach_frame_bank(frame_bank, tuple(range(1, universes + 1)))
+
+    def write_to_bank():
+        for index, frame in enumerate(frames):
+            frame_bank.write(index, frame)
+
+    def read_from_bank():
+        write_to_bank()
+        handler.read_frame_bank()
+
+    pipe = measure(lambda: (send_through_pipe(), receive_from_pipe()))
+    bank_writer = measure(write_to_bank)
+    bank = 1 / (1 / measure(read_from_bank) - 1 / bank_writer)
+    unchanged = measure(handler.read_frame_bank)
+    frame_bank.close()
+    frame_bank.unlink()
+
+    # a big bank, in which only one frame changes every tick
+    big_bank = FrameBank(32000)
+    handler.attach_frame_bank(big_bank, tuple(range(1, universes + 1)) + (0,) * (32000 - universes))
+
+    def read_one_change_from_big_bank():
+        big_bank.write(50, frames[0])
+        handler.read_frame_bank()
+    one_change = 1 / (1 / measure(read_one_change_from_big_bank) - 1 / measure(big_bank.write, 50, frames[0]))
+    handler.attach_frame_bank(None)
+    big_bank.close()
+    big_bank.unlink()
+    print(f'\nTransfer of {universes} frames: pipe: {1e3 / pipe:.2f}ms; frame bank: writer {1e3 / bank_writer:.2f}ms, '
+          f'sender {1e3 / bank:.2f}ms; check of an unchanged bank: {1e6 / unchanged:.1f}us; '
+          f'one changed frame in a bank of 32000: {1e6 / one_change:.0f}us')
+
+
+@pytest.mark.benchmark
+def test_benchmark_async_sender_loop_lag():
+    import asyncio
+    import socket
+    from unittest import mock
+    import sacn
+    universes = 50
+    duration = 2
+
+    async def loop_lag(start, stop) -> str:
+        # a control server on the loop wakes up every millisecond, the lag is the time it wakes up too late
+        await start()
+        lags = []
+        end = time.monotonic() + duration
+        while time.monotonic() < end:
+            before = time.monotonic()
+            await asyncio.sleep(0.001)
+            lags.append(time.monotonic() - before - 0.001)
+        await stop()
+        lags.sort()
+        return f'median {lags[len(lags) // 2] * 1e3:.2f}ms, 99th percentile {lags[len(lags) * 99 // 100] * 1e3:.2f}ms, ' \
+               f'max {lags[-1] * 1e3:.2f}ms'
+
+    def activate(sender):
+        sender.universeDiscovery = False
+        for universe in range(1, universes + 1):
+            sender.activate_output(universe)
+            sender[universe].dmx_data = (1,)
+            sender[universe].change_detection = False
+        # every universe changes every frame
+        original = sender._sender_handler.on_periodic_callback
+
+        def on_periodic_callback(current_time: float):
+            for universe in range(1, universes + 1):
+                sender[universe].dmx_data = (int(current_time * 1000) % 256,)
+            original(current_time)
+        sender._sender_handler.on_periodic_callback = on_periodic_callback
+        sender._sender_handler.socket._listener = sender._sender_handler
+
+    async def start_thread():
+        thread_sender.start()
+
+    async def stop_thread():
+        thread_sender.stop()
+
+    # the packets are send to a socket that does not read them
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(('127.0.0.1', 0))
+    port = sink.getsockname()[1]
+    with mock.patch('sacn.sending.sender_socket_udp.DEFAULT_PORT', port), \
+            mock.patch('sacn.sending.sender_socket_asyncio.DEFAULT_PORT', port):
+        thread_sender = sacn.sACNsender(bind_address='127.0.0.1', bind_port=0, fps=44)
+        activate(thread_sender)
+        before = asyncio.run(loop_lag(start_thread, stop_thread))
+        async_sender = sacn.AsyncSACNSender(bind_address='127.0.0.1', bind_port=0, fps=44)
+        activate(async_sender)
+        after = asyncio.run(loop_lag(async_sender.start, async_sender.stop))
+    sink.close()
+    print(f'\nLoop lag with {universes} universes at 44 fps: sender thread: {before}; async sender: {after}')
+
+
+def _receive_all(sink) -> int:
+    received = 0
+    try:
+        while True:
+            sink.recv(1024)
+            received += 1
+    except BlockingIOError:
+        return received
+
+
+def _packets_per_universe_and_second(sender, sink, universes: int, fps: int, duration: float) -> float:
+    sender.universeDiscovery = False
+    for universe in range(1, universes + 1):
+        sender.activate_output(universe)
+    sender.start()
+    received = 0
+    start = time.monotonic()
+    next_frame = start
+    # all universes change every frame
+    while time.monotonic() - start < duration:
+        if time.monotonic() >= next_frame:
+            value = int(next_frame * fps) % 256
+            for universe in range(1, universes + 1):
+                sender[universe].set_channel(1, value)
+            next_frame += 1 / fps
+        received += _receive_all(sink)
+    sender.stop()
+    return received / universes / duration
+
+
+@pytest.mark.benchmark
+def test_benchmark_sharded_sender():
+    import os
+    import socket
+    import sacn
+    from sacn.sending.frame_bank import FrameBank
+    from sacn.sending.sender_socket_base import DEFAULT_PORT
+    universes = 1000
+    fps = 40
+    duration = 3
+    # the packets are counted by a socket on the default port, since the workers can not be configured otherwise
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 24)
+    try:
+        sink.bind(('127.0.0.1', DEFAULT_PORT))
+    except OSError:
+        pytest.skip('The default port is not available')
+    sink.setblocking(False)
+
+    before = _packets_per_universe_and_second(sacn.sACNsender(bind_address='127.0.0.1', bind_port=0, fps=fps),
+                                              sink, universes, fps, duration)
+    after = _packets_per_universe_and_second(
+        sacn.ShardedSACNSender(bind_address='127.0.0.1', bind_port=0, fps=fps, workers=2), sink, universes, fps, duration)
+    sink.close()
+    print(f'\n{universes} changing universes at {fps} fps on {os.cpu_count()} CPUs: one thread: {before:.1f} packets/s '
+          f'per universe; 2 workers: {after:.1f} packets/s per universe')
+
+    # the frame bank of one of the 2 workers with its half of the universes, where one frame changes every tick
+    from sacn.sharded_sender import _Worker
+    bank = FrameBank(-(-63999 // 2))
+    worker = _Worker(bank, sacn.sACNsender(bind_address='127.0.0.1', bind_port=0))
+    for index in range(0, universes // 2):
+        worker.activate(index + 1, index, {}, b'')
+
+    def read_one_change():
+        bank.write(0, (1,))
+        worker._handler.read_frame_bank()
+    used_frames = measure(read_one_change)
+    # this is how the bank was attached before: with the universes of all frames
+    worker._handler.attach_frame_bank(bank, tuple(worker._universes) + (0,) * (bank.size - len(worker._universes)))
+    all_frames = measure(read_one_change)
+    worker.close()
+    bank.unlink()
+    print(f'Read of one changed frame by a worker with {universes // 2} of {bank.size} frames: all frames: '
+          f'{1e6 / all_frames:.1f}us; used frames: {1e6 / used_frames:.1f}us')
+
+
+@pytest.mark.benchmark
+def test_benchmark_socket_option_syscalls():
+    import socket
+    from unittest import mock
+    from sacn.sending.sender_socket_udp import SenderSocketUDP
+    from sacn.sending.sender_socket_udp_test import FakeSocket
+    packet = DataPacket(tuple(range(0, 16)), 'Benchmark', 1)
+    universes = 100
+
+    def frame(sender_socket, ttls) -> int:
+        # one frame of multicast outputs and one universe discovery packet
+        sender_socket._socket.calls.clear()
+        for universe in range(0, universes):
+            sender_socket.send_multicast(packet, '239.255.0.1', ttls[universe % len(ttls)])
+        sender_socket.send_broadcast(packet)
+        return len(sender_socket._socket.calls)
+
+    def set_every_time(sender_socket):
+        # this is how the options were set before: before every packet
+        def send_multicast(data, destination, ttl):
+            sender_socket._socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+            sender_socket.send_packet(data.getBuffer(), destination)
+
+        def send_broadcast(data):
+            sender_socket._socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            sender_socket.send_packet(data.getBuffer(), '<broadcast>')
+        sender_socket.send_multicast = send_multicast
+        sender_socket.send_broadcast = send_broadcast
+
+    results = []
+    for ttls in ((8,), (8, 16)):
+        before_socket = SenderSocketUDP(None, '127.0.0.1', 0, 30)
+        after_socket = SenderSocketUDP(None, '127.0.0.1', 0, 30)
+        for sender_socket in (before_socket, after_socket):
+            sender_socket._socket.close()
+            sender_socket._socket = FakeSocket()
+        set_every_time(before_socket)
+        frame(after_socket, ttls)  # the first frame sets the options
+        results.append(f'{len(ttls)} TTL(s): {frame(before_socket, ttls)} -> {frame(after_socket, ttls)}')
+    # with sendmmsg, the packets of a frame are grouped by their TTL
+    batch_socket = SenderSocketUDP(None, '127.0.0.1', 0, 30)
+    batch_socket._socket.close()
+    batch_socket._socket = FakeSocket()
+    batch_socket.batch_sending = True
+    with mock.patch('sacn.sending.mmsg.send_batch', lambda sock, data, destinations, port: sock.calls.append('sendmmsg')):
+        def batch_frame(sender_socket, ttls) -> int:
+            sender_socket.start_batch()
+            calls = frame(sender_socket, ttls)
+            sender_socket.send_batch()
+            return calls + len(sender_socket._socket.calls)
+        batch_frame(batch_socket, (8, 16))
+        results.append(f'2 TTLs with sendmmsg: {batch_frame(batch_socket, (8, 16))}')
+    print(f'\nSyscalls per frame with {universes} multicast universes: {"; ".join(results)}')
+
+
+@pytest.mark.benchmark
+def test_benchmark_batch_receiving():
+    import socket
+    from sacn.receiving import mmsg
+    from sacn.receiving.receiver_socket_base import ReceiverSocketListener
+    from sacn.receiving.receiver_socket_udp import ReceiverSocketUDP
+    if not mmsg.AVAILABLE:
+        pytest.skip('recvmmsg is not available on this system')
+    packets = 1000
+    raw_data = make_raw_data_packet()
+
+    class Listener(ReceiverSocketListener):
+        def __init__(self):
+            self.count = 0
+            self.socket = None
+
+        def on_data(self, data, current_time: float) -> None:
+            self.count += 1
+            if self.count >= packets:
+                self.socket._enabled_flag = False
+
+        def on_periodic_callback(self, current_time: float) -> None:
+            pass
+
+    def drain(batch_receiving: bool) -> float:
+        # the packets are queued in the socket before the receive loop starts, like during a burst of traffic
+        listener = Listener()
+        receiver_socket = ReceiverSocketUDP(listener, '127.0.0.1', 0)
+        receiver_socket._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        receiver_socket.batch_receiving = batch_receiving
+        listener.socket = receiver_socket
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for _ in range(0, packets):
+            sender.sendto(raw_data, receiver_socket._socket.getsockname())
+        sender.close()
+        start = time.perf_counter()
+        receiver_socket.receive_loop()
+        duration = time.perf_counter() - start
+        receiver_socket._socket.close()
+        assert listener.count == packets
+        return duration
+
+    before = min(drain(False) for _ in range(0, 20))
+    after = min(drain(True) for _ in range(0, 20))
+    print(f'\nReceiving a burst of {packets} packets: recv: {before * 1e3:.2f}ms; recvmmsg: {after * 1e3:.2f}ms '
+          f'({before / after:.1f}x)')
+
+
+@pytest.mark.benchmark
+def test_benchmark_receiver_timeouts():
+    from sacn.receiving.receiver_handler import ReceiverHandler
+    from sacn.receiving.receiver_handler_test import ReceiverHandlerListenerTest
+    from sacn.receiving.receiver_socket_test import ReceiverSocketTest
+    universes = 3000
+    handler = ReceiverHandler('', 0, ReceiverHandlerListenerTest(), ReceiverSocketTest())
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName='Benchmark', universe=1)
+    for universe in range(1, universes + 1):
+        packet.universe = universe
+        handler.on_data(bytes(packet.getBytes()), 100)
+    raw_data = bytearray(packet.getBytes())
+    timestamps = dict.fromkeys(range(1, universes + 1), 100.0)
+
+    def check_timeout(current_time: float, time: float) -> bool:
+        return abs(int(round(current_time * 1000)) - int(round(time * 1000))) > 2500
+
+    def on_data_with_scan(raw_data: bytearray):
+        # this is how the receive loop worked before: all timestamps were scanned before every packet
+        for key, value in list(timestamps.items()):
+            if check_timeout(101, value):
+                handler.fire_timeout_callback_and_delete(key)
+        raw_data[111] = (raw_data[111] + 1) & 0xFF
+        handler.on_data(raw_data, 101)
+
+    def on_data_with_schedule(raw_data: bytearray):
+        # the receive loop only calls the periodic callback, if the next timeout is due
+        if handler.next_periodic_callback_time() <= 101:
+            handler.on_periodic_callback(101)
+        raw_data[111] = (raw_data[111] + 1) & 0xFF
+        handler.on_data(raw_data, 101)
+
+    before = measure(on_data_with_scan, raw_data)
+    after = measure(on_data_with_schedule, raw_data)
+    print(f'\nPackets with {universes} live universes: scan per packet: {before:.0f} packets/s; '
+          f'timeout schedule: {after:.0f} packets/s ({after / before:.1f}x)')
+
+
+@pytest.mark.benchmark
+def test_benchmark_multiple_sources():
+    from sacn.receiving.receiver_handler import ReceiverHandler
+    from sacn.receiving.receiver_handler_test import ReceiverHandlerListenerTest
+    from sacn.receiving.receiver_socket_test import ReceiverSocketTest
+    sources = 4
+
+    class Listener(ReceiverHandlerListenerTest):
+        def __init__(self):
+            super().__init__()
+            self.changes = 0
+
+        def on_dmx_data_change(self, packet: DataPacket) -> None:
+            self.changes += 1
+
+    listener = Listener()
+    handler = ReceiverHandler('', 0, listener, ReceiverSocketTest())
+    # the consoles send the same universe at the same priority, but with different data and sequence numbers
+    raw_data = [bytearray(DataPacket(cid=(source,) * 16, sourceName='Benchmark', universe=1, dmxData=(source,),
+                                     sequence=source * 5).getBytes()) for source in range(0, sources)]
+
+    sent = [0]
+
+    def on_data():
+        for data in raw_data:
+            data[111] = (data[111] + 1) & 0xFF
+            handler.on_data(data, 0)
+        sent[0] += sources
+
+    result = measure(on_data)
+    # every packet has other data than the one before, so every accepted packet fires the callback
+    print(f'\n{sources} sources on one universe: {result * sources:.0f} packets/s; '
+          f'accepted: {100 * listener.changes / sent[0]:.0f}% of the packets')
+
+
+@pytest.mark.benchmark
+def test_benchmark_merge():
+    from sacn.receiving import merger
+    from sacn.receiving.merger import Merger
+    from sacn.receiving.receiver_handler import ReceiverHandler
+    from sacn.receiving.receiver_handler_test import ReceiverHandlerListenerTest
+    from sacn.receiving.receiver_socket_test import ReceiverSocketTest
+    sources = 4
+
+    class CallbackMerge(ReceiverHandlerListenerTest):
+        # this is how sources had to be merged before: in the callback, slot by slot
+        def __init__(self):
+            super().__init__()
+            self.frames = {}
+            self.merged = None
+
+        def on_dmx_data_change(self, packet: DataPacket) -> None:
+            self.frames[packet.cid] = packet.dmxData
+            self.merged = tuple(max(values) for values in zip(*self.frames.values()))
+
+    def run(listener, merge_mode) -> float:
+        handler = ReceiverHandler('', 0, listener, ReceiverSocketTest())
+        handler.merger = None if merge_mode is None else Merger(merge_mode)
+        raw_data = [bytearray(DataPacket(cid=(source,) * 16, sourceName='Benchmark', universe=1,
+                                         dmxData=bytes(512)).getBytes()) for source in range(0, sources)]
+
+        def on_data():
+            # every console changes another slot in every frame
+            for source, data in enumerate(raw_data):
+                data[111] = (data[111] + 1) & 0xFF
+                slot = 126 + (data[111] * sources + source) % 512
+                data[slot] = (data[slot] + 1) & 0xFF
+                handler.on_data(data, 0)
+        return measure(on_data) * sources
+
+    before = run(CallbackMerge(), None)
+    results = [f'callback: {before:.0f}']
+    for mode in merger.MERGE_MODES:
+        results.append(f'{mode}: {run(ReceiverHandlerListenerTest(), mode):.0f}')
+    backend = 'numpy' if merger.numpy is not None else 'python'
+    print(f'\nMerge of {sources} sources with 512 slots ({backend}) in packets/s: {"; ".join(results)}')
@@ -5,17 +5,23 @@ def pytest_addoption(parser):
     parser.addoption(
         "--run-integration-tests", action="store_true", default=False, help="run integration tests with hardware I/O"
     )
+    parser.addoption(
+        "--run-benchmarks", action="store_true", default=False, help="run benchmarks and print their results"
+    )
 
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "integration_test: mark test as integration test")
+    config.addinivalue_line("markers", "benchmark: mark test as benchmark")
 
 
 def pytest_collection_modifyitems(config, items):
-    if config.getoption("--run-integration-tests"):
-        # --run-integration-tests given in cli: do not skip integration tests
-        return
     skip_integration_test = pytest.mark.skip(reason="need --run-integration-tests option to run")
+    skip_benchmark = pytest.mark.skip(reason="need --run-benchmarks option to run")
     for item in items:
-        if "integration_test" in item.keywords:
+        # --run-integration-tests given in cli: do not skip integration tests
+        if "integration_test" in item.keywords and not config.getoption("--run-integration-tests"):
             item.add_marker(skip_integration_test)
+        # --run-benchmarks given in cli: do not skip benchmarks
+        if "benchmark" in item.keywords and not config.getoption("--run-benchmarks"):
+            item.add_marker(skip_benchmark)
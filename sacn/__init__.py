@@ -1,8 +1,12 @@
 # re-export the classes available to consumers of this library
-from sacn.receiver import sACNreceiver, LISTEN_ON_OPTIONS  # noqa: F401
+from sacn.receiver import sACNreceiver, LISTEN_ON_OPTIONS, MERGE_MODES  # noqa: F401
 from sacn.sender import sACNsender  # noqa: F401
+from sacn.async_sender import AsyncSACNSender  # noqa: F401
+from sacn.sharded_sender import ShardedSACNSender  # noqa: F401
 from sacn.messages.data_packet import DataPacket  # noqa: F401
+from sacn.messages.data_packet_view import DataPacketView  # noqa: F401
 from sacn.messages.universe_discovery import UniverseDiscoveryPacket  # noqa: F401
+from sacn.sending.frame_bank import FrameBank  # noqa: F401
 
 import logging
 logging.getLogger('sacn').addHandler(logging.NullHandler())
@@ -0,0 +1,61 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+"""
+A sACN sender that runs on an asyncio event loop instead of its own thread.
+"""
+
+from typing import List
+
+from sacn.sender import sACNsender
+from sacn.sending.sender_socket_asyncio import SenderSocketAsyncio
+from sacn.sending.sender_socket_base import DEFAULT_PORT
+
+
+class AsyncSACNSender(sACNsender):
+    def __init__(self, bind_address: str = '0.0.0.0', bind_port: int = DEFAULT_PORT,
+                 source_name: str = 'default source name', cid: tuple = (),
+                 fps: int = 30, universeDiscovery: bool = True,
+                 sync_universe: int = 63999):
+        """
+        Creates a sender, that sends on the asyncio event loop it is started on. No thread is used, so all methods
+        have to be called on the loop. See sACNsender for the parameters and the usage of the outputs.
+        start, flush and stop are coroutines.
+        """
+        socket = SenderSocketAsyncio(None, bind_address, bind_port, fps)
+        super().__init__(bind_address, bind_port, source_name, cid, fps, universeDiscovery, sync_universe, socket)
+        socket._listener = self._sender_handler
+        self._socket: SenderSocketAsyncio = socket
+
+    async def start(self) -> None:
+        """
+        Starts sending on the running event loop. Can be called again after the sender was started to restart the
+        timing of the frames, but not after stop.
+        """
+        if self._socket._transport is None:
+            await self._socket.open()
+        self._socket.start()
+
+    async def flush(self, universes: List[int] = []) -> None:
+        """
+        Sends out all universes in one go and waits until the packets could be handed over to the OS.
+        This uses the E1.31 sync mechanism to try to sync all universes.
+        Note that not all receivers support this feature.
+        :param universes: a list of universes to send. If not given, all will be sent.
+        :raises ValueError: when attempting to flush a universe that is not activated.
+        """
+        super().flush(universes)
+        await self._socket.drain()
+
+    async def stop(self) -> None:
+        """
+        Stops sending and closes the underlying socket. Do not reuse the sender after calling stop once.
+        """
+        self._socket.stop()
+        await self._socket.wait_closed()
+
+    def __del__(self):
+        # a coroutine can not be awaited here
+        try:
+            self._socket.stop()
+        except (AttributeError, RuntimeError):  # not completely initialized or the loop is closed already
+            pass
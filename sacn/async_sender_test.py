@@ -0,0 +1,38 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import asyncio
+
+import pytest
+
+import sacn
+from sacn.messages.data_packet import DataPacket
+
+
+def test_start_flush_stop(monkeypatch):
+    sender = sacn.AsyncSACNSender(bind_address='127.0.0.1', bind_port=0, fps=50, universeDiscovery=False)
+    sent = []
+    monkeypatch.setattr(sender._socket, 'send_packet', lambda data, destination: sent.append((bytes(data), destination)))
+    sender.activate_output(1)
+    sender[1].dmx_data = (1, 2, 3)
+
+    async def run():
+        await sender.start()
+        # the first frame is send when the sender starts
+        assert len(sent) == 1
+        await asyncio.sleep(0.1)
+        sender.manual_flush = True
+        sender[1].dmx_data = (4, 5, 6)
+        await asyncio.sleep(0.1)
+        assert DataPacket.make_data_packet(sent[-1][0]).dmxData[0:3] == (1, 2, 3)
+        with pytest.raises(ValueError):
+            await sender.flush([2])
+        await sender.flush()
+        await sender.stop()
+
+    asyncio.run(run())
+    assert DataPacket.make_data_packet(sent[0][0]).dmxData[0:3] == (1, 2, 3)
+    assert sent[0][1] == '127.0.0.1'
+    # the flushed data packet is followed by the sync packet
+    assert DataPacket.make_data_packet(sent[-2][0]).dmxData[0:3] == (4, 5, 6)
+    assert len(sent[-1][0]) < 126
+    assert sender.frame_statistics.frames >= 5
@@ -5,20 +5,72 @@ This represents a framing layer and a DMP layer from the E1.31 Standard
 Information about sACN: http://tsp.esta.org/tsp/documents/docs/E1-31-2016.pdf
 """
 
+import struct
+from typing import Optional
+
 from sacn.messages.root_layer import \
     VECTOR_DMP_SET_PROPERTY, \
     VECTOR_E131_DATA_PACKET, \
     VECTOR_ROOT_E131_DATA, \
+    _FIRST_INDEX, \
     RootLayer, \
-    int_to_bytes, \
-    byte_tuple_to_int, \
-    make_flagsandlength
+    make_flagsandlength, \
+    vector_to_int
+
+# offsets of the fields within the raw bytes of a data packet
+_OFFSET_CID = 22
+_OFFSET_SOURCE_NAME = 44
+_OFFSET_PRIORITY = 108
+_OFFSET_SYNC_ADDRESS = 109
+_OFFSET_SEQUENCE = 111
+_OFFSET_OPTIONS = 112
+_OFFSET_UNIVERSE = 113
+_OFFSET_PROPERTY_VALUE_COUNT = 123
+_OFFSET_DMX_START_CODE = 125
+_OFFSET_DMX_DATA = 126
+
+_OPTION_PREVIEW_DATA = 0b10000000
+_OPTION_STREAM_TERMINATED = 0b01000000
+_OPTION_FORCE_SYNC = 0b00100000
+
+_UINT16 = struct.Struct('!H')
+_ZERO_SLOTS = memoryview(bytes(512))
+# header up to the DMX data: root vector, CID, framing vector, source name, priority, sync address, sequence,
+# options, universe, DMP vector, property value count and DMX start code. Padding bytes are skipped.
+_DATA_PACKET_HEADER = struct.Struct('!18xI16s2xI64sBHBBH2xB5xHB')
+
+_VECTOR_ROOT_E131_DATA = vector_to_int(VECTOR_ROOT_E131_DATA)
+_VECTOR_E131_DATA_PACKET = vector_to_int(VECTOR_E131_DATA_PACKET)
+
+
+def _make_template() -> bytes:
+    """
+    Creates the raw bytes of a data packet with all static fields (preamble, vectors, DMP address fields) already set.
+    """
+    template = bytearray(_OFFSET_DMX_DATA + 512)
+    template[0:16] = bytes(_FIRST_INDEX)
+    template[18:22] = bytes(VECTOR_ROOT_E131_DATA)
+    template[40:44] = bytes(VECTOR_E131_DATA_PACKET)
+    # Vector DMP Layer and some static values (Address & Data Type, First Property addr, Address Increment)
+    template[117:123] = bytes((VECTOR_DMP_SET_PROPERTY, 0xa1, 0x00, 0x00, 0x00, 0x01))
+    return bytes(template)
+
+
+_TEMPLATE = _make_template()
 
 
 class DataPacket(RootLayer):
+    __slots__ = ('_buffer', '_variableLength', '_sourceName', '_priority', '_syncAddr', '_universe', '_sequence',
+                 '_dmxStartCode')
+
     def __init__(self, cid: tuple, sourceName: str, universe: int, dmxData: tuple = (), priority: int = 100,
                  sequence: int = 0, streamTerminated: bool = False, previewData: bool = False,
-                 forceSync: bool = False, sync_universe: int = 0, dmxStartCode: int = 0x00):
+                 forceSync: bool = False, sync_universe: int = 0, dmxStartCode: int = 0x00,
+                 variableLength: bool = False):
+        # the packet is kept as raw bytes all the time: static fields are written once and
+        # every property setter patches its field in place, so sending needs no encoding step
+        self._buffer: bytearray = bytearray(_TEMPLATE)
+        self._variableLength: bool = variableLength
         super().__init__(126 + len(dmxData), cid, VECTOR_ROOT_E131_DATA)
         self.sourceName: str = sourceName
         self.priority = priority
@@ -35,6 +87,20 @@ class DataPacket(RootLayer):
         return f'sACN DataPacket: Universe: {self._universe}, Priority: {self._priority}, Sequence: {self._sequence}, ' \
                f'CID: {self._cid}'
 
+    @RootLayer.length.setter
+    def length(self, value: int):
+        RootLayer.length.fset(self, value)
+        length = self._length
+        # Flags and Length of the Root, Framing and DMP Layer
+        self._buffer[16:18] = make_flagsandlength(length - 16)
+        self._buffer[38:40] = make_flagsandlength(length - 38)
+        self._buffer[115:117] = make_flagsandlength(length - 115)
+
+    @RootLayer.cid.setter
+    def cid(self, cid: tuple):
+        RootLayer.cid.fset(self, cid)
+        self._buffer[_OFFSET_CID:_OFFSET_CID + 16] = bytes(cid)
+
     @property
     def sourceName(self) -> str:
         return self._sourceName
@@ -43,10 +109,12 @@ class DataPacket(RootLayer):
     def sourceName(self, sourceName: str):
         if type(sourceName) is not str:
             raise TypeError(f'sourceName must be a string! Type was {type(sourceName)}')
-        tmp_sourceName_length = len(str(sourceName).encode('UTF-8'))
-        if tmp_sourceName_length > 63:
-            raise ValueError(f'sourceName must be less than 64 bytes when UTF-8 encoded! "{sourceName}" is {tmp_sourceName_length} bytes')
+        tmpSourceName = sourceName.encode('UTF-8')
+        if len(tmpSourceName) > 63:
+            raise ValueError(f'sourceName must be less than 64 bytes when UTF-8 encoded! "{sourceName}" is {len(tmpSourceName)} bytes')
         self._sourceName = sourceName
+        # pad to 64 bytes
+        self._buffer[_OFFSET_SOURCE_NAME:_OFFSET_SOURCE_NAME + 64] = tmpSourceName.ljust(64, b'\0')
 
     @property
     def priority(self) -> int:
@@ -59,6 +127,7 @@ class DataPacket(RootLayer):
         if priority not in range(0, 201):
             raise ValueError(f'priority must be in range [0-200]! value was {priority}')
         self._priority = priority
+        self._buffer[_OFFSET_PRIORITY] = priority
 
     @property
     def universe(self) -> int:
@@ -71,6 +140,7 @@ class DataPacket(RootLayer):
         if universe not in range(1, 64000):
             raise ValueError(f'universe must be [1-63999]! value was {universe}')
         self._universe = universe
+        _UINT16.pack_into(self._buffer, _OFFSET_UNIVERSE, universe)
 
     @property
     def syncAddr(self) -> int:
@@ -83,6 +153,7 @@ class DataPacket(RootLayer):
         if sync_universe not in range(0, 64000):
             raise ValueError(f'sync_universe must be [1-63999]! value was {sync_universe}')
         self._syncAddr = sync_universe
+        _UINT16.pack_into(self._buffer, _OFFSET_SYNC_ADDRESS, sync_universe)
 
     @property
     def sequence(self) -> int:
@@ -95,11 +166,46 @@ class DataPacket(RootLayer):
         if sequence not in range(0, 256):
             raise ValueError(f'sequence is a byte! values: [0-255]! value was {sequence}')
         self._sequence = sequence
+        self._buffer[_OFFSET_SEQUENCE] = sequence
 
     def sequence_increase(self):
         self._sequence += 1
         if self._sequence > 0xFF:
             self._sequence = 0
+        self._buffer[_OFFSET_SEQUENCE] = self._sequence
+
+    def _get_option(self, mask: int) -> bool:
+        return bool(self._buffer[_OFFSET_OPTIONS] & mask)
+
+    def _set_option(self, mask: int, value: bool):
+        if value:
+            self._buffer[_OFFSET_OPTIONS] |= mask
+        else:
+            self._buffer[_OFFSET_OPTIONS] &= ~mask & 0xFF
+
+    @property
+    def option_StreamTerminated(self) -> bool:
+        return self._get_option(_OPTION_STREAM_TERMINATED)
+
+    @option_StreamTerminated.setter
+    def option_StreamTerminated(self, streamTerminated: bool):
+        self._set_option(_OPTION_STREAM_TERMINATED, streamTerminated)
+
+    @property
+    def option_PreviewData(self) -> bool:
+        return self._get_option(_OPTION_PREVIEW_DATA)
+
+    @option_PreviewData.setter
+    def option_PreviewData(self, previewData: bool):
+        self._set_option(_OPTION_PREVIEW_DATA, previewData)
+
+    @property
+    def option_ForceSync(self) -> bool:
+        return self._get_option(_OPTION_FORCE_SYNC)
+
+    @option_ForceSync.setter
+    def option_ForceSync(self, forceSync: bool):
+        self._set_option(_OPTION_FORCE_SYNC, forceSync)
 
     @property
     def dmxStartCode(self) -> int:
@@ -115,105 +221,208 @@ class DataPacket(RootLayer):
         if dmxStartCode not in range(0, 256):
             raise ValueError(f'dmx start code is a byte! values: [0-255]! value was {dmxStartCode}')
         self._dmxStartCode = dmxStartCode
+        self._buffer[_OFFSET_DMX_START_CODE] = dmxStartCode
+
+    @property
+    def variableLength(self) -> bool:
+        return self._variableLength
+
+    @variableLength.setter
+    def variableLength(self, variableLength: bool):
+        """
+        If True, only the slots of the given DMX data are used and the DMX data is not padded to 512 slots.
+        This makes the packet shorter for universes that do not use all 512 slots, which is allowed by E1.31.
+        """
+        self._variableLength = bool(variableLength)
+        if not self._variableLength:
+            # pad the current data
+            self.dmxData = self._buffer[_OFFSET_DMX_DATA:]
 
     @property
     def dmxData(self) -> tuple:
-        return self._dmxData
+        return tuple(self._buffer[_OFFSET_DMX_DATA:])
 
     @dmxData.setter
-    def dmxData(self, data: tuple):
+    def dmxData(self, data):
         """
-        For legacy devices and to prevent errors, the length of the DMX data is normalized to 512
+        The data can be a tuple or list with ints in the range [0-255] or any object that supports the buffer protocol
+        with unsigned bytes (e.g. bytes, bytearray, array('B') or a numpy array with dtype uint8).
+        The values of such a buffer are always valid and are copied into the packet without checking every slot.
+        For legacy devices and to prevent errors, the length of the DMX data is normalized to 512,
+        unless variableLength is set
         """
-        if len(data) > 512 or \
-                not all((isinstance(x, int) and (0 <= x <= 255)) for x in data):
-            raise ValueError(f'dmxData is a tuple with a max length of 512! The data in the tuple has to be valid bytes! '
-                             f'Length was {len(data)}')
-        newData = [0]*512
-        for i in range(0, min(len(data), 512)):
-            newData[i] = data[i]
-        self._dmxData = tuple(newData)
-        # in theory this class supports dynamic length, so the next line is correcting the length
-        self.length = 126 + len(self._dmxData)
+        slots = make_slots(data)
+        if self._variableLength:
+            self._buffer[_OFFSET_DMX_DATA:] = slots
+        else:
+            self._buffer[_OFFSET_DMX_DATA:_OFFSET_DMX_DATA + len(slots)] = slots
+            self._buffer[_OFFSET_DMX_DATA + len(slots):] = bytes(512 - len(slots))
+        self._update_length()
+
+    def setDmxSlots(self, start: int, data) -> None:
+        """
+        Overwrites a part of the DMX data in place, beginning with the slot at the given index.
+        Only the given slots are copied, which is faster than setting all of the DMX data for small changes.
+        If variableLength is set, the DMX data is extended with 0 if the given slots do not fit into the current data.
+        :param start: the index of the first slot to overwrite [0-511]
+        :param data: the values for the slots, in the same formats as for dmxData
+        """
+        slots = make_slots(data)
+        if type(start) is not int:
+            raise TypeError(f'start must be an integer! Type was {type(start)}')
+        if start < 0 or start + len(slots) > 512:
+            raise ValueError(f'The slots have to be in the range [0-511]! Start was {start} with {len(slots)} slots')
+        offset = _OFFSET_DMX_DATA + start
+        end = offset + len(slots)
+        if end <= len(self._buffer):
+            self._buffer[offset:end] = slots
+            return
+        # only possible with variable length: the slots between the current data and the given slots are 0
+        if offset > len(self._buffer):
+            self._buffer.extend(bytes(offset - len(self._buffer)))
+        self._buffer[offset:] = slots
+        self._update_length()
+
+    def equalsDmxData(self, data) -> bool:
+        """
+        Checks if the given DMX data is the same as the current DMX data of this packet.
+        Without variableLength, the given data is compared as if it was padded to 512 slots.
+        :param data: the DMX data in the same formats as for dmxData
+        """
+        slots = make_slots(data)
+        if self._variableLength:
+            return len(self._buffer) - _OFFSET_DMX_DATA == len(slots) and self._buffer[_OFFSET_DMX_DATA:] == slots
+        end = _OFFSET_DMX_DATA + len(slots)
+        return self._buffer[_OFFSET_DMX_DATA:end] == slots and self._buffer[end:] == _ZERO_SLOTS[:512 - len(slots)]
+
+    def equalsDmxSlots(self, start: int, data) -> bool:
+        """
+        Checks if the slots beginning with the given index have the given values.
+        :param start: the index of the first slot [0-511]
+        :param data: the values of the slots in the same formats as for dmxData
+        """
+        slots = make_slots(data)
+        offset = _OFFSET_DMX_DATA + start
+        return start >= 0 and offset + len(slots) <= len(self._buffer) and \
+            self._buffer[offset:offset + len(slots)] == slots
+
+    def _update_length(self) -> None:
+        # this class supports dynamic length, so the next lines are correcting the length
+        length = len(self._buffer) - _OFFSET_DMX_DATA
+        self.length = 126 + length
+        # Length of the data (property value count) includes the DMX start code
+        _UINT16.pack_into(self._buffer, _OFFSET_PROPERTY_VALUE_COUNT, length + 1)
 
     def getBytes(self) -> tuple:
-        rtrnList = super().getBytes()
-        # Flags and Length Framing Layer:-------
-        rtrnList.extend(make_flagsandlength(self.length - 38))
-        # Vector Framing Layer:-----------------
-        rtrnList.extend(VECTOR_E131_DATA_PACKET)
-        # sourceName:---------------------------
-        # UTF-8 encode the string
-        tmpSourceName = str(self._sourceName).encode('UTF-8')
-        rtrnList.extend(tmpSourceName)
-        # pad to 64 bytes
-        rtrnList.extend([0] * (64 - len(tmpSourceName)))
-        # priority------------------------------
-        rtrnList.append(self._priority)
-        # syncAddress---------------------------
-        rtrnList.extend(int_to_bytes(self._syncAddr))
-        # sequence------------------------------
-        rtrnList.append(self._sequence)
-        # Options Flags:------------------------
-        tmpOptionsFlags = 0
-        # stream terminated:
-        tmpOptionsFlags += int(self.option_StreamTerminated) << 6
-        # preview data:
-        tmpOptionsFlags += int(self.option_PreviewData) << 7
-        # force synchronization
-        tmpOptionsFlags += int(self.option_ForceSync) << 5
-        rtrnList.append(tmpOptionsFlags)
-        # universe:-----------------------------
-        rtrnList.extend(int_to_bytes(self._universe))
-        # DMP Layer:---------------------------------------------------
-        # Flags and Length DMP Layer:-----------
-        rtrnList.extend(make_flagsandlength(self.length - 115))
-        # Vector DMP Layer:---------------------
-        rtrnList.append(VECTOR_DMP_SET_PROPERTY)
-        # Some static values (Address & Data Type, First Property addr, ...)
-        rtrnList.extend([0xa1, 0x00, 0x00, 0x00, 0x01])
-        # Length of the data:-------------------
-        lengthDmxData = len(self._dmxData)+1
-        rtrnList.extend(int_to_bytes(lengthDmxData))
-        # DMX data:-----------------------------
-        rtrnList.append(self._dmxStartCode)  # DMX Start Code
-        rtrnList.extend(self._dmxData)
-        return tuple(rtrnList)
+        return tuple(self._buffer)
+
+    def getBuffer(self) -> bytearray:
+        """
+        Returns the raw bytes of this packet without any copy or encoding step.
+        Note that the returned buffer is changed in place when a property of this packet changes.
+        """
+        return self._buffer
 
     @staticmethod
-    def make_data_packet(raw_data) -> 'DataPacket':
+    def make_data_packet(raw_data, variableLength: bool = False) -> 'DataPacket':
         """
         Converts raw byte data to a sACN DataPacket. Note that the raw bytes have to come from a 2016 sACN Message.
-        This does not support DMX Start code!
-        :param raw_data: raw bytes as tuple or list
+        The header is decoded with one precompiled struct format and the raw bytes are copied into the packet's buffer
+        as they are. Fields that can only hold valid values because of their size on the wire (e.g. sequence, options,
+        DMX data) are not validated again.
+        :param raw_data: raw bytes as bytes, bytearray, memoryview, tuple or list
+        :param variableLength: if True, the DMX data is not padded to 512 slots,
+        but has the amount of slots that was sent.
         :raises TypeError: when the binary data does not match the criteria for a valid DMX data-packet
         :return: a DataPacket with the properties set like the raw bytes
         """
         # Check if the length is sufficient
         if len(raw_data) < 126:
             raise TypeError('The length of the provided data is not long enough! Min length is 126!')
+        if not isinstance(raw_data, (bytes, bytearray, memoryview)):
+            raw_data = bytes(raw_data)
+        root_vector, cid, framing_vector, source_name, priority, sync_addr, sequence, _, universe, dmp_vector, \
+            property_value_count, dmx_start_code = _DATA_PACKET_HEADER.unpack_from(raw_data)
         # Check if the three Vectors are correct
-        if tuple(raw_data[18:22]) != tuple(VECTOR_ROOT_E131_DATA) or \
-           tuple(raw_data[40:44]) != tuple(VECTOR_E131_DATA_PACKET) or \
-           raw_data[117] != VECTOR_DMP_SET_PROPERTY:  # REMEMBER: when slicing: [inclusive:exclusive]
+        if root_vector != _VECTOR_ROOT_E131_DATA or \
+           framing_vector != _VECTOR_E131_DATA_PACKET or \
+           dmp_vector != VECTOR_DMP_SET_PROPERTY:
             raise TypeError('Some of the vectors in the given raw data are not compatible to the E131 Standard!')
+        # a byte on the wire can still be out of range for some of the fields
+        if priority > 200 or not (0 < universe < 64000) or sync_addr >= 64000:
+            raise TypeError('Some of the values in the given raw data are not valid for the E131 Standard!')
 
-        tmpPacket = DataPacket(cid=tuple(raw_data[22:38]), sourceName=bytes(raw_data[44:108]).decode('utf-8').replace('\0', ''),
-                               universe=byte_tuple_to_int(raw_data[113:115]))  # high byte first
-        tmpPacket.priority = raw_data[108]
-        tmpPacket.syncAddr = byte_tuple_to_int(raw_data[109:111])
-        tmpPacket.sequence = raw_data[111]
-        tmpPacket.option_PreviewData = bool(raw_data[112] & 0b10000000)  # use the 7th bit as preview_data
-        tmpPacket.option_StreamTerminated = bool(raw_data[112] & 0b01000000)  # use bit 6 as stream terminated
-        tmpPacket.option_ForceSync = bool(raw_data[112] & 0b00100000)  # use bit 5 as force sync
-        tmpPacket.dmxStartCode = raw_data[125]
-        tmpPacket.dmxData = raw_data[126:638]
+        tmpPacket = DataPacket.__new__(DataPacket)
+        # the property value count includes the DMX start code, but the data might be shorter than that
+        slots = max(0, min(property_value_count - 1, len(raw_data) - _OFFSET_DMX_DATA, 512))
+        if variableLength:
+            buffer = bytearray(_TEMPLATE[:_OFFSET_DMX_DATA + slots])
+        else:
+            # the DMX data is normalized to 512 slots
+            buffer = bytearray(_TEMPLATE)
+        # copy all variable fields from the CID to the universe and the DMX start code with the DMX data
+        buffer[22:38] = raw_data[22:38]
+        buffer[44:115] = raw_data[44:115]
+        buffer[_OFFSET_DMX_START_CODE:_OFFSET_DMX_DATA + slots] = raw_data[_OFFSET_DMX_START_CODE:_OFFSET_DMX_DATA + slots]
+        tmpPacket._buffer = buffer
+        tmpPacket._variableLength = variableLength
+        tmpPacket._vector = VECTOR_ROOT_E131_DATA
+        tmpPacket._cid = tuple(cid)
+        tmpPacket._sourceName = source_name.decode('utf-8').replace('\0', '')
+        tmpPacket._priority = priority
+        tmpPacket._syncAddr = sync_addr
+        tmpPacket._sequence = sequence
+        tmpPacket._universe = universe
+        tmpPacket._dmxStartCode = dmx_start_code
+        slots = len(buffer) - _OFFSET_DMX_DATA
+        tmpPacket.length = 126 + slots
+        _UINT16.pack_into(buffer, _OFFSET_PROPERTY_VALUE_COUNT, slots + 1)
         return tmpPacket
 
     def calculate_multicast_addr(self) -> str:
         return calculate_multicast_addr(self.universe)
 
 
+def make_slots(data):
+    """
+    Converts DMX data to a bytes-like object.
+    :param data: a tuple or list with ints in the range [0-255] or any object that supports the buffer protocol
+    with unsigned bytes. Max length is 512
+    :return: the data as bytes-like object, buffers are not copied
+    :raises ValueError: when the data is too long or contains invalid values
+    """
+    slots = byte_buffer(data)
+    if slots is None:
+        if len(data) > 512 or \
+                not all((isinstance(x, int) and (0 <= x <= 255)) for x in data):
+            raise ValueError(f'dmxData is a tuple with a max length of 512! The data in the tuple has to be valid bytes! '
+                             f'Length was {len(data)}')
+        # iterate over the values, so that buffers with other item types (e.g. array('H')) are not copied bytewise
+        slots = bytes(iter(data))
+    elif len(slots) > 512:
+        raise ValueError(f'dmxData is a buffer with a max length of 512 bytes! Length was {len(slots)}')
+    return slots
+
+
+def byte_buffer(data) -> Optional[memoryview]:
+    """
+    Checks if the given data supports the buffer protocol with unsigned bytes as items.
+    :param data: the data to check
+    :return: a flat memoryview with the unsigned bytes of the data or None if the data does not provide such a buffer
+    """
+    if isinstance(data, (tuple, list)):  # shortcut for the most common types without buffer protocol
+        return None
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return None
+    if view.format != 'B':
+        return None
+    if not view.c_contiguous:
+        view = memoryview(view.tobytes())
+    return view.cast('B') if view.ndim != 1 else view
+
+
 def calculate_multicast_addr(universe: int) -> str:
     hi_byte = universe >> 8  # a little bit shifting here
     lo_byte = universe & 0xFF  # a little bit mask there
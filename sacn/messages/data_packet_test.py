@@ -1,5 +1,6 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
+import array
 import pytest
 from sacn.messages.data_packet import \
     calculate_multicast_addr, \
@@ -256,3 +257,211 @@ def test_dmx_data():
 
     # test for tuple-length > 512
     execute_universes_expect(tuple(range(0, 513)))
+
+
+def test_get_buffer():
+    packet = DataPacket(
+        cid=(16, 1, 15, 2, 14, 3, 13, 4, 12, 5, 11, 6, 10, 7, 9, 8),
+        sourceName='Test Name',
+        universe=62000,
+        dmxData=(1, 2, 3))
+    buffer = packet.getBuffer()
+    assert tuple(buffer) == packet.getBytes()
+    assert len(buffer) == 638
+    # the buffer is not rebuilt when a property changes, but patched in place
+    packet.sequence_increase()
+    packet.priority = 12
+    packet.option_StreamTerminated = True
+    packet.dmxData = (4, 5, 6)
+    packet.universe = 1
+    assert packet.getBuffer() is buffer
+    read_packet = DataPacket.make_data_packet(buffer)
+    assert read_packet.sequence == 1
+    assert read_packet.priority == 12
+    assert read_packet.option_StreamTerminated is True
+    assert read_packet.dmxData[:4] == (4, 5, 6, 0)
+    assert read_packet.universe == 1
+    # unsetting an option only clears its own bit
+    packet.option_PreviewData = True
+    packet.option_StreamTerminated = False
+    assert packet.option_PreviewData is True
+    assert packet.option_StreamTerminated is False
+
+
+def test_parse_data_packet_buffer_types():
+    built_packet = DataPacket(
+        cid=tuple(range(0, 16)),
+        sourceName='Test Name',
+        universe=62000,
+        dmxData=(1, 2, 3),
+        sequence=200)
+    raw_data = bytes(built_packet.getBytes())
+    # all types of raw data produce the same packet
+    for data in (raw_data, bytearray(raw_data), memoryview(raw_data), list(raw_data), tuple(raw_data)):
+        assert DataPacket.make_data_packet(data) == built_packet
+    # a short packet is padded to 512 slots
+    read_packet = DataPacket.make_data_packet(raw_data[0:130])
+    assert read_packet.dmxData == (1, 2, 3) + (0,) * 509
+    assert read_packet.length == 638
+    assert read_packet.getBuffer() == built_packet.getBuffer()
+
+
+def test_parse_data_packet_invalid_values():
+    raw_data = bytearray(DataPacket(cid=tuple(range(0, 16)), sourceName='Test', universe=1).getBytes())
+    # priority is greater than 200
+    invalid = bytearray(raw_data)
+    invalid[108] = 201
+    with pytest.raises(TypeError):
+        DataPacket.make_data_packet(invalid)
+    # universe 0 and universes greater than 63999 are not valid
+    for universe in (0, 64000):
+        invalid = bytearray(raw_data)
+        invalid[113:115] = universe.to_bytes(2, 'big')
+        with pytest.raises(TypeError):
+            DataPacket.make_data_packet(invalid)
+    # sync address greater than 63999
+    invalid = bytearray(raw_data)
+    invalid[109:111] = (64000).to_bytes(2, 'big')
+    with pytest.raises(TypeError):
+        DataPacket.make_data_packet(invalid)
+
+
+def test_dmx_data_buffer():
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName="", universe=1)
+    data = tuple(x % 256 for x in range(0, 300))
+    for buffer in (bytes(data), bytearray(data), array.array('B', data), memoryview(bytes(data))):
+        packet.dmxData = (1,) * 512
+        packet.dmxData = buffer
+        assert packet.dmxData == data + (0,) * 212
+        assert packet.length == 638
+        assert DataPacket(tuple(range(0, 16)), sourceName="", universe=1, dmxData=buffer).dmxData == packet.dmxData
+    # non contiguous and multi dimensional buffers are supported as well
+    packet.dmxData = memoryview(bytes(data))[::2]
+    assert packet.dmxData == data[::2] + (0,) * 362
+    packet.dmxData = memoryview(bytes(range(0, 8))).cast('B', (2, 4))
+    assert packet.dmxData[:9] == tuple(range(0, 8)) + (0,)
+    # buffers with other item types are checked like tuples
+    packet.dmxData = array.array('H', (1, 2))
+    assert packet.dmxData[:3] == (1, 2, 0)
+    with pytest.raises(ValueError):
+        packet.dmxData = array.array('H', (256,))
+    with pytest.raises(ValueError):
+        packet.dmxData = array.array('b', (-1,))
+    # too long buffers
+    with pytest.raises(ValueError):
+        packet.dmxData = bytes(513)
+
+
+def test_dmx_data_numpy():
+    numpy = pytest.importorskip('numpy')
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName="", universe=1)
+    data = numpy.arange(0, 512, dtype=numpy.uint8)
+    packet.dmxData = data
+    assert packet.dmxData == tuple(x % 256 for x in range(0, 512))
+    # views with a step are copied as well
+    packet.dmxData = data[::2]
+    assert packet.dmxData[:3] == (0, 2, 4)
+
+
+def test_variable_length():
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName="", universe=1, dmxData=(1, 2, 3), variableLength=True)
+    assert packet.variableLength is True
+    assert packet.dmxData == (1, 2, 3)
+    assert packet.length == 129
+    assert len(packet.getBuffer()) == 129
+    for i in range(0, 513):
+        data = bytes(x % 256 for x in range(0, i))
+        packet.dmxData = data
+        assert packet.length == 126 + i
+        read_packet = DataPacket.make_data_packet(packet.getBuffer(), variableLength=True)
+        assert read_packet == packet
+        assert bytes(read_packet.dmxData) == data
+        # without variable length, the received data is padded
+        assert DataPacket.make_data_packet(packet.getBuffer()).dmxData == tuple(data) + (0,) * (512 - i)
+    # disabling the variable length pads the current data
+    packet.dmxData = (1, 2, 3)
+    packet.variableLength = False
+    assert packet.dmxData == (1, 2, 3) + (0,) * 509
+    assert packet.length == 638
+
+
+def test_set_dmx_slots():
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName="", universe=1, dmxData=(1, 2, 3))
+    packet.setDmxSlots(1, (7, 8))
+    assert packet.dmxData == (1, 7, 8) + (0,) * 509
+    packet.setDmxSlots(510, bytearray((5, 6)))
+    assert packet.dmxData[-3:] == (0, 5, 6)
+    assert packet.length == 638
+    # the packet stays valid
+    assert DataPacket.make_data_packet(packet.getBuffer()) == packet
+    # invalid slots and values
+    with pytest.raises(ValueError):
+        packet.setDmxSlots(511, (1, 2))
+    with pytest.raises(ValueError):
+        packet.setDmxSlots(-1, (1,))
+    with pytest.raises(ValueError):
+        packet.setDmxSlots(0, (256,))
+    with pytest.raises(TypeError):
+        packet.setDmxSlots('0', (1,))
+    assert packet.dmxData[-3:] == (0, 5, 6)
+
+    # with variable length, the data is extended with 0 if necessary
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName="", universe=1, dmxData=(1, 2), variableLength=True)
+    packet.setDmxSlots(1, (3, 4))
+    assert packet.dmxData == (1, 3, 4)
+    packet.setDmxSlots(5, (9,))
+    assert packet.dmxData == (1, 3, 4, 0, 0, 9)
+    assert packet.length == 132
+    assert DataPacket.make_data_packet(packet.getBuffer(), variableLength=True) == packet
+
+
+def test_equals_dmx_data():
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName="", universe=1, dmxData=(1, 2, 3))
+    # without variable length the data is compared as if it was padded with zeros
+    assert packet.equalsDmxData((1, 2, 3))
+    assert packet.equalsDmxData(b'\x01\x02\x03\x00')
+    assert packet.equalsDmxData((1, 2, 3) + (0,) * 509)
+    assert not packet.equalsDmxData((1, 2))
+    assert not packet.equalsDmxData((1, 2, 3, 4))
+    with pytest.raises(ValueError):
+        packet.equalsDmxData((256,))
+    # with variable length the length has to be equal as well
+    packet.variableLength = True
+    packet.dmxData = (1, 2, 3)
+    assert packet.equalsDmxData(bytearray((1, 2, 3)))
+    assert not packet.equalsDmxData((1, 2, 3, 0))
+    assert not packet.equalsDmxData((1, 2))
+
+
+def test_equals_dmx_slots():
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName="", universe=1, dmxData=(1, 2, 3))
+    assert packet.equalsDmxSlots(1, (2, 3))
+    assert packet.equalsDmxSlots(511, (0,))
+    assert not packet.equalsDmxSlots(1, (2, 4))
+    assert not packet.equalsDmxSlots(511, (0, 0))
+    assert not packet.equalsDmxSlots(-1, (0,))
+    # slots after the end of variable length data are never equal
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName="", universe=1, dmxData=(1, 2), variableLength=True)
+    assert packet.equalsDmxSlots(0, (1, 2))
+    assert not packet.equalsDmxSlots(2, (0,))
+
+
+def test_parse_data_packet_property_value_count():
+    raw_data = bytearray(DataPacket(cid=tuple(range(0, 16)), sourceName="", universe=1, dmxData=(1, 2, 3, 4)).getBytes())
+    # only three slots are announced by the property value count, but the raw data is longer
+    raw_data[123:125] = (4).to_bytes(2, 'big')
+    assert DataPacket.make_data_packet(raw_data, variableLength=True).dmxData == (1, 2, 3)
+    assert DataPacket.make_data_packet(raw_data).dmxData == (1, 2, 3) + (0,) * 509
+    # the property value count is larger than the data
+    raw_data[123:125] = (513).to_bytes(2, 'big')
+    assert DataPacket.make_data_packet(raw_data[0:128], variableLength=True).dmxData == (1, 2)
+
+
+def test_eq_and_hash():
+    packet1 = DataPacket(cid=tuple(range(0, 16)), sourceName='Test', universe=1, dmxData=(1, 2, 3))
+    packet2 = DataPacket(cid=tuple(range(0, 16)), sourceName='Test', universe=1, dmxData=(1, 2, 3))
+    assert packet1 == packet2
+    assert hash(packet1) == hash(packet2)
+    packet2.sequence_increase()
+    assert packet1 != packet2
+    assert not hasattr(packet1, '__dict__')
@@ -0,0 +1,142 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+"""
+This represents a read-only view on the raw bytes of a sACN data packet.
+Information about sACN: http://tsp.esta.org/tsp/documents/docs/E1-31-2016.pdf
+"""
+
+import struct
+
+from sacn.messages.root_layer import VECTOR_DMP_SET_PROPERTY
+from sacn.messages.data_packet import \
+    _OFFSET_CID, \
+    _OFFSET_SOURCE_NAME, \
+    _OFFSET_SEQUENCE, \
+    _OFFSET_OPTIONS, \
+    _OFFSET_PROPERTY_VALUE_COUNT, \
+    _OFFSET_DMX_START_CODE, \
+    _OFFSET_DMX_DATA, \
+    _OPTION_PREVIEW_DATA, \
+    _OPTION_STREAM_TERMINATED, \
+    _OPTION_FORCE_SYNC, \
+    _VECTOR_ROOT_E131_DATA, \
+    _VECTOR_E131_DATA_PACKET, \
+    _UINT16, \
+    DataPacket, \
+    calculate_multicast_addr
+
+# root vector, framing vector, priority, sync address, universe and DMP vector. Everything else is skipped.
+_VIEW_HEADER = struct.Struct('!18xI18xI64xBH2xH2xB')
+
+
+class DataPacketView:
+    """
+    A read-only view on the raw bytes of a data packet. It provides the same attributes as a DataPacket, but the raw
+    bytes are not copied and most fields are only decoded when they are accessed. The DMX data is provided as
+    memoryview on the raw bytes and is not padded to 512 slots. It contains as many slots as were sent.
+    Note that the view is only valid as long as the underlying raw bytes are not changed.
+    """
+
+    __slots__ = ('_raw', '_priority', '_syncAddr', '_universe')
+
+    def __init__(self, raw_data):
+        """
+        :param raw_data: raw bytes as bytes, bytearray or memoryview. Other sequences are copied to bytes.
+        :raises TypeError: when the binary data does not match the criteria for a valid DMX data-packet
+        """
+        # Check if the length is sufficient
+        if len(raw_data) < 126:
+            raise TypeError('The length of the provided data is not long enough! Min length is 126!')
+        if not isinstance(raw_data, (bytes, bytearray, memoryview)):
+            raw_data = bytes(raw_data)
+        root_vector, framing_vector, priority, sync_addr, universe, dmp_vector = _VIEW_HEADER.unpack_from(raw_data)
+        # Check if the three Vectors are correct
+        if root_vector != _VECTOR_ROOT_E131_DATA or \
+           framing_vector != _VECTOR_E131_DATA_PACKET or \
+           dmp_vector != VECTOR_DMP_SET_PROPERTY:
+            raise TypeError('Some of the vectors in the given raw data are not compatible to the E131 Standard!')
+        # a byte on the wire can still be out of range for some of the fields
+        if priority > 200 or not (0 < universe < 64000) or sync_addr >= 64000:
+            raise TypeError('Some of the values in the given raw data are not valid for the E131 Standard!')
+        self._raw: memoryview = memoryview(raw_data)
+        self._priority: int = priority
+        self._syncAddr: int = sync_addr
+        self._universe: int = universe
+
+    def __str__(self):
+        return f'sACN DataPacketView: Universe: {self._universe}, Priority: {self._priority}, ' \
+               f'Sequence: {self.sequence}, CID: {self.cid}'
+
+    @property
+    def length(self) -> int:
+        return _OFFSET_DMX_DATA + self.slots
+
+    @property
+    def slots(self) -> int:
+        """
+        The amount of DMX slots in this packet. The property value count includes the DMX start code,
+        but the raw data might be shorter than that.
+        """
+        property_value_count = _UINT16.unpack_from(self._raw, _OFFSET_PROPERTY_VALUE_COUNT)[0]
+        return max(0, min(property_value_count - 1, len(self._raw) - _OFFSET_DMX_DATA, 512))
+
+    @property
+    def cid(self) -> tuple:
+        return tuple(self._raw[_OFFSET_CID:_OFFSET_CID + 16])
+
+    @property
+    def cidBytes(self) -> bytes:
+        """
+        The CID as bytes, which are faster to get than the tuple of cid and can be used as a dict key
+        """
+        return bytes(self._raw[_OFFSET_CID:_OFFSET_CID + 16])
+
+    @property
+    def sourceName(self) -> str:
+        return bytes(self._raw[_OFFSET_SOURCE_NAME:_OFFSET_SOURCE_NAME + 64]).decode('utf-8').replace('\0', '')
+
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+    @property
+    def syncAddr(self) -> int:
+        return self._syncAddr
+
+    @property
+    def sequence(self) -> int:
+        return self._raw[_OFFSET_SEQUENCE]
+
+    @property
+    def option_StreamTerminated(self) -> bool:
+        return bool(self._raw[_OFFSET_OPTIONS] & _OPTION_STREAM_TERMINATED)
+
+    @property
+    def option_PreviewData(self) -> bool:
+        return bool(self._raw[_OFFSET_OPTIONS] & _OPTION_PREVIEW_DATA)
+
+    @property
+    def option_ForceSync(self) -> bool:
+        return bool(self._raw[_OFFSET_OPTIONS] & _OPTION_FORCE_SYNC)
+
+    @property
+    def universe(self) -> int:
+        return self._universe
+
+    @property
+    def dmxStartCode(self) -> int:
+        return self._raw[_OFFSET_DMX_START_CODE]
+
+    @property
+    def dmxData(self) -> memoryview:
+        return self._raw[_OFFSET_DMX_DATA:_OFFSET_DMX_DATA + self.slots]
+
+    def calculate_multicast_addr(self) -> str:
+        return calculate_multicast_addr(self._universe)
+
+    def to_data_packet(self, variableLength: bool = False) -> DataPacket:
+        """
+        Decodes all fields and copies them into a new DataPacket.
+        :param variableLength: if True, the DMX data of the DataPacket is not padded to 512 slots.
+        """
+        return DataPacket.make_data_packet(self._raw, variableLength)
@@ -0,0 +1,83 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import pytest
+from sacn.messages.data_packet import DataPacket
+from sacn.messages.data_packet_view import DataPacketView
+
+
+def test_view_attributes():
+    packet = DataPacket(
+        cid=(16, 1, 15, 2, 14, 3, 13, 4, 12, 5, 11, 6, 10, 7, 9, 8),
+        sourceName='Test Name',
+        universe=62000,
+        dmxData=tuple(x % 256 for x in range(0, 512)),
+        priority=195,
+        sequence=34,
+        streamTerminated=True,
+        previewData=False,
+        forceSync=True,
+        sync_universe=12000,
+        dmxStartCode=12)
+    raw_data = bytes(packet.getBytes())
+    view = DataPacketView(raw_data)
+    assert view.length == 638
+    assert view.cid == packet.cid
+    assert view.cidBytes == bytes(packet.cid)
+    assert view.sourceName == packet.sourceName
+    assert view.universe == packet.universe
+    assert view.priority == packet.priority
+    assert view.sequence == packet.sequence
+    assert view.option_StreamTerminated is True
+    assert view.option_PreviewData is False
+    assert view.option_ForceSync is True
+    assert view.syncAddr == packet.syncAddr
+    assert view.dmxStartCode == packet.dmxStartCode
+    assert view.calculate_multicast_addr() == packet.calculate_multicast_addr()
+    assert str(view) == 'sACN DataPacketView: Universe: 62000, Priority: 195, Sequence: 34, ' \
+                        'CID: (16, 1, 15, 2, 14, 3, 13, 4, 12, 5, 11, 6, 10, 7, 9, 8)'
+    # the DMX data is not copied
+    assert isinstance(view.dmxData, memoryview)
+    assert view.dmxData.obj is raw_data
+    assert tuple(view.dmxData) == packet.dmxData
+    # a full packet can be created from a view
+    assert view.to_data_packet() == packet
+
+
+def test_view_is_read_only():
+    view = DataPacketView(DataPacket(cid=tuple(range(0, 16)), sourceName='Test', universe=1).getBytes())
+    with pytest.raises(AttributeError):
+        view.universe = 2
+    with pytest.raises(AttributeError):
+        view.priority = 2
+
+
+def test_view_short_dmx_data():
+    raw_data = bytes(DataPacket(cid=tuple(range(0, 16)), sourceName='Test', universe=1, dmxData=(1, 2, 3)).getBytes())
+    view = DataPacketView(raw_data[0:129])
+    assert view.length == 129
+    assert bytes(view.dmxData) == bytes((1, 2, 3))
+
+
+def test_view_invalid_data():
+    # test for too short data arrays
+    for i in range(1, 126):
+        with pytest.raises(TypeError):
+            DataPacketView(bytes(x % 256 for x in range(0, i)))
+    # test for invalid vectors
+    with pytest.raises(TypeError):
+        DataPacketView([x % 256 for x in range(0, 126)])
+    # test for invalid values
+    raw_data = bytearray(DataPacket(cid=tuple(range(0, 16)), sourceName='Test', universe=1).getBytes())
+    raw_data[108] = 201
+    with pytest.raises(TypeError):
+        DataPacketView(raw_data)
+
+
+def test_view_property_value_count():
+    raw_data = bytearray(DataPacket(cid=tuple(range(0, 16)), sourceName='Test', universe=1, dmxData=(1, 2, 3)).getBytes())
+    raw_data[123:125] = (3).to_bytes(2, 'big')
+    view = DataPacketView(raw_data)
+    assert view.slots == 2
+    assert view.length == 128
+    assert bytes(view.dmxData) == bytes((1, 2))
+    assert view.to_data_packet(variableLength=True).dmxData == (1, 2)
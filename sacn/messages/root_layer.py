@@ -6,6 +6,9 @@ This represents a root layer of an ACN Message.
 Information about sACN: http://tsp.esta.org/tsp/documents/docs/E1-31-2016.pdf
 """
 
+import struct
+from typing import Optional, Tuple
+
 _FIRST_INDEX = \
     (0, 0x10, 0, 0, 0x41, 0x53, 0x43, 0x2d, 0x45,
      0x31, 0x2e, 0x31, 0x37, 0x00, 0x00, 0x00)
@@ -20,8 +23,13 @@ VECTOR_E131_EXTENDED_SYNCHRONIZATION = (0, 0, 0, 0x1)
 VECTOR_E131_EXTENDED_DISCOVERY = (0, 0, 0, 0x2)
 VECTOR_UNIVERSE_DISCOVERY_UNIVERSE_LIST = (0, 0, 0, 0x1)
 
+# the root vector and the framing vector. Everything else is skipped.
+_VECTORS = struct.Struct('!18xI18xI')
+
 
 class RootLayer:
+    __slots__ = ('_length', '_vector', '_cid')
+
     def __init__(self, length: int, cid: tuple, vector: tuple):
         self.length = length
         if (len(vector) != 4):
@@ -42,6 +50,10 @@ class RootLayer:
         tmpList.extend(self._cid)
         return tmpList
 
+    def getBuffer(self) -> bytes:
+        '''Returns the whole packet as bytes-like object, that can be handed to a socket directly'''
+        return bytes(self.getBytes())
+
     @property
     def length(self) -> int:
         return self._length
@@ -63,9 +75,13 @@ class RootLayer:
         self._cid = cid
 
     def __eq__(self, other):
+        # packets are equal if they have the same type and are encoded to the same bytes
         if self.__class__ != other.__class__:
             return False
-        return self.__dict__ == other.__dict__
+        return self.getBuffer() == other.getBuffer()
+
+    def __hash__(self):
+        return hash(bytes(self.getBuffer()))
 
 
 def int_to_bytes(integer_value: int) -> list:
@@ -102,3 +118,27 @@ def make_flagsandlength(in_length: int) -> list:
     if (in_length > 0xFFF):
         raise ValueError(f'length must be no greater than a 12-bit value! value was {in_length}')
     return [(0x7 << 4) + ((in_length & 0xF00) >> 8), in_length & 0xFF]
+
+
+def vector_to_int(vector: tuple) -> int:
+    """
+    Converts a four byte vector tuple (highest byte first) to an integer.
+    :param vector: the vector to convert
+    :return: the integer value
+    """
+    return int.from_bytes(bytes(vector), 'big')
+
+
+def peek_vectors(raw_data) -> Optional[Tuple[int, int]]:
+    """
+    Reads the root vector and the framing vector of a raw ACN message without decoding anything else.
+    Use vector_to_int to compare the result with the VECTOR_* constants.
+    :param raw_data: raw bytes as bytes, bytearray or memoryview. Other sequences are copied to bytes.
+    :return: a tuple with the root vector and the framing vector as integers.
+    None if the raw data is too short to contain both vectors.
+    """
+    if len(raw_data) < _VECTORS.size:
+        return None
+    if not isinstance(raw_data, (bytes, bytearray, memoryview)):
+        raw_data = bytes(raw_data)
+    return _VECTORS.unpack_from(raw_data)
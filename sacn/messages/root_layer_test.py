@@ -5,7 +5,11 @@ from sacn.messages.root_layer import \
     byte_tuple_to_int, \
     int_to_bytes, \
     make_flagsandlength, \
-    RootLayer
+    peek_vectors, \
+    vector_to_int, \
+    RootLayer, \
+    VECTOR_ROOT_E131_DATA, \
+    VECTOR_E131_DATA_PACKET
 
 
 def test_int_to_bytes():
@@ -46,6 +50,20 @@ def test_eq():
     assert (RootLayer(0, cid, vec) == (1, 2, 3)) is False
 
 
+def test_hash():
+    cid = tuple(range(0, 16))
+    vec = tuple(range(0, 4))
+    assert hash(RootLayer(0, cid, vec)) == hash(RootLayer(0, cid, vec))
+    assert len({RootLayer(0, cid, vec), RootLayer(0, cid, vec), RootLayer(1, cid, vec)}) == 2
+
+
+def test_slots():
+    packet = RootLayer(0, tuple(range(0, 16)), tuple(range(0, 4)))
+    assert not hasattr(packet, '__dict__')
+    with pytest.raises(AttributeError):
+        packet.unknown_attribute = 1
+
+
 def test_make_flagsandlength():
     assert make_flagsandlength(0x123) == [0x71, 0x23]
     with pytest.raises(ValueError):
@@ -115,3 +133,25 @@ def test_int_byte_transitions():
     for input_i in range(65536):
         converted_i = byte_tuple_to_int(tuple(int_to_bytes(input_i)))
         assert input_i == converted_i
+
+
+def test_root_layer_buffer():
+    packet = RootLayer(0x123456, tuple(range(0, 16)), (1, 2, 3, 4))
+    assert packet.getBuffer() == bytes(packet.getBytes())
+
+
+def test_vector_to_int():
+    assert vector_to_int((0, 0, 0, 0x04)) == 0x04
+    assert vector_to_int((0x12, 0x34, 0x56, 0x78)) == 0x12345678
+
+
+def test_peek_vectors():
+    raw_data = bytes(RootLayer(0, tuple(range(0, 16)), VECTOR_ROOT_E131_DATA).getBytes()) + \
+        bytes((0x72, 0x57)) + bytes(VECTOR_E131_DATA_PACKET)
+    expected = (vector_to_int(VECTOR_ROOT_E131_DATA), vector_to_int(VECTOR_E131_DATA_PACKET))
+    assert peek_vectors(raw_data) == expected
+    assert peek_vectors(memoryview(raw_data)) == expected
+    assert peek_vectors(list(raw_data)) == expected
+    # too short to contain both vectors
+    assert peek_vectors(raw_data[0:43]) is None
+    assert peek_vectors(b'') is None
@@ -14,6 +14,8 @@ from sacn.messages.root_layer import \
 
 
 class SyncPacket(RootLayer):
+    __slots__ = ('_syncAddr', '_sequence')
+
     def __init__(self, cid: tuple, syncAddr: int, sequence: int = 0):
         self.syncAddr = syncAddr
         self.sequence = sequence
@@ -1,6 +1,8 @@
 """
 This class represents an universe discovery packet of the E1.31 Standard.
 """
+import sys
+from array import array
 from typing import List
 
 from sacn.messages.root_layer import \
@@ -8,19 +10,35 @@ from sacn.messages.root_layer import \
     VECTOR_E131_EXTENDED_DISCOVERY, \
     VECTOR_UNIVERSE_DISCOVERY_UNIVERSE_LIST, \
     RootLayer, \
-    int_to_bytes, \
     byte_tuple_to_int, \
     make_flagsandlength
 
+# universes are send as 16-bit numbers with the high byte first, array('H') uses the byte order of the machine
+_SWAP_BYTES = sys.byteorder == 'little'
+
 
 class UniverseDiscoveryPacket(RootLayer):
+    __slots__ = ('_sourceName', '_page', '_lastPage', '_universes', '_encoded')
+
     def __init__(self, cid: tuple, sourceName: str, universes: tuple, page: int = 0, lastPage: int = 0):
+        # the encoded bytes are cached until a property changes
+        self._encoded: bytes = None
         self.sourceName: str = sourceName
         self.page: int = page
         self.lastPage: int = lastPage
         self.universes: tuple = universes
         super().__init__((len(universes) * 2) + 120, cid, VECTOR_ROOT_E131_EXTENDED)
 
+    @RootLayer.length.setter
+    def length(self, value: int):
+        RootLayer.length.fset(self, value)
+        self._encoded = None
+
+    @RootLayer.cid.setter
+    def cid(self, cid: tuple):
+        RootLayer.cid.fset(self, cid)
+        self._encoded = None
+
     @property
     def sourceName(self) -> str:
         return self._sourceName
@@ -33,6 +51,7 @@ class UniverseDiscoveryPacket(RootLayer):
         if tmp_sourceName_length > 63:
             raise ValueError(f'sourceName must be less than 64 bytes when UTF-8 encoded! "{sourceName}" is {tmp_sourceName_length} bytes')
         self._sourceName = sourceName
+        self._encoded = None
 
     @property
     def page(self) -> int:
@@ -45,6 +64,7 @@ class UniverseDiscoveryPacket(RootLayer):
         if page not in range(0, 256):
             raise ValueError(f'Page is a byte! values: [0-255]! value was {page}')
         self._page = page
+        self._encoded = None
 
     @property
     def lastPage(self) -> int:
@@ -57,6 +77,7 @@ class UniverseDiscoveryPacket(RootLayer):
         if lastPage not in range(0, 256):
             raise ValueError(f'lastPage is a byte! values: [0-255]! value was {lastPage}')
         self._lastPage = lastPage
+        self._encoded = None
 
     @property
     def universes(self) -> tuple:
@@ -96,11 +117,15 @@ class UniverseDiscoveryPacket(RootLayer):
         # last page:-----------------------------------------
         rtrnList.append(self._lastPage & 0xFF)
         # universes:-----------------------------------------
-        for universe in self._universes:  # universe is a 16-bit number!
-            rtrnList.extend(int_to_bytes(universe))
+        rtrnList.extend(convert_universes_to_raw_data(self._universes))
 
         return rtrnList
 
+    def getBuffer(self) -> bytes:
+        if self._encoded is None:
+            self._encoded = bytes(self.getBytes())
+        return self._encoded
+
     @staticmethod
     def make_universe_discovery_packet(raw_data) -> 'UniverseDiscoveryPacket':
         # Check if the length is sufficient
@@ -122,8 +147,8 @@ class UniverseDiscoveryPacket(RootLayer):
         universes = convert_raw_data_to_universes(raw_data[120:120 + length])
         tmpPacket = UniverseDiscoveryPacket(cid=tuple(raw_data[22:38]), sourceName=bytes(raw_data[44:108]).decode('utf-8').replace('\0', ''),
                                             universes=universes)
-        tmpPacket._page = raw_data[118]
-        tmpPacket._lastPage = raw_data[119]
+        tmpPacket.page = raw_data[118]
+        tmpPacket.lastPage = raw_data[119]
         return tmpPacket
 
     @staticmethod
@@ -157,12 +182,30 @@ def convert_raw_data_to_universes(raw_data) -> tuple:
     """
     converts the raw data to a readable universes tuple. The raw_data is scanned from index 0 and has to have
     16-bit numbers with high byte first. The data is converted from the start to the beginning!
-    :param raw_data: the raw data to convert
+    :param raw_data: the raw data to convert. Bytes-like objects are converted without a copy,
+    other sequences have to contain values in the range [0-255]
     :return: tuple full with 16-bit numbers
     """
     if len(raw_data) % 2 != 0:
         raise TypeError('The given data does not have an even number of elements!')
-    rtrnList = []
-    for i in range(0, len(raw_data), 2):
-        rtrnList.append(byte_tuple_to_int((raw_data[i], raw_data[i + 1])))
-    return tuple(rtrnList)
+    if not isinstance(raw_data, (bytes, bytearray, memoryview)):
+        raw_data = bytes(raw_data)
+    universes = array('H')
+    universes.frombytes(raw_data)
+    if _SWAP_BYTES:
+        universes.byteswap()
+    return tuple(universes)
+
+
+def convert_universes_to_raw_data(universes) -> bytes:
+    """
+    converts the universes to raw data with 16-bit numbers with high byte first. This is the counterpart of
+    convert_raw_data_to_universes.
+    :param universes: the universes to convert. Every value has to be in the range [0-65535]
+    :return: bytes with two bytes for every universe
+    :raises OverflowError: when a value is out of range
+    """
+    raw_data = array('H', universes)
+    if _SWAP_BYTES:
+        raw_data.byteswap()
+    return raw_data.tobytes()
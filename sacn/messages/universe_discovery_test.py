@@ -1,7 +1,10 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
 import pytest
-from sacn.messages.universe_discovery import UniverseDiscoveryPacket
+from sacn.messages.universe_discovery import \
+    UniverseDiscoveryPacket, \
+    convert_raw_data_to_universes, \
+    convert_universes_to_raw_data
 from sacn.messages.general_test import property_number_range_check
 
 
@@ -147,6 +150,30 @@ def test_get_bytes():
         # universes as 16-bit integers
         0x00, 0x01, 0x00, 0x02, 0x00, 0x03,
     ]
+    # universes with both bytes in use are encoded with the high byte first
+    packet.universes = (0x1234, 63999)
+    assert packet.getBytes()[-4:] == [0x12, 0x34, 0xf9, 0xff]
+
+
+def test_get_buffer_cached():
+    packet = UniverseDiscoveryPacket(tuple(range(0, 16)), 'Test', (1, 2, 3))
+    buffer = packet.getBuffer()
+    assert buffer == bytes(packet.getBytes())
+    # the encoded bytes are reused until the packet changes
+    assert packet.getBuffer() is buffer
+    # every change creates new bytes
+    packet.universes = (4, 5)
+    assert packet.getBuffer() == bytes(packet.getBytes())
+    packet.sourceName = 'Other'
+    assert packet.getBuffer() == bytes(packet.getBytes())
+    packet.page = 1
+    assert packet.getBuffer() == bytes(packet.getBytes())
+    packet.lastPage = 2
+    assert packet.getBuffer() == bytes(packet.getBytes())
+    packet.cid = tuple(range(16, 32))
+    assert packet.getBuffer() == bytes(packet.getBytes())
+    packet.length = 200
+    assert packet.getBuffer() == bytes(packet.getBytes())
 
 
 def test_parse_sync_packet():
@@ -211,3 +238,30 @@ def test_byte_construction_and_deconstruction():
     built_packet = UniverseDiscoveryPacket(tuple(range(0, 16)), 'Test', tuple(range(0, 512)), 0, 1)
     read_packet = UniverseDiscoveryPacket.make_universe_discovery_packet(built_packet.getBytes())
     assert built_packet == read_packet
+
+
+def test_convert_universes_to_raw_data():
+    assert convert_universes_to_raw_data(()) == b''
+    assert convert_universes_to_raw_data((1, 0x1234, 63999)) == bytes([0x00, 0x01, 0x12, 0x34, 0xf9, 0xff])
+    with pytest.raises(OverflowError):
+        convert_universes_to_raw_data((65536,))
+    with pytest.raises(OverflowError):
+        convert_universes_to_raw_data((-1,))
+
+
+def test_convert_raw_data_to_universes():
+    raw_data = [0x00, 0x01, 0x12, 0x34, 0xf9, 0xff]
+    universes = (1, 0x1234, 63999)
+    assert convert_raw_data_to_universes(raw_data) == universes
+    assert convert_raw_data_to_universes(bytes(raw_data)) == universes
+    assert convert_raw_data_to_universes(bytearray(raw_data)) == universes
+    assert convert_raw_data_to_universes(memoryview(bytes(raw_data))) == universes
+    assert convert_raw_data_to_universes(()) == ()
+    # both functions are the counterpart of each other
+    universes = tuple(range(0, 64000, 125))
+    assert convert_raw_data_to_universes(convert_universes_to_raw_data(universes)) == universes
+    # invalid data
+    with pytest.raises(TypeError):
+        convert_raw_data_to_universes(raw_data[:-1])
+    with pytest.raises(ValueError):
+        convert_raw_data_to_universes([0x00, 0x100])
@@ -1,9 +1,10 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
 from sacn.messages.data_packet import DataPacket, calculate_multicast_addr
+from sacn.receiving.merger import Merger, MERGE_MODES  # noqa: F401
 from sacn.receiving.receiver_handler import ReceiverHandler, ReceiverHandlerListener
 from sacn.receiving.receiver_socket_base import ReceiverSocketBase
-from typing import Tuple
+from typing import Optional, Tuple
 
 LISTEN_ON_OPTIONS = ('availability', 'universe')
 
@@ -23,6 +24,32 @@ class sACNreceiver(ReceiverHandlerListener):
         self._callbacks: dict = {}
         self._handler: ReceiverHandler = ReceiverHandler(bind_address, bind_port, self, socket)
 
+    @property
+    def variable_length(self) -> bool:
+        return self._handler.variable_length
+
+    @variable_length.setter
+    def variable_length(self, variable_length: bool) -> None:
+        """
+        If True, the DMX data of the received DataPackets is not padded to 512 slots,
+        but contains only the slots that were sent. Default: False
+        """
+        self._handler.variable_length = variable_length
+
+    @property
+    def merge_mode(self) -> Optional[str]:
+        return None if self._handler.merger is None else self._handler.merger.mode
+
+    @merge_mode.setter
+    def merge_mode(self, merge_mode: Optional[str]) -> None:
+        """
+        If set to one of MERGE_MODES, the DMX data of the sources of a universe is merged, before it is passed to the
+        'universe' callbacks. If None, the DMX data of every source with the highest priority is passed on as it
+        arrives. Default: None
+        :raises ValueError: if the mode is not one of MERGE_MODES or None
+        """
+        self._handler.merger = None if merge_mode is None else Merger(merge_mode)
+
     def on_availability_change(self, universe: int, changed: str) -> None:
         callbacks = []
         # call nothing, if the list with callbacks is empty
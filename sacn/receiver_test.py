@@ -56,7 +56,7 @@ def test_listen_on_dmx_data_change():
 
     @receiver.listen_on('universe', universe=packetSend.universe)
     def callback_packet(packet):
-        assert packetSend.__dict__ == packet.__dict__
+        assert packetSend == packet
         nonlocal called
         called = True
 
@@ -64,6 +64,76 @@ def test_listen_on_dmx_data_change():
     assert called
 
 
+def test_variable_length():
+    receiver, socket = get_receiver()
+    assert receiver.variable_length is False
+
+    received = []
+    receiver.register_listener('universe', received.append, universe=1)
+    packet = DataPacket(cid=tuple(range(0, 16)), sourceName='Test', universe=1, dmxData=(1, 2, 3), variableLength=True)
+    socket.call_on_data(bytes(packet.getBytes()), 0)
+    assert received[-1].dmxData == (1, 2, 3) + (0,) * 509
+
+    receiver.variable_length = True
+    assert receiver.variable_length is True
+    packet.dmxData = (4, 5)
+    packet.sequence_increase()
+    socket.call_on_data(bytes(packet.getBytes()), 0)
+    assert received[-1].dmxData == (4, 5)
+
+
+def test_merge_mode():
+    receiver, socket = get_receiver()
+    assert receiver.merge_mode is None
+    with pytest.raises(ValueError):
+        receiver.merge_mode = 'max'
+    receiver.merge_mode = 'htp'
+    assert receiver.merge_mode == 'htp'
+
+    received = []
+    receiver.register_listener('universe', received.append, universe=1)
+    packet_a = DataPacket(cid=tuple(range(0, 16)), sourceName='A', universe=1, dmxData=(10, 0, 30))
+    packet_b = DataPacket(cid=tuple(range(1, 17)), sourceName='B', universe=1, dmxData=(0, 20, 5))
+    socket.call_on_data(bytes(packet_a.getBytes()), 0)
+    socket.call_on_data(bytes(packet_b.getBytes()), 0)
+    assert received[-1].dmxData[0:3] == (10, 20, 30)
+    assert received[-1].sourceName == 'B'
+    # the merged data did not change, so the callback is not called again
+    packet_a.sequence_increase()
+    socket.call_on_data(bytes(packet_a.getBytes()), 0)
+    assert len(received) == 2
+
+    receiver.merge_mode = None
+    assert receiver.merge_mode is None
+
+
+def test_merge_mode_change():
+    # the merge mode can be changed, while sources are sending
+    receiver, socket = get_receiver()
+    received = []
+    receiver.register_listener('universe', received.append, universe=1)
+    packet_a = DataPacket(cid=tuple(range(0, 16)), sourceName='A', universe=1, dmxData=(10, 0, 30))
+    packet_b = DataPacket(cid=tuple(range(1, 17)), sourceName='B', universe=1, dmxData=(0, 20, 5))
+
+    def send(packet, dmx_data):
+        packet.sequence_increase()
+        packet.dmxData = dmx_data
+        socket.call_on_data(bytes(packet.getBytes()), 0)
+
+    send(packet_a, (10, 0, 30))
+    send(packet_b, (0, 20, 5))
+    for mode in ('ltp', 'htp', 'ltp', 'address_priority', None, 'ltp'):
+        receiver.merge_mode = mode
+        send(packet_a, (11, 0, 30))
+        send(packet_b, (0, 21, 5))
+        send(packet_a, (12, 0, 30))
+        send(packet_b, (0, 22, 5))
+        if mode is None:
+            assert received[-1].dmxData[0:3] == (0, 22, 5)
+        else:
+            assert received[-1].dmxData[0:3] == (12, 22, 30)
+
+
 def test_remove_listener():
     receiver, socket = get_receiver()
 
@@ -77,7 +147,7 @@ def test_remove_listener():
     called = 0
 
     def callback_packet(packet):
-        assert packetSend.__dict__ == packet.__dict__
+        assert packetSend == packet
         nonlocal called
         called += 1
 
@@ -117,7 +187,7 @@ def test_remove_listener_from_universe():
     called = 0
 
     def callback_packet(packet):
-        assert packet_send.__dict__ == packet.__dict__
+        assert packet_send == packet
         nonlocal called
         called += 1
 
@@ -0,0 +1,148 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+"""
+Merges the DMX data of multiple sources, that send on the same universe.
+If numpy is installed, the frames of the sources are merged with one vectorized operation over all slots,
+otherwise the slots are merged one by one in Python.
+"""
+
+from array import array
+from typing import List, Optional
+
+from sacn.receiving.source import Source, UniverseSources
+
+try:
+    import numpy
+except ImportError:  # numpy is optional
+    numpy = None
+
+# htp: the highest value of a slot wins. ltp: the value that was changed last wins.
+# address_priority: the value of the source with the highest per-address priority (start code 0xDD) wins,
+# values with the same priority are merged with htp. Sources without per-address priorities use their priority.
+MERGE_MODES = ('htp', 'ltp', 'address_priority')
+START_CODE_ADDRESS_PRIORITY = 0xDD
+_SLOTS = 512
+
+
+def _pad(frame: bytes) -> bytes:
+    return frame.ljust(_SLOTS, b'\0')
+
+
+class Merger:
+    """
+    Merges the frames of the sources of a universe. The state, that is needed for merging, is stored in the sources.
+    """
+
+    def __init__(self, mode: str):
+        """
+        :param mode: one of MERGE_MODES
+        :raises ValueError: if the mode is not one of MERGE_MODES
+        """
+        if mode not in MERGE_MODES:
+            raise ValueError(f'The merge mode has to be one of {MERGE_MODES}! Value was {mode}')
+        self.mode: str = mode
+        # counts the frames, so the last change of a slot can be found for ltp
+        self._counter: int = 0
+
+    def uses_all_sources(self) -> bool:
+        """
+        :return: True if the frames of all sources are merged. Otherwise only the sources that won the arbitration
+        """
+        return self.mode == 'address_priority'
+
+    def set_frame(self, source: Source, frame: bytes) -> None:
+        """
+        Stores the new DMX data of the source.
+        """
+        if self.mode == 'ltp':
+            self._counter += 1
+            source.changeStamps = _stamp_changes(source.changeStamps, source.dmxData, frame, self._counter)
+        else:
+            # the changes of the frame are not stamped in other modes, so the stamps are not valid anymore
+            source.changeStamps = None
+        source.dmxData = frame
+
+    def merge(self, universe: UniverseSources) -> Optional[bytes]:
+        """
+        :return: the merged DMX data of the sources of the universe. None if no source has DMX data
+        """
+        sources = universe.sources if self.uses_all_sources() else universe.winners
+        sources = [source for source in sources.values() if source.dmxData is not None]
+        if not sources:
+            return None
+        if len(sources) == 1:
+            return sources[0].dmxData
+        length = max(len(source.dmxData) for source in sources)
+        if self.mode == 'htp':
+            merged = _merge_htp(sources)
+        elif self.mode == 'ltp':
+            for source in sources:
+                if source.changeStamps is None:
+                    # the frame was stored in another mode, so its slots are older than every stamped change
+                    source.changeStamps = _new_stamps(0)
+            merged = _merge_ltp(sources)
+        else:
+            merged = _merge_address_priority(sources)
+        return merged[:length]
+
+
+def _new_stamps(counter: int):
+    return numpy.full(_SLOTS, counter, numpy.uint64) if numpy is not None else array('Q', [counter]) * _SLOTS
+
+
+def _stamp_changes(stamps, old_frame: Optional[bytes], new_frame: bytes, counter: int):
+    """
+    :return: the stamps of the slots of a source, where the slots, that changed between the frames, are set to counter
+    """
+    if stamps is None or old_frame is None:
+        # every slot of a new source is a change
+        return _new_stamps(counter)
+    old_frame = _pad(old_frame)
+    new_frame = _pad(new_frame)
+    if numpy is not None:
+        stamps[numpy.frombuffer(old_frame, numpy.uint8) != numpy.frombuffer(new_frame, numpy.uint8)] = counter
+    else:
+        for index, (old, new) in enumerate(zip(old_frame, new_frame)):
+            if old != new:
+                stamps[index] = counter
+    return stamps
+
+
+def _rows(frames: List[bytes]):
+    return numpy.frombuffer(b''.join(map(_pad, frames)), numpy.uint8).reshape(len(frames), _SLOTS)
+
+
+def _merge_htp(sources: List[Source]) -> bytes:
+    frames = [source.dmxData for source in sources]
+    if numpy is not None:
+        return _rows(frames).max(axis=0).tobytes()
+    return bytes(map(max, *map(_pad, frames)))
+
+
+def _merge_ltp(sources: List[Source]) -> bytes:
+    frames = [source.dmxData for source in sources]
+    if numpy is not None:
+        latest = numpy.stack([source.changeStamps for source in sources]).argmax(axis=0)
+        return _rows(frames)[latest, numpy.arange(_SLOTS)].tobytes()
+    # the stamps are unique for every source, so the highest stamp decides
+    columns = zip(*(zip(source.changeStamps, _pad(frame)) for source, frame in zip(sources, frames)))
+    return bytes(max(column)[1] for column in columns)
+
+
+def _address_priorities(source: Source) -> bytes:
+    if source.addressPriorities is None:
+        return bytes((source.priority,)) * _SLOTS
+    return source.addressPriorities
+
+
+def _merge_address_priority(sources: List[Source]) -> bytes:
+    frames = [source.dmxData for source in sources]
+    priorities = [_address_priorities(source) for source in sources]
+    if numpy is not None:
+        priority_rows = _rows(priorities)
+        highest = priority_rows.max(axis=0)
+        # a slot with the priority 0 is not sent by the source
+        winners = (priority_rows == highest) & (priority_rows > 0)
+        return numpy.where(winners, _rows(frames), 0).max(axis=0).tobytes()
+    columns = zip(*(zip(_pad(priority), _pad(frame)) for priority, frame in zip(priorities, frames)))
+    return bytes(value if priority else 0 for priority, value in map(max, columns))
@@ -0,0 +1,73 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import pytest
+from sacn.receiving import merger
+from sacn.receiving.merger import Merger
+from sacn.receiving.source import UniverseSources
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def backend(request, monkeypatch):
+    # the merger has to give the same results with and without numpy
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(merger, 'numpy', None)
+    return request.param
+
+
+def add_source(universe: UniverseSources, merger: Merger, name: bytes, data: bytes, priority: int = 100):
+    source = universe.get_source(name * 16)
+    universe.arbitrate(source, priority, 0, 2.5)
+    merger.set_frame(source, data)
+    return source
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        Merger('max')
+
+
+def test_merge_htp(backend):
+    htp = Merger('htp')
+    universe = UniverseSources(1)
+    assert htp.merge(universe) is None
+    add_source(universe, htp, b'a', bytes((10, 0, 30)))
+    assert htp.merge(universe) == bytes((10, 0, 30))
+    add_source(universe, htp, b'b', bytes((0, 20, 5, 40)))
+    # the length is the length of the longest frame
+    assert htp.merge(universe) == bytes((10, 20, 30, 40))
+    # only the sources with the highest priority are merged
+    add_source(universe, htp, b'c', bytes((255,) * 512), priority=99)
+    assert htp.merge(universe) == bytes((10, 20, 30, 40))
+    add_source(universe, htp, b'c', bytes((1,) * 512), priority=101)
+    assert htp.merge(universe) == bytes((1,) * 512)
+
+
+def test_merge_ltp(backend):
+    ltp = Merger('ltp')
+    universe = UniverseSources(1)
+    source_a = add_source(universe, ltp, b'a', bytes((10, 10, 10)))
+    # all slots of a new source are changed
+    source_b = add_source(universe, ltp, b'b', bytes((20, 20)))
+    assert ltp.merge(universe) == bytes((20, 20, 0))
+    ltp.set_frame(source_a, bytes((10, 5, 10)))
+    assert ltp.merge(universe) == bytes((20, 5, 0))
+    ltp.set_frame(source_b, bytes((30, 20)))
+    assert ltp.merge(universe) == bytes((30, 5, 0))
+    ltp.set_frame(source_a, bytes((10, 5, 7)))
+    assert ltp.merge(universe) == bytes((30, 5, 7))
+
+
+def test_merge_address_priority(backend):
+    address_priority = Merger('address_priority')
+    universe = UniverseSources(1)
+    source_a = add_source(universe, address_priority, b'a', bytes((10, 10, 10, 10)))
+    source_b = add_source(universe, address_priority, b'b', bytes((20, 20, 5, 20)), priority=50)
+    # the sources without per-address priorities use their priority for all slots
+    assert address_priority.merge(universe) == bytes((10, 10, 10, 10))
+    # the slots with the same priority are merged with htp and slots with priority 0 are not used
+    source_b.addressPriorities = bytes((150, 100, 100, 0))
+    assert address_priority.merge(universe) == bytes((20, 20, 10, 10))
+    source_a.addressPriorities = bytes((0, 0, 0, 0))
+    assert address_priority.merge(universe) == bytes((20, 20, 5, 0))
@@ -0,0 +1,86 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+"""
+A small ctypes shim for the recvmmsg syscall of Linux, which receives multiple UDP packets with one syscall.
+Use AVAILABLE to check if the syscall can be used on this system.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import socket
+import sys
+from array import array
+
+from sacn.sending.mmsg import LAYOUT_SUPPORTED, _IOVEC, _IOVEC_WORDS, _MMSGHDR, _MMSGHDR_WORDS
+
+# greater than 1144 because the longest possible packet in the sACN standard is the universe discovery packet
+SLOT_SIZE = 2048
+# the index of the 64-bit word of a struct mmsghdr, whose lower 32 bits are the length of the received message
+_MSG_LEN_WORD = 7
+_MSG_LEN_MASK = 0xFFFFFFFF
+
+
+def _load_recvmmsg():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        function = libc.recvmmsg
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    function.restype = ctypes.c_int
+    return function
+
+
+# the structures are the same as for sendmmsg (see sacn.sending.mmsg)
+_recvmmsg = _load_recvmmsg() if LAYOUT_SUPPORTED else None
+AVAILABLE: bool = _recvmmsg is not None
+
+
+class ReceiveRing:
+    """
+    A ring of preallocated buffers, that are filled with one recvmmsg syscall. The buffers are reused by every call of
+    receive, so the received packets are only valid until the next call.
+    """
+
+    def __init__(self, slots: int = 64):
+        """
+        :param slots: the maximum number of packets that are received with one syscall
+        """
+        self._slots = slots
+        self._buffer = bytearray(slots * SLOT_SIZE)
+        buffer_view = memoryview(self._buffer)
+        self._views = [buffer_view[index * SLOT_SIZE:(index + 1) * SLOT_SIZE] for index in range(0, slots)]
+        buffer_address = ctypes.addressof(ctypes.c_char.from_buffer(self._buffer))
+        # the structures point to the slots and are not changed by the kernel, except for the received lengths
+        self._iovecs = array('Q', bytes(_IOVEC.size * slots))
+        self._iovecs[0::_IOVEC_WORDS] = array('Q', range(buffer_address, buffer_address + slots * SLOT_SIZE, SLOT_SIZE))
+        self._iovecs[1::_IOVEC_WORDS] = array('Q', [SLOT_SIZE]) * slots
+        iovecs_address = self._iovecs.buffer_info()[0]
+        self._headers = array('Q', _MMSGHDR.pack(0, 0, 0, 1, 0, 0, 0, 0)) * slots
+        iovecs_end = iovecs_address + slots * _IOVEC.size
+        self._headers[2::_MMSGHDR_WORDS] = array('Q', range(iovecs_address, iovecs_end, _IOVEC.size))
+        self._headers_address = self._headers.buffer_info()[0]
+
+    def receive(self, sock: socket.socket) -> int:
+        """
+        Receives all packets that are waiting in the socket, up to the number of slots. Does not block.
+        :return: the number of received packets. 0 if there were none
+        :raises OSError: if the syscall failed
+        """
+        count = _recvmmsg(sock.fileno(), self._headers_address, self._slots, socket.MSG_DONTWAIT, None)
+        if count < 0:
+            error = ctypes.get_errno()
+            if error in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return 0
+            raise OSError(error, os.strerror(error))
+        return count
+
+    def packet(self, index: int) -> memoryview:
+        """
+        :return: a view on the packet with the given index of the last receive call
+        """
+        return self._views[index][:self._headers[index * _MMSGHDR_WORDS + _MSG_LEN_WORD] & _MSG_LEN_MASK]
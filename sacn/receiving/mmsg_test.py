@@ -0,0 +1,42 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import socket
+import pytest
+from sacn.receiving import mmsg
+
+
+@pytest.mark.skipif(not mmsg.AVAILABLE, reason='recvmmsg is not available on this system')
+def test_receive_ring():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        receiver.bind(('127.0.0.1', 0))
+        ring = mmsg.ReceiveRing(4)
+        # nothing is waiting
+        assert ring.receive(receiver) == 0
+        packets = [bytes([i]) * (i + 1) for i in range(0, 6)]
+        for packet in packets:
+            sender.sendto(packet, receiver.getsockname())
+        # at most as many packets as there are slots are received at once
+        assert ring.receive(receiver) == 4
+        assert [bytes(ring.packet(i)) for i in range(0, 4)] == packets[0:4]
+        first = ring.packet(0)
+        assert ring.receive(receiver) == 2
+        assert [bytes(ring.packet(i)) for i in range(0, 2)] == packets[4:6]
+        # the slots are reused
+        assert bytes(first) == packets[4][0:1]
+        # packets longer than a slot are truncated
+        sender.sendto(bytes(3000), receiver.getsockname())
+        assert ring.receive(receiver) == 1
+        assert len(ring.packet(0)) == mmsg.SLOT_SIZE
+    finally:
+        receiver.close()
+        sender.close()
+
+
+@pytest.mark.skipif(not mmsg.AVAILABLE, reason='recvmmsg is not available on this system')
+def test_receive_ring_error():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.close()
+    with pytest.raises(OSError):
+        mmsg.ReceiveRing(1).receive(receiver)
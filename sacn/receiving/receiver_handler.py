@@ -1,12 +1,25 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
-from typing import Dict, List
-
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sacn.messages.root_layer import \
+    VECTOR_ROOT_E131_DATA, \
+    VECTOR_ROOT_E131_EXTENDED, \
+    VECTOR_E131_DATA_PACKET, \
+    VECTOR_E131_EXTENDED_SYNCHRONIZATION, \
+    VECTOR_E131_EXTENDED_DISCOVERY, \
+    peek_vectors, \
+    vector_to_int
 from sacn.messages.data_packet import DataPacket
+from sacn.messages.data_packet_view import DataPacketView
 from sacn.receiving.receiver_socket_base import ReceiverSocketBase, ReceiverSocketListener
 from sacn.receiving.receiver_socket_udp import ReceiverSocketUDP
+from sacn.receiving.merger import Merger, START_CODE_ADDRESS_PRIORITY
+from sacn.receiving.source import Source, UniverseSources
 
 E131_NETWORK_DATA_LOSS_TIMEOUT_ms = 2500
+_TIMEOUT = E131_NETWORK_DATA_LOSS_TIMEOUT_ms / 1000
 
 
 class ReceiverHandlerListener:
@@ -33,122 +46,158 @@ class ReceiverHandler(ReceiverSocketListener):
         else:
             self.socket: ReceiverSocketBase = socket
         self._listener: ReceiverHandlerListener = listener
-        # previousData for storing the last data that was send in a universe to check if the data has changed
-        self._previousData: Dict[int, tuple] = {}
-        # priorities are stored here. This is for checking if the incoming data has the best priority.
-        # universes are the keys and
-        # the value is a tuple with the last priority and the time when this priority recently was received
-        self._priorities: Dict[int, tuple] = {}
-        # store the last timestamp when something on an universe arrived for checking for timeouts
-        self._lastDataTimestamps: Dict[int, float] = {}
-        # store the last sequence number of a universe here:
-        self._lastSequence: Dict[int, int] = {}
+        # if True, the DataPackets for the listener are not padded to 512 slots
+        self.variable_length: bool = False
+        # if set, the DMX data of the sources of a universe is merged before it is passed to the listener
+        self.merger: Optional[Merger] = None
+        # the state of the sources of every universe, that has at least one source
+        self._universes: Dict[int, UniverseSources] = {}
+        # the time when a source times out, if no more data arrives. A source is moved to the end when its
+        # deadline is refreshed, so the deadlines are in ascending order, as long as the time does not go backwards
+        self._timeoutDeadlines: 'OrderedDict[Source, float]' = OrderedDict()
+        # the handlers for the different packet types. The key is the root vector and the framing vector as integers
+        self._packet_handlers: Dict[Tuple[int, int], Callable[[bytes, float], None]] = {
+            (vector_to_int(VECTOR_ROOT_E131_DATA), vector_to_int(VECTOR_E131_DATA_PACKET)):
+                self.on_data_packet,
+            (vector_to_int(VECTOR_ROOT_E131_EXTENDED), vector_to_int(VECTOR_E131_EXTENDED_SYNCHRONIZATION)):
+                self.on_sync_packet,
+            (vector_to_int(VECTOR_ROOT_E131_EXTENDED), vector_to_int(VECTOR_E131_EXTENDED_DISCOVERY)):
+                self.on_universe_discovery_packet,
+        }
 
     def on_data(self, data: bytes, current_time: float) -> None:
+        # classify the packet by its vectors and pass it to the matching handler. Unknown packets are ignored
+        handler = self._packet_handlers.get(peek_vectors(data))
+        if handler is not None:
+            handler(data, current_time)
+
+    def on_data_packet(self, data: bytes, current_time: float) -> None:
+        # only a view on the raw data is used for checking the packet.
+        # A full DataPacket is only decoded if the callbacks are fired.
         try:
-            tmp_packet = DataPacket.make_data_packet(data)
-        except TypeError:  # try to make a DataPacket. If it fails just ignore it
+            tmp_packet = DataPacketView(data)
+        except TypeError:  # try to make a DataPacketView. If it fails just ignore it
             return
 
-        self.check_for_stream_terminated_and_refresh_timestamp(tmp_packet, current_time)
-        self.refresh_priorities(tmp_packet, current_time)
-        if not self.is_legal_priority(tmp_packet):
+        universe = self._universes.get(tmp_packet.universe)
+        if universe is None:
+            universe = self.add_universe(tmp_packet)
+        source = universe.get_source(tmp_packet.cidBytes)
+        if tmp_packet.option_StreamTerminated:
+            self.on_stream_terminated(tmp_packet, universe, source)
             return
-        if not self.is_legal_sequence(tmp_packet):  # check for bad sequence number
+        self.refresh_deadline(source, current_time)
+        if not source.is_legal_sequence(tmp_packet.sequence):  # check for bad sequence number
             return
-        self.fire_callbacks_universe(tmp_packet)
+        won = universe.arbitrate(source, tmp_packet.priority, current_time, current_time + _TIMEOUT)
+        if self.is_merged(tmp_packet):
+            self.merge_and_fire_callbacks(tmp_packet, universe, source, won)
+        elif won:
+            self.fire_callbacks_universe(tmp_packet, universe, source)
+
+    def on_sync_packet(self, data: bytes, current_time: float) -> None:
+        # the E1.31 sync feature is not supported on the receiver side, so sync packets are dropped
+        pass
+
+    def on_universe_discovery_packet(self, data: bytes, current_time: float) -> None:
+        # receiving of universe discovery packets is not supported, so they are dropped
+        pass
 
     def on_periodic_callback(self, current_time: float) -> None:
-        # check all DataTimestamps for timeouts
-        for key, value in list(self._lastDataTimestamps.items()):
-            #  this is converted to list, because the length of the dict changes
-            if check_timeout(current_time, value):
-                self.fire_timeout_callback_and_delete(key)
-
-    def check_for_stream_terminated_and_refresh_timestamp(self, packet: DataPacket, current_time: float) -> None:
-        # refresh the last timestamp on a universe, but check if its the last message of a stream
-        # (the stream is terminated by the Stream termination bit)
-        if packet.option_StreamTerminated:
-            self.fire_timeout_callback_and_delete(packet.universe)
-        else:
-            # check if we add or refresh the data in lastDataTimestamps
-            if packet.universe not in self._lastDataTimestamps.keys():
-                # fire callbacks if this is the first received packet for this universe
-                self._listener.on_availability_change(universe=packet.universe, changed='available')
-            self._lastDataTimestamps[packet.universe] = current_time
+        # check the sources for timeouts, beginning with the earliest deadline. The others are not due yet
+        deadlines = self._timeoutDeadlines
+        while deadlines:
+            source = next(iter(deadlines))
+            if deadlines[source] > current_time:
+                break
+            self.remove_source(source)
+
+    def next_periodic_callback_time(self) -> Optional[float]:
+        for source in self._timeoutDeadlines:
+            return self._timeoutDeadlines[source]
+        return None
+
+    def add_universe(self, packet: DataPacketView) -> UniverseSources:
+        universe = UniverseSources(packet.universe)
+        self._universes[packet.universe] = universe
+        if not packet.option_StreamTerminated:
+            # fire callbacks if this is the first received packet for this universe
+            self._listener.on_availability_change(universe=packet.universe, changed='available')
+        return universe
+
+    def on_stream_terminated(self, packet: DataPacketView, universe: UniverseSources, source: Source) -> None:
+        # the source sent the last message of its stream (the stream is terminated by the Stream termination bit),
+        # so it does not take part in the arbitration and the merge anymore
+        self.remove_source(source)
+        # without merging, the last packet is still passed on, if its priority is high enough
+        if self.merger is None and packet.priority >= universe.priority and source.is_legal_sequence(packet.sequence):
+            self.fire_callbacks_universe(packet, universe, source)
+
+    def refresh_deadline(self, source: Source, current_time: float) -> None:
+        deadlines = self._timeoutDeadlines
+        if source in deadlines:
+            deadlines.move_to_end(source)
+        deadlines[source] = current_time + _TIMEOUT
+
+    def remove_source(self, source: Source) -> None:
+        # the universe times out with its last source
+        self._timeoutDeadlines.pop(source, None)
+        universe = self._universes.get(source.universe)
+        if universe is None:
+            return
+        universe.remove_source(source)
+        if not universe.sources:
+            self.fire_timeout_callback_and_delete(source.universe)
 
     def fire_timeout_callback_and_delete(self, universe: int):
         self._listener.on_availability_change(universe=universe, changed='timeout')
-        # delete the timestamp so that the callback is not fired multiple times
-        try:
-            del self._lastDataTimestamps[universe]
-        except KeyError:
-            pass  # drop exception, if there was no last timestamp
-        # delete sequence entries so that no packet out of order problems occur
-        try:
-            del self._lastSequence[universe]
-        except KeyError:
-            pass  # drop exception, if there was no last sequence number
-
-    def refresh_priorities(self, packet: DataPacket, current_time: float) -> None:
-        # check the priority and refresh the priorities dict
-        # check if the stored priority has timeouted and make the current packets priority the new one
-        if packet.universe not in self._priorities.keys() or \
-           self._priorities[packet.universe] is None or \
-           check_timeout(current_time, self._priorities[packet.universe][1]) or \
-           self._priorities[packet.universe][0] <= packet.priority:  # if the send priority is higher or
-            # equal than the stored one, than make the priority the new one
-            self._priorities[packet.universe] = (packet.priority, current_time)
-
-    def is_legal_sequence(self, packet: DataPacket) -> bool:
-        """
-        Check if the Sequence number of the DataPacket is legal.
-        For more information see page 17 of http://tsp.esta.org/tsp/documents/docs/E1-31-2016.pdf.
-        :param packet: the packet to check
-        :return: true if the sequence is legal. False if the sequence number is bad
-        """
-        # if the sequence of the packet is smaller than the last received sequence, return false
-        # therefore calculate the difference between the two values:
-        try:  # try, because self.lastSequence might not been initialized
-            diff = packet.sequence - self._lastSequence[packet.universe]
-            # if diff is between ]-20,0], return False for a bad packet sequence
-            if diff <= 0 and diff > -20:
-                return False
-        except KeyError:
-            pass
-        # if the sequence is good, return True and refresh the list with the new value
-        self._lastSequence[packet.universe] = packet.sequence
-        return True
-
-    def is_legal_priority(self, packet: DataPacket):
-        """
-        Check if the given packet has high enough priority for the stored values for the packet's universe.
-        :param packet: the packet to check
-        :return: returns True if the priority is good. Otherwise False
-        """
-        # check if the packet's priority is high enough to get processed
-        if packet.priority < self._priorities[packet.universe][0]:
-            return False  # return if the universe is not interesting
-        else:
-            return True
-
-    def fire_callbacks_universe(self, packet: DataPacket) -> None:
+        # delete the universe with all its sources, so that the callback is not fired multiple times
+        # and no packet out of order problems occur
+        universe_sources = self._universes.pop(universe, None)
+        if universe_sources is not None:
+            for source in universe_sources.sources.values():
+                self._timeoutDeadlines.pop(source, None)
+
+    def fire_callbacks_universe(self, packet: DataPacketView, universe: UniverseSources, source: Source) -> None:
+        if self.merger is not None:
+            # the packet has another start code than the merged ones, so it must not replace the merged levels
+            self._listener.on_dmx_data_change(packet.to_data_packet(self.variable_length))
+            return
         # call the listeners for the universe but before check if the data has changed
-        # check if there are listeners for the universe before proceeding
-        if packet.universe not in self._previousData.keys() or \
-           self._previousData[packet.universe] is None or \
-           self._previousData[packet.universe] != packet.dmxData:
-            # set previous data and inherit callbacks
-            self._previousData[packet.universe] = packet.dmxData
-            self._listener.on_dmx_data_change(packet)
+        data = packet.dmxData
+        if universe.previousData is not None and universe.previousData == data:
+            source.dmxData = universe.previousData
+            return
+        # the data is copied, because the view is only valid as long as the raw data is not changed
+        universe.previousData = source.dmxData = bytes(data)
+        source.changeStamps = None
+        self._listener.on_dmx_data_change(packet.to_data_packet(self.variable_length))
+
+    def is_merged(self, packet: DataPacketView) -> bool:
+        # packets with other start codes are passed to the listener without merging
+        if self.merger is None:
+            return False
+        start_code = packet.dmxStartCode
+        return start_code == 0 or (start_code == START_CODE_ADDRESS_PRIORITY and self.merger.uses_all_sources())
+
+    def merge_and_fire_callbacks(self, packet: DataPacketView, universe: UniverseSources, source: Source,
+                                 won: bool) -> None:
+        merger = self.merger
+        if not won and not merger.uses_all_sources():
+            return
+        if packet.dmxStartCode == START_CODE_ADDRESS_PRIORITY:
+            source.addressPriorities = bytes(packet.dmxData)
+        else:
+            merger.set_frame(source, bytes(packet.dmxData))
+        merged = merger.merge(universe)
+        if merged is None or merged == universe.previousData:
+            return
+        universe.previousData = merged
+        # the header of the packet, that caused the change, is passed on with the merged DMX data
+        merged_packet = packet.to_data_packet(self.variable_length)
+        merged_packet.dmxStartCode = 0
+        merged_packet.dmxData = merged
+        self._listener.on_dmx_data_change(merged_packet)
 
     def get_possible_universes(self) -> List[int]:
-        return list(self._lastDataTimestamps.keys())
-
-
-def time_millis(current_time: float) -> int:
-    return int(round(current_time * 1000))
-
-
-def check_timeout(current_time: float, time: float) -> bool:
-    return abs(time_millis(current_time) - time_millis(time)) > E131_NETWORK_DATA_LOSS_TIMEOUT_ms
+        return list(self._universes.keys())
@@ -2,6 +2,9 @@
 
 import pytest
 from sacn.messages.data_packet import DataPacket
+from sacn.messages.sync_packet import SyncPacket
+from sacn.messages.universe_discovery import UniverseDiscoveryPacket
+from sacn.receiving.merger import Merger
 from sacn.receiving.receiver_handler import ReceiverHandler, ReceiverHandlerListener, E131_NETWORK_DATA_LOSS_TIMEOUT_ms
 from sacn.receiving.receiver_socket_test import ReceiverSocketTest
 
@@ -34,10 +37,8 @@ def get_handler():
 def test_constructor():
     handler, _, _ = get_handler()
     assert handler._listener is not None
-    assert handler._previousData is not None
-    assert handler._priorities is not None
-    assert handler._lastDataTimestamps is not None
-    assert handler._lastSequence is not None
+    assert handler._universes is not None
+    assert handler._timeoutDeadlines is not None
 
 
 def test_first_packet():
@@ -54,7 +55,7 @@ def test_first_packet():
     socket.call_on_data(bytes(packet.getBytes()), 0)
     assert listener.on_availability_change_changed == 'available'
     assert listener.on_availability_change_universe == 1
-    assert listener.on_dmx_data_change_packet.__dict__ == packet.__dict__
+    assert listener.on_dmx_data_change_packet == packet
 
 
 def test_first_packet_stream_terminated():
@@ -72,7 +73,7 @@ def test_first_packet_stream_terminated():
     socket.call_on_data(bytes(packet.getBytes()), 0)
     assert listener.on_availability_change_changed == 'timeout'
     assert listener.on_availability_change_universe == 1
-    assert listener.on_dmx_data_change_packet.__dict__ == packet.__dict__
+    assert listener.on_dmx_data_change_packet == packet
 
 
 def test_invalid_packet_bytes():
@@ -87,6 +88,28 @@ def test_invalid_packet_bytes():
     assert listener.on_dmx_data_change_packet is None
 
 
+def test_packet_dispatch():
+    handler, listener, socket = get_handler()
+    called = []
+    handler._packet_handlers = {key: (lambda data, time, handler=handler: called.append(handler.__name__))
+                                for key, handler in handler._packet_handlers.items()}
+    socket.call_on_data(bytes(DataPacket(cid=tuple(range(0, 16)), sourceName='Test', universe=1).getBytes()), 0)
+    socket.call_on_data(bytes(SyncPacket(cid=tuple(range(0, 16)), syncAddr=1).getBytes()), 0)
+    socket.call_on_data(bytes(UniverseDiscoveryPacket(cid=tuple(range(0, 16)), sourceName='Test', universes=(1,)).getBytes()), 0)
+    # unknown packets are not dispatched at all
+    socket.call_on_data(bytes(x % 256 for x in range(0, 512)), 0)
+    socket.call_on_data(bytes(10), 0)
+    assert called == ['on_data_packet', 'on_sync_packet', 'on_universe_discovery_packet']
+
+
+def test_sync_and_discovery_packets_ignored():
+    _, listener, socket = get_handler()
+    socket.call_on_data(bytes(SyncPacket(cid=tuple(range(0, 16)), syncAddr=1).getBytes()), 0)
+    socket.call_on_data(bytes(UniverseDiscoveryPacket(cid=tuple(range(0, 16)), sourceName='Test', universes=(1,)).getBytes()), 0)
+    assert listener.on_availability_change_changed is None
+    assert listener.on_dmx_data_change_packet is None
+
+
 def test_invalid_priority():
     # send a lower priority on a second packet
     _, listener, socket = get_handler()
@@ -99,7 +122,7 @@ def test_invalid_priority():
         priority=100
     )
     socket.call_on_data(bytes(packet1.getBytes()), 0)
-    assert listener.on_dmx_data_change_packet.__dict__ == packet1.__dict__
+    assert listener.on_dmx_data_change_packet == packet1
     packet2 = DataPacket(
         cid=tuple(range(0, 16)),
         sourceName='Test',
@@ -109,7 +132,28 @@ def test_invalid_priority():
     )
     socket.call_on_data(bytes(packet2.getBytes()), 1)
     # second packet does not override the previous one
-    assert listener.on_dmx_data_change_packet.__dict__ == packet1.__dict__
+    assert listener.on_dmx_data_change_packet == packet1
+
+
+def test_priority_timeout():
+    # a lower priority is accepted, after the higher priority timed out
+    _, listener, socket = get_handler()
+    packet = DataPacket(
+        cid=tuple(range(0, 16)),
+        sourceName='Test',
+        universe=1,
+        dmxData=(1,),
+        priority=100
+    )
+    socket.call_on_data(bytes(packet.getBytes()), 0)
+    packet.priority = 99
+    packet.dmxData = (2,)
+    packet.sequence_increase()
+    socket.call_on_data(bytes(packet.getBytes()), E131_NETWORK_DATA_LOSS_TIMEOUT_ms / 1000 - 0.01)
+    assert listener.on_dmx_data_change_packet.dmxData[0] == 1
+    packet.sequence_increase()
+    socket.call_on_data(bytes(packet.getBytes()), E131_NETWORK_DATA_LOSS_TIMEOUT_ms / 1000)
+    assert listener.on_dmx_data_change_packet.dmxData[0] == 2
 
 
 def test_invalid_sequence():
@@ -125,7 +169,7 @@ def test_invalid_sequence():
             sequence=sequence_a
         )
         socket.call_on_data(bytes(packet1.getBytes()), 0)
-        assert listener.on_dmx_data_change_packet.__dict__ == packet1.__dict__
+        assert listener.on_dmx_data_change_packet == packet1
         packet2 = DataPacket(
             cid=tuple(range(0, 16)),
             sourceName='Test',
@@ -135,7 +179,7 @@ def test_invalid_sequence():
             sequence=sequence_b
         )
         socket.call_on_data(bytes(packet2.getBytes()), 1)
-        assert listener.on_dmx_data_change_packet.__dict__ == packet2.__dict__
+        assert listener.on_dmx_data_change_packet == packet2
 
     case_goes_through(100, 80)
     case_goes_through(101, 102)
@@ -150,6 +194,134 @@ def test_invalid_sequence():
     case_goes_through(0, 255)
 
 
+def test_multiple_sources():
+    # two sources with their own sequence numbers send on the same universe
+    handler, listener, socket = get_handler()
+    packet_a = DataPacket(cid=tuple(range(0, 16)), sourceName='A', universe=1, dmxData=(1,), sequence=100)
+    packet_b = DataPacket(cid=tuple(range(1, 17)), sourceName='B', universe=1, dmxData=(2,), sequence=10)
+    socket.call_on_data(bytes(packet_a.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxData[0] == 1
+    socket.call_on_data(bytes(packet_b.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxData[0] == 2
+    packet_a.sequence_increase()
+    socket.call_on_data(bytes(packet_a.getBytes()), 1)
+    assert listener.on_dmx_data_change_packet.dmxData[0] == 1
+    packet_b.sequence_increase()
+    socket.call_on_data(bytes(packet_b.getBytes()), 2)
+    assert listener.on_dmx_data_change_packet.dmxData[0] == 2
+    assert set(handler._universes[1].winners) == {bytes(packet_a.cid), bytes(packet_b.cid)}
+    # the universe does not time out, as long as one source sends
+    socket.call_on_periodic_callback(1 + E131_NETWORK_DATA_LOSS_TIMEOUT_ms / 1000)
+    assert listener.on_availability_change_changed == 'available'
+    assert list(handler._universes[1].sources) == [bytes(packet_b.cid)]
+    # the universe times out with its last source
+    socket.call_on_periodic_callback(2 + E131_NETWORK_DATA_LOSS_TIMEOUT_ms / 1000)
+    assert listener.on_availability_change_changed == 'timeout'
+    assert handler.get_possible_universes() == []
+
+
+def test_multiple_sources_stream_terminated():
+    handler, listener, socket = get_handler()
+    packet_a = DataPacket(cid=tuple(range(0, 16)), sourceName='A', universe=1, dmxData=(1,))
+    packet_b = DataPacket(cid=tuple(range(1, 17)), sourceName='B', universe=1, dmxData=(2,), priority=150)
+    socket.call_on_data(bytes(packet_a.getBytes()), 0)
+    socket.call_on_data(bytes(packet_b.getBytes()), 0)
+    packet_b.sequence_increase()
+    packet_b.option_StreamTerminated = True
+    socket.call_on_data(bytes(packet_b.getBytes()), 1)
+    # the universe is still available with the other source
+    assert listener.on_availability_change_changed == 'available'
+    assert handler.get_possible_universes() == [1]
+    assert list(handler._universes[1].sources) == [bytes(packet_a.cid)]
+    # the highest priority is kept until it timed out
+    packet_a.sequence_increase()
+    packet_a.dmxData = (3,)
+    socket.call_on_data(bytes(packet_a.getBytes()), 2)
+    assert listener.on_dmx_data_change_packet.dmxData[0] == 2
+    packet_a.sequence_increase()
+    socket.call_on_data(bytes(packet_a.getBytes()), 1 + E131_NETWORK_DATA_LOSS_TIMEOUT_ms / 1000)
+    assert listener.on_dmx_data_change_packet.dmxData[0] == 3
+    packet_a.sequence_increase()
+    packet_a.option_StreamTerminated = True
+    socket.call_on_data(bytes(packet_a.getBytes()), 4)
+    assert listener.on_availability_change_changed == 'timeout'
+    assert handler.get_possible_universes() == []
+    assert handler.next_periodic_callback_time() is None
+
+
+def test_merge_address_priority():
+    handler, listener, socket = get_handler()
+    handler.merger = Merger('address_priority')
+    packet_a = DataPacket(cid=tuple(range(0, 16)), sourceName='A', universe=1, dmxData=(10, 10), priority=150)
+    packet_b = DataPacket(cid=tuple(range(1, 17)), sourceName='B', universe=1, dmxData=(20, 20))
+    socket.call_on_data(bytes(packet_a.getBytes()), 0)
+    # the lower priority of the source is used for all slots
+    socket.call_on_data(bytes(packet_b.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxData[0:2] == (10, 10)
+    # the per-address priorities are merged, but not passed on as DMX data
+    packet_b.sequence_increase()
+    packet_b.dmxStartCode = 0xDD
+    packet_b.dmxData = (200, 100)
+    socket.call_on_data(bytes(packet_b.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxData[0:2] == (20, 10)
+    assert listener.on_dmx_data_change_packet.dmxStartCode == 0
+    # other start codes are not merged
+    packet_a.sequence_increase()
+    packet_a.dmxStartCode = 0x17
+    packet_a.dmxData = (1, 2)
+    socket.call_on_data(bytes(packet_a.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxStartCode == 0x17
+    assert listener.on_dmx_data_change_packet.dmxData[0:2] == (1, 2)
+    # and do not replace the merged levels of the source
+    packet_b.sequence_increase()
+    packet_b.dmxStartCode = 0
+    packet_b.dmxData = (30, 30)
+    socket.call_on_data(bytes(packet_b.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxData[0:2] == (30, 10)
+
+
+@pytest.mark.parametrize('mode, merged, merged_after', [('htp', (10, 20), (10, 30)), ('ltp', (0, 20), (0, 30))])
+def test_merge_other_start_codes(mode, merged, merged_after):
+    handler, listener, socket = get_handler()
+    handler.merger = Merger(mode)
+    packet_a = DataPacket(cid=tuple(range(0, 16)), sourceName='A', universe=1, dmxData=(10, 0))
+    packet_b = DataPacket(cid=tuple(range(1, 17)), sourceName='B', universe=1, dmxData=(0, 20))
+    socket.call_on_data(bytes(packet_a.getBytes()), 0)
+    socket.call_on_data(bytes(packet_b.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxData[0:2] == merged
+    # per-address priorities are not merged in these modes, but passed on
+    packet_a.sequence_increase()
+    packet_a.dmxStartCode = 0xDD
+    packet_a.dmxData = (100,) * 512
+    socket.call_on_data(bytes(packet_a.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxStartCode == 0xDD
+    # the priorities are not used as levels of the source
+    packet_b.sequence_increase()
+    packet_b.dmxData = (0, 30)
+    socket.call_on_data(bytes(packet_b.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxStartCode == 0
+    assert listener.on_dmx_data_change_packet.dmxData[0:2] == merged_after
+
+
+def test_terminated_source_not_merged():
+    handler, listener, socket = get_handler()
+    handler.merger = Merger('htp')
+    packet_a = DataPacket(cid=tuple(range(0, 16)), sourceName='A', universe=1, dmxData=(10, 10))
+    packet_b = DataPacket(cid=tuple(range(1, 17)), sourceName='B', universe=1, dmxData=(255, 255))
+    socket.call_on_data(bytes(packet_a.getBytes()), 0)
+    socket.call_on_data(bytes(packet_b.getBytes()), 0)
+    assert listener.on_dmx_data_change_packet.dmxData[0:2] == (255, 255)
+    packet_b.sequence_increase()
+    packet_b.option_StreamTerminated = True
+    socket.call_on_data(bytes(packet_b.getBytes()), 1)
+    # the terminated source is neither a source nor a winner anymore
+    assert list(handler._universes[1].sources) == [bytes(packet_a.cid)]
+    assert list(handler._universes[1].winners) == [bytes(packet_a.cid)]
+    packet_a.sequence_increase()
+    socket.call_on_data(bytes(packet_a.getBytes()), 2)
+    assert listener.on_dmx_data_change_packet.dmxData[0:2] == (10, 10)
+
+
 def test_possible_universes():
     handler, _, socket = get_handler()
     assert handler.get_possible_universes() == []
@@ -193,6 +365,45 @@ def test_universe_timeout():
     assert listener.on_availability_change_universe == 1
 
 
+def test_next_periodic_callback_time():
+    handler, listener, socket = get_handler()
+    timeout = E131_NETWORK_DATA_LOSS_TIMEOUT_ms / 1000
+    assert handler.next_periodic_callback_time() is None
+    packet = DataPacket(
+        cid=tuple(range(0, 16)),
+        sourceName='Test',
+        universe=1,
+        dmxData=tuple(range(0, 16))
+    )
+    socket.call_on_data(bytes(packet.getBytes()), 0)
+    packet.universe = 2
+    socket.call_on_data(bytes(packet.getBytes()), 1)
+    assert handler.next_periodic_callback_time() == timeout
+    # universe 1 was refreshed, so its timeout is only due later
+    packet.universe = 1
+    packet.sequence_increase()
+    socket.call_on_data(bytes(packet.getBytes()), 2)
+    assert handler.next_periodic_callback_time() == 1 + timeout
+    socket.call_on_periodic_callback(1 + timeout - 0.01)
+    assert listener.on_availability_change_changed == 'available'
+    socket.call_on_periodic_callback(handler.next_periodic_callback_time())
+    assert listener.on_availability_change_changed == 'timeout'
+    assert listener.on_availability_change_universe == 2
+    assert handler.next_periodic_callback_time() == 2 + timeout
+    # a terminated and restarted stream times out after the new deadline
+    packet.sequence_increase()
+    packet.option_StreamTerminated = True
+    socket.call_on_data(bytes(packet.getBytes()), 3)
+    packet.sequence_increase()
+    packet.option_StreamTerminated = False
+    socket.call_on_data(bytes(packet.getBytes()), 4)
+    assert handler.next_periodic_callback_time() == 4 + timeout
+    socket.call_on_periodic_callback(handler.next_periodic_callback_time())
+    assert listener.on_availability_change_universe == 1
+    assert listener.on_availability_change_changed == 'timeout'
+    assert handler.next_periodic_callback_time() is None
+
+
 def test_universe_stream_terminated():
     _, listener, socket = get_handler()
     assert listener.on_availability_change_changed is None
@@ -1,6 +1,7 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
 import logging
+from typing import Optional
 
 
 class ReceiverSocketListener:
@@ -9,11 +10,26 @@ class ReceiverSocketListener:
     """
 
     def on_data(self, data: bytes, current_time: float) -> None:
+        """
+        :param data: the raw bytes of the packet. This may be a view on a buffer, which is reused after the call
+        returns, so the data has to be copied if it is needed later on.
+        :param current_time: the current time in seconds of a monotonic clock
+        """
         raise NotImplementedError
 
     def on_periodic_callback(self, current_time: float) -> None:
+        """
+        :param current_time: the current time in seconds of a monotonic clock
+        """
         raise NotImplementedError
 
+    def next_periodic_callback_time(self) -> Optional[float]:
+        """
+        :return: the time at which on_periodic_callback has to be called next. None if it does not have to be called
+        until the next packet arrives. Default: None
+        """
+        return None
+
 
 class ReceiverSocketBase:
     """
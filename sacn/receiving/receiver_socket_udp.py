@@ -1,9 +1,14 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
+import errno
+import selectors
 import socket
 import threading
 import time
 import platform
+from typing import Optional
+
+from sacn.receiving import mmsg
 from sacn.receiving.receiver_socket_base import ReceiverSocketBase, ReceiverSocketListener
 
 THREAD_NAME = 'sACN input/receiver thread'
@@ -20,6 +25,9 @@ class ReceiverSocketUDP(ReceiverSocketBase):
         self._bind_address: str = bind_address
         self._bind_port: int = bind_port
         self._enabled_flag: bool = True
+        # all packets that are waiting are received with one recvmmsg syscall, if the system supports it
+        self.batch_receiving: bool = mmsg.AVAILABLE
+        self._ring: Optional[mmsg.ReceiveRing] = None
 
         # initialize the UDP socket
         self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
@@ -32,6 +40,9 @@ class ReceiverSocketUDP(ReceiverSocketBase):
             self._socket.bind(("", self._bind_port))
         else:
             self._socket.bind((self._bind_address, self._bind_port))
+        # stop wakes up the receive loop by sending a byte through this pair of sockets
+        self._wakeup_sender, self._wakeup_receiver = socket.socketpair()
+        self._wakeup_receiver.setblocking(False)
         self._logger.info(f'Bind receiver socket to IP: {self._bind_address} port: {self._bind_port}')
 
     def start(self):
@@ -48,32 +59,90 @@ class ReceiverSocketUDP(ReceiverSocketBase):
         Implements the run method inherited by threading.Thread
         """
         self._logger.info(f'Started {THREAD_NAME}')
-        self._socket.settimeout(0.1)  # timeout as 100ms
+        # the loop sleeps until a packet arrives, the next periodic callback is due or stop is called
+        self._socket.setblocking(False)
         self._enabled_flag = True
-        while self._enabled_flag:
-            # before receiving: invoke periodic callback
-            self._listener.on_periodic_callback(time.time())
-            # receive the data
-            try:
-                raw_data = list(self._socket.recv(2048))  # greater than 1144 because the longest possible packet
-                # in the sACN standard is the universe discovery packet with a max length of 1144
-            except socket.timeout:
-                continue  # if a timeout happens just go through while from the beginning
-            self._listener.on_data(raw_data, time.time())
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._socket, selectors.EVENT_READ)
+            selector.register(self._wakeup_receiver, selectors.EVENT_READ)
+            while self._enabled_flag:
+                for key, _ in selector.select(self._call_periodic_callback_if_due()):
+                    if key.fileobj is self._socket:
+                        self._receive()
+                    else:
+                        self._wakeup_receiver.recv(64)
 
         self._logger.info(f'Stopped {THREAD_NAME}')
 
+    def _call_periodic_callback_if_due(self) -> Optional[float]:
+        """
+        Calls the periodic callback of the listener, if it is due.
+        :return: the time in seconds until the next periodic callback is due. None if there is none
+        """
+        next_time = self._listener.next_periodic_callback_time()
+        if next_time is None:
+            return None
+        current_time = time.monotonic()
+        if next_time <= current_time:
+            self._listener.on_periodic_callback(current_time)
+            next_time = self._listener.next_periodic_callback_time()
+            if next_time is None:
+                return None
+        return max(next_time - current_time, 0.0)
+
+    def _receive(self) -> None:
+        """
+        Passes the waiting packets to the listener.
+        """
+        if self.batch_receiving and self._receive_batch():
+            return
+        try:
+            raw_data = self._socket.recv(2048)  # greater than 1144 because the longest possible packet
+            # in the sACN standard is the universe discovery packet with a max length of 1144
+        except BlockingIOError:
+            return
+        self._listener.on_data(raw_data, time.monotonic())
+
+    def _receive_batch(self) -> bool:
+        """
+        Passes all waiting packets to the listener. They are received with one syscall.
+        The packets are views on the buffers of a ReceiveRing, which are reused for the next batch.
+        :return: False if batch receiving is not possible and the packets have to be received one by one
+        """
+        if self._ring is None:
+            self._ring = mmsg.ReceiveRing()
+        try:
+            count = self._ring.receive(self._socket)
+        except OSError as e:
+            if e.errno != errno.ENOSYS:
+                raise
+            # the syscall is not allowed (e.g. in a sandbox), so every packet is received on its own from now on
+            self.batch_receiving = False
+            return False
+        current_time = time.monotonic()
+        ring = self._ring
+        listener = self._listener
+        for index in range(0, count):
+            listener.on_data(ring.packet(index), current_time)
+        return True
+
     def stop(self) -> None:
         """
         Stops a running thread and closes the underlying socket. If no thread was started, nothing happens.
         Do not reuse the socket after calling stop once.
         """
         self._enabled_flag = False
+        try:
+            self._wakeup_sender.send(b'\0')
+        except OSError:  # the socket was already stopped
+            pass
         try:
             self._thread.join()
-            # stop the socket, after the loop terminated
+            # stop the sockets, after the loop terminated
             self._socket.close()
-        except AttributeError:
+            self._wakeup_sender.close()
+            self._wakeup_receiver.close()
+        except AttributeError:  # no thread was started, so the receiver can still be started
             pass
 
     def join_multicast(self, multicast_addr: str) -> None:
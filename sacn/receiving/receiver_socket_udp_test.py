@@ -0,0 +1,117 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import errno
+import socket
+import threading
+import time
+import pytest
+from sacn.receiving import mmsg
+from sacn.receiving.receiver_socket_base import ReceiverSocketListener
+from sacn.receiving.receiver_socket_udp import ReceiverSocketUDP
+
+
+class Listener(ReceiverSocketListener):
+    def __init__(self, count: int):
+        self.count = count
+        self.data = []
+        self.types = set()
+        self.periodic_callbacks = 0
+        self.socket = None
+
+    def on_data(self, data: bytes, current_time: float) -> None:
+        self.types.add(type(data))
+        # the data is only valid during the call
+        self.data.append(bytes(data))
+        if len(self.data) >= self.count:
+            self.socket._enabled_flag = False
+
+    def on_periodic_callback(self, current_time: float) -> None:
+        self.periodic_callbacks += 1
+
+
+def run_receive_loop(batch_receiving: bool, listener: Listener) -> ReceiverSocketUDP:
+    receiver_socket = ReceiverSocketUDP(listener, '127.0.0.1', 0)
+    listener.socket = receiver_socket
+    receiver_socket.batch_receiving = batch_receiving
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    packets = [bytes([i]) * 200 for i in range(0, 100)]
+    for packet in packets:
+        sender.sendto(packet, ('127.0.0.1', receiver_socket._socket.getsockname()[1]))
+    sender.close()
+    receiver_socket.receive_loop()
+    receiver_socket._socket.close()
+    assert listener.data == packets
+    return receiver_socket
+
+
+@pytest.mark.skipif(not mmsg.AVAILABLE, reason='recvmmsg is not available on this system')
+def test_receive_loop_batch():
+    listener = Listener(100)
+    run_receive_loop(True, listener)
+    assert listener.types == {memoryview}
+
+
+def test_receive_loop_single():
+    listener = Listener(100)
+    run_receive_loop(False, listener)
+    assert listener.types == {bytes}
+    # the listener does not need periodic callbacks
+    assert listener.periodic_callbacks == 0
+
+
+@pytest.mark.skipif(not mmsg.AVAILABLE, reason='recvmmsg is not available on this system')
+def test_receive_loop_batch_not_supported(monkeypatch):
+    def receive(self, sock):
+        raise OSError(errno.ENOSYS, 'not supported')
+    monkeypatch.setattr(mmsg.ReceiveRing, 'receive', receive)
+    listener = Listener(100)
+    receiver_socket = run_receive_loop(True, listener)
+    assert receiver_socket.batch_receiving is False
+    assert listener.types == {bytes}
+
+
+class PeriodicListener(Listener):
+    def __init__(self):
+        super().__init__(0)
+        self.times = []
+        self.next_time = time.monotonic() + 0.05
+
+    def on_periodic_callback(self, current_time: float) -> None:
+        self.times.append(current_time)
+        self.next_time = None if len(self.times) == 3 else current_time + 0.05
+
+    def next_periodic_callback_time(self):
+        return self.next_time
+
+
+def test_periodic_callback_and_stop():
+    listener = PeriodicListener()
+    start = listener.next_time
+    receiver_socket = ReceiverSocketUDP(listener, '127.0.0.1', 0)
+    receiver_socket.start()
+    time.sleep(0.3)
+    # the callback is called when it is due and not earlier
+    assert len(listener.times) == 3
+    assert all(current_time >= start + index * 0.05 for index, current_time in enumerate(listener.times))
+    # the loop has nothing to do, but stop wakes it up
+    stop_time = time.monotonic()
+    receiver_socket.stop()
+    assert time.monotonic() - stop_time < 0.05
+    assert not any(thread.name == 'sACN input/receiver thread' for thread in threading.enumerate())
+    # stopping twice does nothing
+    receiver_socket.stop()
+
+
+def test_stop_before_start():
+    # sACNreceiver.start calls stop before it starts the thread
+    listener = Listener(1)
+    receiver_socket = ReceiverSocketUDP(listener, '127.0.0.1', 0)
+    listener.socket = receiver_socket
+    receiver_socket.stop()
+    receiver_socket.start()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.sendto(bytes(10), ('127.0.0.1', receiver_socket._socket.getsockname()[1]))
+    sender.close()
+    receiver_socket._thread.join(1)
+    assert listener.data == [bytes(10)]
+    receiver_socket.stop()
@@ -0,0 +1,97 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+"""
+The state of the sources that send data on a universe. A source is identified by its CID.
+"""
+
+from typing import Dict, Optional
+
+
+class Source:
+    """
+    The state of one source on one universe.
+    """
+
+    __slots__ = ('cid', 'universe', 'priority', 'sequence', 'dmxData', 'addressPriorities', 'changeStamps')
+
+    def __init__(self, cid: bytes, universe: int):
+        self.cid: bytes = cid
+        self.universe: int = universe
+        # the priority of the last packet
+        self.priority: int = -1
+        # the sequence number of the last packet. None if no packet was received
+        self.sequence: Optional[int] = None
+        # the DMX data of the last packet, that was passed on or merged. None if there was none
+        self.dmxData: Optional[bytes] = None
+        # the per-address priorities of the last packet with the start code 0xDD. Only used by the merger
+        self.addressPriorities: Optional[bytes] = None
+        # the number of the frame, in which each slot was changed last. Only used by the ltp merger
+        self.changeStamps = None
+
+    def is_legal_sequence(self, sequence: int) -> bool:
+        """
+        Check if the sequence number of a packet of this source is legal and store it if it is.
+        For more information see page 17 of http://tsp.esta.org/tsp/documents/docs/E1-31-2016.pdf.
+        :param sequence: the sequence number of the packet
+        :return: True if the sequence is legal. False if the sequence number is bad
+        """
+        if self.sequence is not None:
+            diff = sequence - self.sequence
+            # if diff is between ]-20,0], the sequence is bad
+            if -20 < diff <= 0:
+                return False
+        self.sequence = sequence
+        return True
+
+
+class UniverseSources:
+    """
+    All sources that send on one universe and the sources with the highest priority, which win the arbitration.
+    The highest priority is kept until no source sent with it for the timeout, even if all sources lowered their
+    priorities.
+    """
+
+    __slots__ = ('universe', 'sources', 'winners', 'priority', 'priorityDeadline', 'previousData')
+
+    def __init__(self, universe: int):
+        self.universe: int = universe
+        # all sources of the universe by their CID
+        self.sources: Dict[bytes, Source] = {}
+        # the sources, whose last packet had the highest priority, by their CID
+        self.winners: Dict[bytes, Source] = {}
+        self.priority: int = -1
+        # the time when the highest priority times out, if no source sends with it
+        self.priorityDeadline: float = 0.0
+        # the DMX data that was last passed to the listener
+        self.previousData: Optional[bytes] = None
+
+    def get_source(self, cid: bytes) -> Source:
+        """
+        :return: the source with the CID. It is added if it is new
+        """
+        source = self.sources.get(cid)
+        if source is None:
+            source = Source(cid, self.universe)
+            self.sources[cid] = source
+        return source
+
+    def remove_source(self, source: Source) -> None:
+        self.sources.pop(source.cid, None)
+        self.winners.pop(source.cid, None)
+
+    def arbitrate(self, source: Source, priority: int, current_time: float, deadline: float) -> bool:
+        """
+        Stores the priority of a packet of the source and checks if it wins the arbitration.
+        :param deadline: the time when the priority times out, if it is the highest
+        :return: True if the packet has the highest priority
+        """
+        source.priority = priority
+        if priority > self.priority or (priority < self.priority and self.priorityDeadline <= current_time):
+            self.priority = priority
+            self.winners = {}
+        if priority == self.priority:
+            self.priorityDeadline = deadline
+            self.winners[source.cid] = source
+            return True
+        self.winners.pop(source.cid, None)
+        return False
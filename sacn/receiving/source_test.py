@@ -0,0 +1,49 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+from sacn.receiving.source import Source, UniverseSources
+
+
+def test_legal_sequence():
+    source = Source(bytes(16), 1)
+    assert source.is_legal_sequence(100)
+    assert not source.is_legal_sequence(100)
+    assert not source.is_legal_sequence(81)
+    assert source.is_legal_sequence(80)
+    assert source.is_legal_sequence(81)
+    assert source.sequence == 81
+
+
+def test_get_and_remove_source():
+    universe = UniverseSources(1)
+    source = universe.get_source(b'a' * 16)
+    assert source.universe == 1
+    assert universe.get_source(b'a' * 16) is source
+    assert universe.arbitrate(source, 100, 0, 2.5)
+    assert universe.winners == {source.cid: source}
+    universe.remove_source(source)
+    assert universe.sources == {}
+    assert universe.winners == {}
+
+
+def test_arbitrate():
+    universe = UniverseSources(1)
+    source_a = universe.get_source(b'a' * 16)
+    source_b = universe.get_source(b'b' * 16)
+    source_c = universe.get_source(b'c' * 16)
+    assert universe.arbitrate(source_a, 100, 0, 2.5)
+    # equal priorities win both
+    assert universe.arbitrate(source_b, 100, 0.1, 2.6)
+    assert set(universe.winners) == {source_a.cid, source_b.cid}
+    assert not universe.arbitrate(source_c, 99, 0.2, 2.7)
+    # a higher priority wins alone
+    assert universe.arbitrate(source_c, 101, 0.3, 2.8)
+    assert set(universe.winners) == {source_c.cid}
+    assert not universe.arbitrate(source_a, 100, 0.4, 2.9)
+    # a lowered priority loses until the highest priority timed out
+    assert not universe.arbitrate(source_c, 100, 1, 3.5)
+    assert universe.winners == {}
+    assert not universe.arbitrate(source_a, 100, 2.7, 5.2)
+    assert universe.arbitrate(source_a, 100, 2.8, 5.3)
+    assert universe.arbitrate(source_c, 100, 2.9, 5.4)
+    assert universe.priority == 100
+    assert set(universe.winners) == {source_a.cid, source_c.cid}
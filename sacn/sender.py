@@ -10,12 +10,17 @@ import time
 from typing import Dict, List, Optional
 
 from sacn.messages.data_packet import DataPacket
+from sacn.sending.frame_bank import FrameBank
+from sacn.sending.frame_statistics import FrameStatistics
 from sacn.sending.output import Output
 from sacn.sending.sender_socket_base import SenderSocketBase, DEFAULT_PORT
 from sacn.sending.sender_handler import SenderHandler
 
 
 class sACNsender:
+    # the class of the handler, that decides which packets are send out
+    _handler_class = SenderHandler
+
     def __init__(self, bind_address: str = '0.0.0.0', bind_port: int = DEFAULT_PORT,
                  source_name: str = 'default source name', cid: tuple = (),
                  fps: int = 30, universeDiscovery: bool = True,
@@ -40,7 +45,7 @@ class sACNsender:
         if len(cid) != 16:
             cid = tuple(int(random.random() * 255) for _ in range(0, 16))
         self._outputs: Dict[int, Output] = {}
-        self._sender_handler = SenderHandler(cid, source_name, self._outputs, bind_address, bind_port, fps, socket)
+        self._sender_handler = self._handler_class(cid, source_name, self._outputs, bind_address, bind_port, fps, socket)
         self.universeDiscovery = universeDiscovery
         self._sync_universe: int = sync_universe
 
@@ -52,6 +57,42 @@ class sACNsender:
     def universeDiscovery(self, universeDiscovery: bool) -> None:
         self._sender_handler.universe_discovery = universeDiscovery
 
+    @property
+    def max_discovery_packets_per_frame(self) -> int:
+        """
+        The universe discovery pages are spread over the 10 second discovery interval.
+        This limits the number of discovery packets that are send out in one frame. Default: 1
+        """
+        return self._sender_handler.max_discovery_packets_per_frame
+
+    @max_discovery_packets_per_frame.setter
+    def max_discovery_packets_per_frame(self, max_discovery_packets_per_frame: int) -> None:
+        if max_discovery_packets_per_frame < 1:
+            raise ValueError(f'max_discovery_packets_per_frame must be at least 1! '
+                             f'It was {max_discovery_packets_per_frame}')
+        self._sender_handler.max_discovery_packets_per_frame = max_discovery_packets_per_frame
+
+    @property
+    def frame_statistics(self) -> FrameStatistics:
+        """
+        Statistics about how late the frames of the sending thread started. Can be used to check the frame rate.
+        """
+        return self._sender_handler.socket.frame_statistics
+
+    @property
+    def spin_time(self) -> float:
+        """
+        The time in seconds before each frame, that the sending thread waits without sleeping. This makes the frame
+        timing more precise, but costs CPU time. Default: 0
+        """
+        return self._sender_handler.socket.spin_time
+
+    @spin_time.setter
+    def spin_time(self, spin_time: float) -> None:
+        if spin_time < 0:
+            raise ValueError(f'spin_time must not be negative! Value was {spin_time}')
+        self._sender_handler.socket.spin_time = spin_time
+
     @property
     def manual_flush(self) -> bool:
         return self._sender_handler.manual_flush
@@ -71,12 +112,36 @@ class sACNsender:
         for uni in universes:
             if uni not in self._outputs:
                 raise ValueError(f'Cannot flush universe {uni}, it is not active!')
+        self._sender_handler.read_frame_bank()
         self._sender_handler.send_out_all_universes(
             self._sync_universe,
             self._outputs if not universes else {uni: self._outputs[uni] for uni in universes},
-            time.time()
+            time.monotonic()
         )
 
+    def attach_frame_bank(self, frame_bank: FrameBank, universes: List[int]) -> None:
+        """
+        Uses the frames of a shared memory frame bank as DMX data. Other processes can write the frames without
+        calling the sender, the sending thread picks up changed frames on every tick.
+        The frame of a universe that is not activated is used, once the universe is activated.
+        A previously attached bank is replaced. If the same bank is attached again, only the frames whose universe
+        changed are read again.
+        :param frame_bank: the frame bank
+        :param universes: the universe of every frame. The frame with index i is used for universes[i].
+        :raises ValueError: if there are more universes than frames in the bank
+        """
+        if len(universes) > frame_bank.size:
+            raise ValueError(f'The frame bank has only {frame_bank.size} frames, but {len(universes)} universes were given!')
+        for universe in universes:
+            check_universe(universe)
+        self._sender_handler.attach_frame_bank(frame_bank, tuple(universes))
+
+    def detach_frame_bank(self) -> None:
+        """
+        Stops using the frames of the attached frame bank. The DMX data of the outputs stays as it is.
+        """
+        self._sender_handler.attach_frame_bank(None)
+
     def activate_output(self, universe: int) -> None:
         """
         Activates a universe that's then starting to sending every second.
@@ -90,6 +155,7 @@ class sACNsender:
         # add new sending:
         new_output = Output(DataPacket(cid=self._sender_handler._CID, sourceName=self._sender_handler._source_name, universe=universe))
         self._outputs[universe] = new_output
+        self._sender_handler.on_outputs_changed()
 
     def deactivate_output(self, universe: int) -> None:
         """
@@ -101,11 +167,12 @@ class sACNsender:
         try:  # try to send out three messages with stream_termination bit set to 1
             self._outputs[universe]._packet.option_StreamTerminated = True
             for _ in range(0, 3):
-                self._sender_handler.send_out(self._outputs[universe], time.time())
+                self._sender_handler.send_out(self._outputs[universe], time.monotonic())
         except KeyError:
             pass
         try:
             del self._outputs[universe]
+            self._sender_handler.on_outputs_changed()
         except KeyError:
             pass
 
@@ -132,6 +199,7 @@ class sACNsender:
         tmp_output._packet.universe = universe_to
         tmp_output._packet.option_StreamTerminated = False
         self._outputs[universe_to] = tmp_output
+        self._sender_handler.on_outputs_changed()
 
     def __getitem__(self, item: int) -> Optional[Output]:
         try:
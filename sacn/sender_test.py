@@ -44,6 +44,35 @@ def test_universe_discovery_setting():
     assert sender._sender_handler.universe_discovery is False
 
 
+def test_max_discovery_packets_per_frame_setting():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    assert sender.max_discovery_packets_per_frame == 1
+    sender.max_discovery_packets_per_frame = 4
+    assert sender.max_discovery_packets_per_frame == 4
+    assert sender._sender_handler.max_discovery_packets_per_frame == 4
+    with pytest.raises(ValueError):
+        sender.max_discovery_packets_per_frame = 0
+
+
+def test_spin_time_setting():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    assert sender.spin_time == 0
+    sender.spin_time = 0.0005
+    assert sender.spin_time == 0.0005
+    assert socket.spin_time == 0.0005
+    with pytest.raises(ValueError):
+        sender.spin_time = -1
+
+
+def test_frame_statistics():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    assert sender.frame_statistics is socket.frame_statistics
+    assert sender.frame_statistics.frames == 0
+
+
 def test_manual_flush_setting():
     socket = SenderSocketTest()
     sender = sacn.sACNsender(socket=socket)
@@ -74,15 +103,15 @@ def test_flush():
     assert socket.send_unicast_called is None
     # test that no parameters triggers flushing of all universes
     sender.flush()
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(
-        sender._sender_handler._CID, sender._sender_handler._source_name, 1, sync_universe=sync_universe).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(
+        sender._sender_handler._CID, sender._sender_handler._source_name, 1, sync_universe=sync_universe)
 
     # activate universe 2
     sender.activate_output(2)
     # test that a list with only universe 1 triggers flushing of only this universe
     sender.flush([1])
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(
-        sender._sender_handler._CID, sender._sender_handler._source_name, 1, sequence=1, sync_universe=sync_universe).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(
+        sender._sender_handler._CID, sender._sender_handler._source_name, 1, sequence=1, sync_universe=sync_universe)
 
 
 def test_activate_output():
@@ -113,8 +142,8 @@ def test_deactivate_output():
     sender.activate_output(100)
     assert socket.send_unicast_called is None
     sender.deactivate_output(100)
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(
-        sender._sender_handler._CID, sender._sender_handler._source_name, 100, sequence=2, streamTerminated=True).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(
+        sender._sender_handler._CID, sender._sender_handler._source_name, 100, sequence=2, streamTerminated=True)
 
     # start with no universes active
     assert list(sender._outputs.keys()) == []
@@ -169,6 +198,25 @@ def test_move_universe():
     assert sender._outputs[2] == output
 
 
+def test_universe_discovery_packets_invalidated():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    handler = sender._sender_handler
+
+    def send_universe_discovery() -> tuple:
+        handler.send_universe_discovery_packets()
+        return socket.send_broadcast_called.universes
+
+    sender.activate_output(1)
+    assert send_universe_discovery() == (1,)
+    sender.activate_output(3)
+    assert send_universe_discovery() == (1, 3)
+    sender.move_universe(1, 2)
+    assert send_universe_discovery() == (2, 3)
+    sender.deactivate_output(2)
+    assert send_universe_discovery() == (3,)
+
+
 def test_getitem():
     socket = SenderSocketTest()
     sender = sacn.sACNsender(socket=socket)
@@ -282,6 +330,126 @@ def test_output_dmx_data():
     test = tuple([x % 256 for x in range(0, 512)])
     sender[1].dmx_data = test
     assert sender[1].dmx_data == test
+    # test setting a buffer
+    sender[1].dmx_data = bytearray(range(0, 10))
+    assert sender[1].dmx_data == tuple(range(0, 10)) + (0,) * 502
+
+
+def test_output_max_fps():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    sender.activate_output(1)
+
+    # test default
+    assert sender[1].max_fps is None
+    # test setting and retriving the value
+    sender[1].max_fps = 44
+    assert sender[1].max_fps == 44
+    sender[1].max_fps = None
+    assert sender[1].max_fps is None
+    with pytest.raises(ValueError):
+        sender[1].max_fps = 0
+
+
+def test_output_keep_alive_interval():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    sender.activate_output(1)
+
+    # test default
+    assert sender[1].keep_alive_interval == 1
+    # test setting and retriving the value
+    sender[1].keep_alive_interval = 0.5
+    assert sender[1].keep_alive_interval == 0.5
+    with pytest.raises(ValueError):
+        sender[1].keep_alive_interval = 0
+    # the receivers would drop the source between the packets
+    with pytest.raises(ValueError):
+        sender[1].keep_alive_interval = 2.5
+
+
+def test_output_set_channel():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    sender.activate_output(1)
+    assert sender[1].dirty_range is None
+
+    # DMX addresses start with 1
+    sender[1].set_channel(1, 255)
+    sender[1].set_channel(512, 10)
+    assert sender[1].dmx_data == (255,) + (0,) * 510 + (10,)
+    assert sender[1].dirty_range == (0, 512)
+    with pytest.raises(ValueError):
+        sender[1].set_channel(0, 1)
+    with pytest.raises(ValueError):
+        sender[1].set_channel(513, 1)
+    with pytest.raises(ValueError):
+        sender[1].set_channel(1, 256)
+
+
+def test_output_set_channels():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    sender.activate_output(1)
+
+    sender[1].set_channels(10, (1, 2, 3))
+    assert sender[1].dmx_data[8:13] == (0, 1, 2, 3, 0)
+    assert sender[1].dirty_range == (9, 12)
+    sender[1].set_channels(20, b'\x04\x05')
+    assert sender[1].dmx_data[18:22] == (0, 4, 5, 0)
+    assert sender[1].dirty_range == (9, 21)
+    with pytest.raises(ValueError):
+        sender[1].set_channels(512, (1, 2))
+
+    # after sending, nothing is dirty
+    sender._sender_handler.send_out(sender[1], 0)
+    assert sender[1].dirty_range is None
+    sender[1].set_channels(1, (1,))
+    assert sender[1].dirty_range == (0, 1)
+    sender[1].dmx_data = (1, 2)
+    assert sender[1].dirty_range == (0, 512)
+
+
+def test_output_item_access():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    sender.activate_output(1)
+    output = sender[1]
+
+    # indices start with 0
+    output[0] = 1
+    output[511] = 2
+    output[-2] = 3
+    assert output[0] == 1
+    assert output[511] == 2
+    assert output[510] == 3
+    output[10:13] = (4, 5, 6)
+    assert output[9:14] == (0, 4, 5, 6, 0)
+    output[500:] = bytes((7, 8))
+    assert output[499:503] == (0, 7, 8, 0)
+    with pytest.raises(ValueError):
+        output[10:13] = (1, 2)
+    with pytest.raises(ValueError):
+        output[10:14:2] = (1, 2)
+    with pytest.raises(ValueError):
+        output[512] = 1
+    with pytest.raises(TypeError):
+        output['1'] = 1
+
+
+def test_output_set_channel_sends():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    sender.activate_output(1)
+    sender._sender_handler.on_periodic_callback(100.0)
+    assert socket.send_unicast_called[0].sequence == 0
+    sender._sender_handler.on_periodic_callback(100.1)
+    assert socket.send_unicast_called[0].sequence == 0
+    # a changed channel is send out on the next tick
+    sender[1].set_channel(5, 100)
+    sender._sender_handler.on_periodic_callback(100.2)
+    assert socket.send_unicast_called[0].sequence == 1
+    assert socket.send_unicast_called[0].dmxData[4] == 100
 
 
 def test_check_universe():
@@ -291,3 +459,154 @@ def test_check_universe():
         check_universe(64000)
     check_universe(1)
     check_universe(63999)
+
+
+def test_output_variable_length():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    sender.activate_output(1)
+
+    # test default
+    assert sender[1].variable_length is False
+    sender[1].dmx_data = (1, 2, 3)
+    assert sender[1].dmx_data == (1, 2, 3) + (0,) * 509
+    # test setting and retriving the value
+    sender[1].variable_length = True
+    assert sender[1].variable_length is True
+    sender[1].dmx_data = (1, 2, 3)
+    assert sender[1].dmx_data == (1, 2, 3)
+    assert len(sender[1]._packet.getBuffer()) == 129
+
+
+def test_output_change_detection():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    sender.activate_output(1)
+    output = sender[1]
+    assert output.change_detection is False
+    sender._sender_handler.on_periodic_callback(100.0)
+    assert socket.send_unicast_called[0].sequence == 0
+
+    # without change detection, the same data is send out again
+    output.dmx_data = (0,) * 512
+    sender._sender_handler.on_periodic_callback(100.1)
+    assert socket.send_unicast_called[0].sequence == 1
+    assert output.suppressed_sends == 0
+
+    output.change_detection = True
+    output.dmx_data = (0,) * 512
+    output.set_channels(1, (0, 0))
+    output[5] = 0
+    sender._sender_handler.on_periodic_callback(100.2)
+    assert socket.send_unicast_called[0].sequence == 1
+    assert output.dirty_range is None
+    assert output.suppressed_sends == 3
+
+    # changed data is still send out
+    output.dmx_data = (1, 2)
+    # assigning the same data again before the change was send out does not suppress a send
+    output.dmx_data = (1, 2)
+    output.set_channel(2, 2)
+    sender._sender_handler.on_periodic_callback(100.3)
+    assert socket.send_unicast_called[0].sequence == 2
+    assert socket.send_unicast_called[0].dmxData[0:3] == (1, 2, 0)
+    assert output.suppressed_sends == 3
+    # invalid data is still rejected
+    with pytest.raises(ValueError):
+        output.dmx_data = (256,)
+
+
+def test_frame_bank():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    sender.activate_output(1)
+    sender.activate_output(2)
+    bank = sacn.FrameBank(3)
+    try:
+        with pytest.raises(ValueError):
+            sender.attach_frame_bank(bank, [1, 2, 3, 4])
+        with pytest.raises(ValueError):
+            sender.attach_frame_bank(bank, [0])
+        # universe 3 is not active yet
+        sender.attach_frame_bank(bank, [2, 1, 3])
+        sender._sender_handler.on_periodic_callback(100.0)
+        assert socket.send_unicast_called[0].sequence == 0
+
+        other = sacn.FrameBank.attach(bank.name)
+        other.write(1, (1, 2, 3))
+        other.write(2, (4,))
+        other.close()
+        sender._sender_handler.on_periodic_callback(100.1)
+        assert sender[1].dmx_data[0:4] == (1, 2, 3, 0)
+        assert sender[2].dmx_data[0:4] == (0, 0, 0, 0)
+        assert socket.send_unicast_called[0].dmxData[0:3] == (1, 2, 3)
+        # unchanged frames are not copied again
+        sender[1].dmx_data = (5,)
+        sender._sender_handler.on_periodic_callback(100.2)
+        assert sender[1].dmx_data[0] == 5
+
+        # the frame of universe 3 is used once it is activated
+        bank.write(2, (6,))
+        sender._sender_handler.on_periodic_callback(100.3)
+        sender.activate_output(3)
+        sender._sender_handler.on_periodic_callback(100.4)
+        assert sender[3].dmx_data[0] == 6
+
+        # a flush picks up the frames as well
+        sender.manual_flush = True
+        bank.write(0, (9,))
+        sender.flush([2])
+        assert socket.send_unicast_called[0].dmxData[0] == 9
+
+        sender.detach_frame_bank()
+        bank.write(0, (10,))
+        sender.flush([2])
+        assert socket.send_unicast_called[0].dmxData[0] == 9
+
+        # the frames of universes that changed are read again, when the bank is attached again
+        sender.attach_frame_bank(bank, [1])
+        sender.flush([1])
+        assert sender[1].dmx_data[0] == 10
+        sender[1].dmx_data = (0,)
+        sender[2].dmx_data = (0,)
+        sender.attach_frame_bank(bank, [2])
+        sender.flush([2])
+        assert sender[2].dmx_data[0] == 10
+        assert sender[1].dmx_data[0] == 0
+    finally:
+        bank.close()
+        bank.unlink()
+
+
+def test_frame_bank_large():
+    socket = SenderSocketTest()
+    sender = sacn.sACNsender(socket=socket)
+    # frames in different chunks of the counters, the last one at the end of the bank
+    indices = (0, 1, 7, 8, 2047, 2048, 3000)
+    for index in indices:
+        sender.activate_output(index + 1)
+    bank = sacn.FrameBank(3001)
+    try:
+        # only the universes of a part of the bank are active
+        sender.attach_frame_bank(bank, range(1, 3002))
+        for index in indices:
+            bank.write(index, (index % 256,))
+        bank.write(100, (1,))
+        sender._sender_handler.on_periodic_callback(100.0)
+        for index in indices:
+            assert sender[index + 1].dmx_data[0] == index % 256
+
+        # only the changed frame is copied
+        for index in indices:
+            sender[index + 1].dmx_data = (255,)
+        bank.write(2048, (1,))
+        sender._sender_handler.on_periodic_callback(100.1)
+        assert [sender[index + 1].dmx_data[0] for index in indices] == [255, 255, 255, 255, 255, 1, 255]
+
+        # the frame of an inactive universe is used once it is activated
+        sender.activate_output(101)
+        sender._sender_handler.on_periodic_callback(100.2)
+        assert sender[101].dmx_data[0] == 1
+    finally:
+        bank.close()
+        bank.unlink()
@@ -0,0 +1,174 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+"""
+A block of shared memory with the DMX data of multiple universes. Other processes can write frames into the bank
+directly, while a sACNsender that is attached to the bank picks up the changed frames on its own thread.
+No pickling, pipes or locks are involved.
+
+Layout of the block (byte order of the machine):
+ * header: magic, number of frames
+ * one 32-bit counter per frame. The counter is odd while the frame is written and is increased by 2 for every frame
+ * one 16-bit length per frame
+ * 512 bytes of DMX data per frame
+"""
+
+import struct
+import sys
+from typing import Optional
+
+from sacn.messages.data_packet import make_slots
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+_MAGIC = b'sACNbnk1'
+_HEADER = struct.Struct('=8sI4x')
+FRAME_SIZE = 512
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class FrameBank:
+    def __init__(self, size: int, name: Optional[str] = None):
+        """
+        Creates a new frame bank in shared memory. Use FrameBank.attach in the other processes to open it.
+        The creating process should call unlink when the bank is not needed anymore.
+        :param size: the number of frames (i.e. universes) in this bank [1-63999]
+        :param name: the name of the shared memory block. If not given, a random name is used.
+        :raises RuntimeError: if shared memory is not supported by this Python version
+        """
+        if size not in range(1, 64000):
+            raise ValueError(f'The size of a frame bank must be between [1-63999]! Size was {size}')
+        _check_shared_memory()
+        memory = shared_memory.SharedMemory(name=name, create=True, size=_layout(size)[2] + size * FRAME_SIZE)
+        _HEADER.pack_into(memory.buf, 0, _MAGIC, size)
+        self._setup(memory)
+
+    @classmethod
+    def attach(cls, name: str) -> 'FrameBank':
+        """
+        Opens an existing frame bank, e.g. in another process.
+        :param name: the name of the bank
+        :raises ValueError: if the shared memory block with this name is not a frame bank
+        """
+        _check_shared_memory()
+        memory = _attach_shared_memory(name)
+        magic, _ = _HEADER.unpack_from(memory.buf, 0)
+        if magic != _MAGIC:
+            memory.close()
+            raise ValueError(f'The shared memory {name} is not a frame bank!')
+        bank = cls.__new__(cls)
+        bank._setup(memory)
+        return bank
+
+    def _setup(self, memory) -> None:
+        self._memory = memory
+        self._closed = False
+        _, self._size = _HEADER.unpack_from(memory.buf, 0)
+        counters_offset, lengths_offset, frames_offset = _layout(self._size)
+        self._counter_bytes = memory.buf[counters_offset:counters_offset + 4 * self._size]
+        self._counters = self._counter_bytes.cast('I')
+        self._lengths = memory.buf[lengths_offset:lengths_offset + 2 * self._size].cast('H')
+        self._frames = memory.buf[frames_offset:frames_offset + FRAME_SIZE * self._size]
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def write(self, index: int, data) -> None:
+        """
+        Writes the DMX data of a frame. Only one process may write the same frame at a time.
+        :param index: the index of the frame [0-size)
+        :param data: the DMX data in the same formats as for the dmx_data of an output
+        """
+        slots = make_slots(data)
+        if index not in range(0, self._size):
+            raise IndexError(f'The frame index must be between [0-{self._size - 1}]! Index was {index}')
+        counter = self._counters[index]
+        self._counters[index] = (counter + 1) & 0xFFFFFFFF
+        offset = index * FRAME_SIZE
+        self._frames[offset:offset + len(slots)] = slots
+        self._lengths[index] = len(slots)
+        self._counters[index] = (counter + 2) & 0xFFFFFFFF
+
+    def read(self, index: int) -> Optional[bytes]:
+        """
+        Reads the DMX data of a frame.
+        :param index: the index of the frame [0-size)
+        :return: the data or None, if the frame was written at the same time. Read again later in this case.
+        """
+        counter = self._counters[index]
+        if counter & 1:
+            return None
+        offset = index * FRAME_SIZE
+        data = bytes(self._frames[offset:offset + self._lengths[index]])
+        if self._counters[index] != counter:
+            return None
+        return data
+
+    def read_counters(self, count: Optional[int] = None) -> bytes:
+        """
+        :param count: the number of frames from the start of the bank, whose counters are read. All if not given
+        :return: a copy of the counters of the frames. A frame changed, if its counter changed.
+        """
+        if count is None:
+            return bytes(self._counter_bytes)
+        return bytes(self._counter_bytes[:4 * count])
+
+    def close(self) -> None:
+        """
+        Closes the access to the bank from this process. The bank must not be used afterwards.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._counter_bytes.release()
+        self._counters.release()
+        self._lengths.release()
+        self._frames.release()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """
+        Destroys the shared memory block. Should be called once by the process that created the bank.
+        """
+        self._memory.unlink()
+
+    def __del__(self):
+        # the views into the block have to be released before the block can be closed
+        if hasattr(self, '_closed'):
+            self.close()
+
+
+def _check_shared_memory() -> None:
+    if shared_memory is None:
+        raise RuntimeError('A frame bank needs multiprocessing.shared_memory, which requires Python 3.8 or newer!')
+
+
+def _attach_shared_memory(name: str):
+    # Before Python 3.13, the resource tracker of every attaching process destroys the block when the process exits.
+    # Only the creating process should do that, so the block is not registered when it is attached.
+    # Unregistering it afterwards is not possible, because child processes share the tracker of their parent.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _layout(size: int):
+    counters_offset = _HEADER.size
+    lengths_offset = _align(counters_offset + 4 * size)
+    frames_offset = _align(lengths_offset + 2 * size)
+    return counters_offset, lengths_offset, frames_offset
@@ -0,0 +1,94 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import multiprocessing
+
+import pytest
+
+from sacn.sending.frame_bank import FrameBank
+
+
+@pytest.fixture
+def bank():
+    frame_bank = FrameBank(3)
+    yield frame_bank
+    frame_bank.close()
+    frame_bank.unlink()
+
+
+def test_write_read(bank):
+    assert bank.size == 3
+    assert bank.read(0) == b''
+    bank.write(0, (1, 2, 3))
+    bank.write(2, bytes(range(0, 256)) * 2)
+    assert bank.read(0) == b'\x01\x02\x03'
+    assert bank.read(1) == b''
+    assert bank.read(2) == bytes(range(0, 256)) * 2
+    # shorter data replaces the whole frame
+    bank.write(2, b'\x05')
+    assert bank.read(2) == b'\x05'
+    with pytest.raises(IndexError):
+        bank.write(3, (1,))
+    with pytest.raises(ValueError):
+        bank.write(0, (256,))
+    with pytest.raises(ValueError):
+        bank.write(0, (0,) * 513)
+    with pytest.raises(ValueError):
+        FrameBank(0)
+
+
+def test_counters(bank):
+    counters = bank.read_counters()
+    assert counters == bytes(12)
+    bank.write(1, (1,))
+    assert bank.read_counters() != counters
+    assert bank._counters[1] == 2
+    # only the counters of the first frames
+    assert bank.read_counters(2) == counters[0:4] + bank.read_counters()[4:8]
+    assert bank.read_counters(0) == b''
+
+
+def test_read_while_writing(bank):
+    bank.write(0, (1,))
+    # an odd counter means the frame is written at the moment
+    bank._counters[0] += 1
+    assert bank.read(0) is None
+    bank._counters[0] += 1
+    assert bank.read(0) == b'\x01'
+
+
+def test_attach(bank):
+    other = FrameBank.attach(bank.name)
+    assert other.size == 3
+    other.write(1, (7, 8))
+    assert bank.read(1) == b'\x07\x08'
+    other.close()
+
+
+def test_attach_no_frame_bank():
+    from multiprocessing import shared_memory
+    memory = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError):
+            FrameBank.attach(memory.name)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def write_frames(name: str):
+    bank = FrameBank.attach(name)
+    for value in range(0, 256):
+        bank.write(0, (value,) * 512)
+    bank.close()
+
+
+def test_write_from_other_process(bank):
+    process = multiprocessing.Process(target=write_frames, args=(bank.name,))
+    process.start()
+    # every frame that is read completely has the same value in all slots
+    while process.is_alive():
+        data = bank.read(0)
+        assert data is None or data == bytes(len(data)) or len(set(data)) == 1
+    process.join()
+    assert process.exitcode == 0
+    assert bank.read(0) == b'\xff' * 512
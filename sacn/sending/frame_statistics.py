@@ -0,0 +1,72 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+from bisect import bisect_left
+from typing import Optional, Tuple
+
+# upper bounds of the histogram buckets in seconds. The last bucket has no upper bound
+LATENESS_BUCKETS: Tuple[float, ...] = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05)
+_LATENESS_BUCKETS_NS: Tuple[int, ...] = tuple(int(bound * 1e9) for bound in LATENESS_BUCKETS)
+
+
+class FrameStatistics:
+    """
+    Records how late every frame of a sender thread started compared to its deadline.
+    The deadlines are absolute, so a late frame does not shift the following frames.
+    """
+
+    __slots__ = ('_counts', '_frames', '_missed_frames', '_total_lateness_ns', '_max_lateness_ns')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Removes all recorded frames.
+        """
+        self._counts = [0] * (len(LATENESS_BUCKETS) + 1)
+        self._frames: int = 0
+        self._missed_frames: int = 0
+        self._total_lateness_ns: int = 0
+        self._max_lateness_ns: int = 0
+
+    def record(self, lateness_ns: int, missed_frames: int = 0) -> None:
+        """
+        :param lateness_ns: the time in nanoseconds between the deadline and the start of the frame
+        :param missed_frames: the number of frames that were skipped, because the previous frame took too long
+        """
+        lateness_ns = max(lateness_ns, 0)
+        self._counts[bisect_left(_LATENESS_BUCKETS_NS, lateness_ns)] += 1
+        self._frames += 1
+        self._missed_frames += missed_frames
+        self._total_lateness_ns += lateness_ns
+        if lateness_ns > self._max_lateness_ns:
+            self._max_lateness_ns = lateness_ns
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    @property
+    def missed_frames(self) -> int:
+        return self._missed_frames
+
+    @property
+    def mean_lateness(self) -> float:
+        """
+        The mean lateness of all frames in seconds.
+        """
+        return self._total_lateness_ns / self._frames / 1e9 if self._frames else 0.0
+
+    @property
+    def max_lateness(self) -> float:
+        """
+        The maximum lateness of all frames in seconds.
+        """
+        return self._max_lateness_ns / 1e9
+
+    def histogram(self) -> Tuple[Tuple[Optional[float], int], ...]:
+        """
+        :return: a tuple of (upper bound in seconds, number of frames) pairs. A frame is counted in the first bucket
+        whose upper bound is not smaller than its lateness. The upper bound of the last bucket is None.
+        """
+        return tuple(zip(LATENESS_BUCKETS + (None,), self._counts))
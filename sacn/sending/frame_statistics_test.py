@@ -0,0 +1,36 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+from sacn.sending.frame_statistics import FrameStatistics, LATENESS_BUCKETS
+
+
+def test_empty():
+    statistics = FrameStatistics()
+    assert statistics.frames == 0
+    assert statistics.missed_frames == 0
+    assert statistics.mean_lateness == 0.0
+    assert statistics.max_lateness == 0.0
+    assert statistics.histogram() == tuple((bound, 0) for bound in LATENESS_BUCKETS + (None,))
+
+
+def test_record():
+    statistics = FrameStatistics()
+    statistics.record(0)
+    statistics.record(-10)  # a frame that started early counts as on time
+    statistics.record(50_000)
+    statistics.record(50_001)
+    statistics.record(3_000_000, missed_frames=2)
+    statistics.record(1_000_000_000)
+    assert statistics.frames == 6
+    assert statistics.missed_frames == 2
+    assert statistics.max_lateness == 1.0
+    assert statistics.mean_lateness == (50_000 + 50_001 + 3_000_000 + 1_000_000_000) / 6 / 1e9
+    histogram = dict(statistics.histogram())
+    assert histogram[0.00005] == 3
+    assert histogram[0.0001] == 1
+    assert histogram[0.005] == 1
+    assert histogram[None] == 1
+    assert sum(histogram.values()) == 6
+
+    statistics.reset()
+    assert statistics.frames == 0
+    assert sum(dict(statistics.histogram()).values()) == 0
@@ -0,0 +1,145 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+"""
+A small ctypes shim for the sendmmsg syscall of Linux, which sends multiple UDP packets with one syscall.
+Use AVAILABLE to check if the syscall can be used on this system.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import socket
+import struct
+import sys
+from array import array
+from itertools import accumulate, chain
+from typing import Dict, List, Tuple
+
+# sendmmsg sends at most UIO_MAXIOV messages with one call
+MAX_MESSAGES_PER_CALL = 1024
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [
+        ('iov_base', ctypes.c_void_p),
+        ('iov_len', ctypes.c_size_t),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.c_void_p),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_hdr', _MsgHdr),
+        ('msg_len', ctypes.c_uint),
+    ]
+
+
+def _load_sendmmsg():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        function = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+    function.restype = ctypes.c_int
+    return function
+
+
+# struct sockaddr_in: the family is in the byte order of the machine, port and address are in network byte order
+_SOCKADDR_IN = struct.Struct('=H')
+_SOCKADDR_IN_ADDRESS = struct.Struct('!H4s8x')
+_SOCKADDR_IN_LENGTH = _SOCKADDR_IN.size + _SOCKADDR_IN_ADDRESS.size
+
+# The same layouts as the structures above. On 64-bit systems all fields are aligned to 8 bytes, so many structures
+# can be filled with slices of an array of 64-bit words. Other systems do not use sendmmsg.
+_IOVEC = struct.Struct('@PN')
+_IOVEC_WORDS = _IOVEC.size // 8
+_MMSGHDR = struct.Struct('@PIPNPNi0PI0P')
+_MMSGHDR_WORDS = _MMSGHDR.size // 8
+# every message has the same address length and one iovec, only the pointers differ
+_MMSGHDR_TEMPLATE = array('Q', _MMSGHDR.pack(0, _SOCKADDR_IN_LENGTH, 0, 1, 0, 0, 0, 0))
+
+# True if the structures can be filled with arrays of 64-bit words on this system
+LAYOUT_SUPPORTED: bool = struct.calcsize('P') == 8 and array('Q').itemsize == 8 and \
+    _IOVEC.size == ctypes.sizeof(_IoVec) and _MMSGHDR.size == ctypes.sizeof(_MMsgHdr)
+_sendmmsg = _load_sendmmsg() if LAYOUT_SUPPORTED else None
+AVAILABLE: bool = _sendmmsg is not None
+
+# the addresses of numeric destinations do not change and are cached
+_sockaddr_cache: Dict[Tuple[str, int], bytes] = {}
+_SOCKADDR_CACHE_SIZE = 4096
+
+
+def make_sockaddr(host: str, port: int) -> bytes:
+    """
+    Converts an IPv4 address in the format of socket.sendto into a struct sockaddr_in.
+    Host names are resolved every time, like socket.sendto does.
+    """
+    sockaddr = _sockaddr_cache.get((host, port))
+    if sockaddr is not None:
+        return sockaddr
+    try:
+        ip = socket.inet_aton('255.255.255.255' if host == '<broadcast>' else host)
+    except OSError:
+        return _SOCKADDR_IN.pack(socket.AF_INET) + _SOCKADDR_IN_ADDRESS.pack(port, socket.inet_aton(socket.gethostbyname(host)))
+    sockaddr = _SOCKADDR_IN.pack(socket.AF_INET) + _SOCKADDR_IN_ADDRESS.pack(port, ip)
+    if len(_sockaddr_cache) >= _SOCKADDR_CACHE_SIZE:
+        _sockaddr_cache.clear()
+    _sockaddr_cache[(host, port)] = sockaddr
+    return sockaddr
+
+
+def send_batch(sock: socket.socket, data: List[bytes], destinations: List[str], port: int) -> None:
+    """
+    Sends all packets with as few sendmmsg syscalls as possible. Only available if AVAILABLE is True.
+    :param sock: the UDP socket to send with. All socket options (e.g. the multicast TTL) apply to all packets.
+    :param data: the packets to send
+    :param destinations: the destination host of every packet in the format of socket.sendto
+    :param port: the destination port of all packets
+    :raises OSError: when a packet could not be send out
+    """
+    for start in range(0, len(data), MAX_MESSAGES_PER_CALL):
+        end = start + MAX_MESSAGES_PER_CALL
+        _send_chunk(sock.fileno(), data[start:end], destinations[start:end], port)
+
+
+def _send_chunk(fd: int, data: List[bytes], destinations: List[str], port: int) -> None:
+    count = len(data)
+    lengths = list(map(len, data))
+    # all data and addresses are joined, so that only a few buffers have to stay alive during the syscall
+    joined_data = b''.join(data)
+    names = b''.join([make_sockaddr(destination, port) for destination in destinations])
+    data_address = ctypes.cast(ctypes.c_char_p(joined_data), ctypes.c_void_p).value
+    names_address = ctypes.cast(ctypes.c_char_p(names), ctypes.c_void_p).value
+    # the structures are filled column by column instead of packing every message on its own
+    iovecs = array('Q', bytes(_IOVEC.size * count))
+    iovecs_address = iovecs.buffer_info()[0]
+    # the initial parameter of accumulate needs Python 3.8
+    iovecs[0::_IOVEC_WORDS] = array('Q', accumulate(chain((data_address,), lengths[:-1])))
+    iovecs[1::_IOVEC_WORDS] = array('Q', lengths)
+    headers = _MMSGHDR_TEMPLATE * count
+    headers[0::_MMSGHDR_WORDS] = array('Q', range(names_address, names_address + count * _SOCKADDR_IN_LENGTH, _SOCKADDR_IN_LENGTH))
+    headers[2::_MMSGHDR_WORDS] = array('Q', range(iovecs_address, iovecs_address + count * _IOVEC.size, _IOVEC.size))
+    headers_address = headers.buffer_info()[0]
+
+    sent = 0
+    # sendmmsg returns the number of messages that were send, which can be less than requested
+    while sent < count:
+        result = _sendmmsg(fd, headers_address + sent * _MMSGHDR.size, count - sent, 0)
+        if result < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        sent += result
@@ -0,0 +1,38 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import itertools
+import socket
+import sys
+import pytest
+from sacn.sending import mmsg
+
+
+def test_make_sockaddr():
+    assert mmsg.make_sockaddr('1.2.3.4', 5568) == \
+        socket.AF_INET.to_bytes(2, sys.byteorder) + bytes([0x15, 0xc0, 1, 2, 3, 4]) + bytes(8)
+    # the cached value is the same
+    assert mmsg.make_sockaddr('1.2.3.4', 5568) == mmsg.make_sockaddr('1.2.3.4', 5568)
+    assert mmsg.make_sockaddr('<broadcast>', 5568)[4:8] == bytes([255, 255, 255, 255])
+    assert mmsg.make_sockaddr('localhost', 5568)[4:8] == bytes([127, 0, 0, 1])
+
+
+@pytest.mark.skipif(not mmsg.AVAILABLE, reason='sendmmsg is not available on this system')
+def test_send_batch(monkeypatch):
+    # accumulate has no initial parameter before Python 3.8
+    monkeypatch.setattr(mmsg, 'accumulate', lambda iterable: itertools.accumulate(iterable))
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        receiver.bind(('127.0.0.1', 0))
+        receiver.settimeout(1)
+        host, port = receiver.getsockname()
+        packets = [bytes([i]) * (i + 1) for i in range(0, 10)]
+        mmsg.send_batch(sender, packets, [host] * 10, port)
+        assert [receiver.recv(100) for _ in range(0, 10)] == packets
+
+        # errors of the syscall are raised
+        with pytest.raises(OSError):
+            mmsg.send_batch(sender, [bytes(70000)], [host], port)
+    finally:
+        receiver.close()
+        sender.close()
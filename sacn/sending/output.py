@@ -1,6 +1,12 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
-from sacn.messages.data_packet import DataPacket
+from typing import Optional, Set, Tuple, Union
+
+from sacn.messages.data_packet import DataPacket, make_slots
+
+DEFAULT_KEEP_ALIVE_INTERVAL = 1
+# receivers drop a source, if they did not receive a packet from it for this time in seconds
+E131_NETWORK_DATA_LOSS_TIMEOUT = 2.5
 
 
 class Output:
@@ -8,23 +14,173 @@ class Output:
     This class is a compact representation of an sending with all relevant information
     """
 
+    __slots__ = ('_packet', '_last_time_send', 'destination', 'multicast', 'ttl', '_changed', '_dirty_outputs',
+                 '_due_time', '_max_fps', '_min_send_interval', '_keep_alive_interval', '_dirty_start', '_dirty_end',
+                 'change_detection', '_suppressed_sends')
+
     def __init__(self, packet: DataPacket, last_time_send: int = 0, destination: str = '127.0.0.1',
-                 multicast: bool = False, ttl: int = 8):
+                 multicast: bool = False, ttl: int = 8, max_fps: Optional[float] = None,
+                 keep_alive_interval: float = DEFAULT_KEEP_ALIVE_INTERVAL, change_detection: bool = False):
         self._packet: DataPacket = packet
         self._last_time_send: int = last_time_send
         self.destination: str = destination
         self.multicast: bool = multicast
         self.ttl: int = ttl
         self._changed: bool = False
+        # the range of slots that changed since the last packet was send out. Only valid if _changed is True
+        self._dirty_start: int = 0
+        self._dirty_end: int = 0
+        # the set of changed outputs of the SenderHandler, which sends this output
+        self._dirty_outputs: Optional[Set['Output']] = None
+        # the time of the entry in the schedule of the SenderHandler. None if the output is not scheduled
+        self._due_time: Optional[float] = None
+        self.max_fps = max_fps
+        self.keep_alive_interval = keep_alive_interval
+        # if True, assigning the current DMX data again does not mark the output as changed
+        self.change_detection: bool = change_detection
+        self._suppressed_sends: int = 0
+
+    def _mark_dirty(self) -> None:
+        if self._dirty_outputs is not None:
+            self._dirty_outputs.add(self)
 
     @property
     def dmx_data(self) -> tuple:
         return self._packet.dmxData
 
     @dmx_data.setter
-    def dmx_data(self, dmx_data: tuple):
+    def dmx_data(self, dmx_data):
+        """
+        Accepts a tuple with ints [0-255] or any buffer with unsigned bytes (e.g. bytes, bytearray, numpy uint8 array).
+        With change_detection, assigning the current data again does not cause a send.
+        """
+        if self.change_detection and self._packet.equalsDmxData(dmx_data):
+            self._suppress_send()
+            return
         self._packet.dmxData = dmx_data
+        self._mark_changed(0, 512)
+
+    def set_channel(self, address: int, value: int) -> None:
+        """
+        Sets the value of a single DMX channel. Only this slot of the packet is changed.
+        :param address: the DMX address of the channel [1-512]
+        :param value: the value of the channel [0-255]
+        """
+        self.set_channels(address, (value,))
+
+    def set_channels(self, start: int, values) -> None:
+        """
+        Sets the values of consecutive DMX channels. Only the given slots of the packet are changed.
+        :param start: the DMX address of the first channel [1-512]
+        :param values: the values in the same formats as for dmx_data
+        """
+        slots = make_slots(values)
+        if self.change_detection and self._packet.equalsDmxSlots(start - 1, slots):
+            self._suppress_send()
+            return
+        self._packet.setDmxSlots(start - 1, slots)
+        self._mark_changed(start - 1, start - 1 + len(slots))
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[int, tuple]:
+        """
+        Returns the value of the slot with the given index [0-511] or a tuple for a slice.
+        Note that the index starts with 0, while DMX addresses start with 1.
+        """
+        return self._packet.dmxData[key]
+
+    def __setitem__(self, key: Union[int, slice], value) -> None:
+        """
+        Sets the value of the slot with the given index [0-511] or the values of a slice of slots.
+        Note that the index starts with 0, while DMX addresses start with 1.
+        The values for a slice must have the same length as the slice, unless the slice has no end.
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(512)
+            if step != 1:
+                raise ValueError('Slices with a step are not supported!')
+            if key.stop is not None and len(value) != max(0, stop - start):
+                raise ValueError(f'The slice has {max(0, stop - start)} slots, but {len(value)} values were given!')
+            self.set_channels(start + 1, value)
+        else:
+            if type(key) is not int:
+                raise TypeError(f'The index must be an integer or a slice! Type was {type(key)}')
+            if key < 0:
+                key += 512
+            self.set_channels(key + 1, (value,))
+
+    @property
+    def dirty_range(self) -> Optional[Tuple[int, int]]:
+        """
+        The range of slot indices (start inclusive, end exclusive) that changed since the last packet was send out.
+        None if nothing changed.
+        """
+        return (self._dirty_start, self._dirty_end) if self._changed else None
+
+    @property
+    def suppressed_sends(self) -> int:
+        """
+        The number of sends that change_detection prevented, because the assigned DMX data did not change.
+        Assignments while a change is still waiting to be send out are not counted.
+        """
+        return self._suppressed_sends
+
+    def _suppress_send(self) -> None:
+        if not self._changed:
+            self._suppressed_sends += 1
+
+    def _mark_changed(self, start: int, end: int) -> None:
+        if self._changed:
+            self._dirty_start = min(self._dirty_start, start)
+            self._dirty_end = max(self._dirty_end, end)
+        else:
+            self._dirty_start = start
+            self._dirty_end = end
         self._changed = True
+        self._mark_dirty()
+
+    @property
+    def max_fps(self) -> Optional[float]:
+        return self._max_fps
+
+    @max_fps.setter
+    def max_fps(self, max_fps: Optional[float]):
+        """
+        The maximum number of packets per second for this output. Changes of the DMX data are send out at most with
+        this rate. The fps of the sender is still the upper limit. None to use the rate of the sender.
+        """
+        if max_fps is not None and max_fps <= 0:
+            raise ValueError(f'max_fps must be greater than 0 or None! Value was {max_fps}')
+        self._max_fps = max_fps
+        self._min_send_interval = 0 if max_fps is None else 1 / max_fps
+        self._mark_dirty()
+
+    @property
+    def keep_alive_interval(self) -> float:
+        return self._keep_alive_interval
+
+    @keep_alive_interval.setter
+    def keep_alive_interval(self, keep_alive_interval: float):
+        """
+        The time in seconds after which the DMX data is send out again, when it did not change. Default: 1
+        Has to be less than the network data loss timeout of 2.5 seconds, otherwise the receivers drop the source
+        between two packets.
+        """
+        if not 0 < keep_alive_interval < E131_NETWORK_DATA_LOSS_TIMEOUT:
+            raise ValueError(f'keep_alive_interval must be between ]0-{E131_NETWORK_DATA_LOSS_TIMEOUT}[! '
+                             f'Value was {keep_alive_interval}')
+        self._keep_alive_interval = keep_alive_interval
+        self._mark_dirty()
+
+    @property
+    def variable_length(self) -> bool:
+        return self._packet.variableLength
+
+    @variable_length.setter
+    def variable_length(self, variable_length: bool):
+        """
+        If True, only the slots of the given DMX data are sent out and the data is not padded to 512 slots.
+        """
+        self._packet.variableLength = variable_length
 
     @property
     def priority(self) -> int:
@@ -1,15 +1,22 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
-from typing import Dict
+import heapq
+import itertools
+import threading
+from typing import Dict, List, Optional, Set, Tuple
 from sacn.messages.universe_discovery import UniverseDiscoveryPacket
 from sacn.messages.sync_packet import SyncPacket
 from sacn.messages.data_packet import calculate_multicast_addr
-from sacn.sending.output import Output
+from sacn.sending.frame_bank import FrameBank
+from sacn.sending.output import Output, DEFAULT_KEEP_ALIVE_INTERVAL
 from sacn.sending.sender_socket_base import SenderSocketBase, SenderSocketListener
 from sacn.sending.sender_socket_udp import SenderSocketUDP
 
-SEND_OUT_INTERVAL = 1
+SEND_OUT_INTERVAL = DEFAULT_KEEP_ALIVE_INTERVAL
 E131_E131_UNIVERSE_DISCOVERY_INTERVAL = 10
+# the sizes in bytes of the chunks, in which the counters of a frame bank are compared. A changed chunk is split into
+# the chunks of the next size, so only the counters around a changed frame are compared one by one
+FRAME_BANK_CHUNK_SIZES = (8192, 512, 32, 4)
 
 
 class SenderHandler(SenderSocketListener):
@@ -28,24 +35,147 @@ class SenderHandler(SenderSocketListener):
         self._source_name = source_name
         self.universe_discovery: bool = True
         self._last_time_universe_discover: float = 0
+        # the universe discovery packets are only created again, if the set of outputs changes
+        self._universe_discovery_packets: List[UniverseDiscoveryPacket] = None
+        # the pages of the current discovery interval and the index of the next page that has to be send out
+        self._discovery_pages: List[UniverseDiscoveryPacket] = []
+        self._next_discovery_page: int = 0
+        self.max_discovery_packets_per_frame: int = 1
         self._outputs: Dict[int, Output] = outputs
+        # The outputs are scheduled by the time of their next packet. Outputs with new DMX data or new timing settings
+        # add themselves to the dirty set. So every tick only has to look at the outputs that are due.
+        # An entry in the schedule is only valid, if its time is the _due_time of its output.
+        self._schedule: List[Tuple[float, int, Output]] = []
+        self._schedule_counter = itertools.count()
+        self._dirty_outputs: Set[Output] = set()
+        self._outputs_changed: bool = True
         self.manual_flush: bool = False
         self._sync_sequence = 0
+        # a changed output, whose rate is limited, is send out on the tick that is closest to its due time.
+        # So the jitter of the ticks does not delay it by a whole frame
+        self._due_tolerance: float = 0.5 / fps
+        # the attached frame bank, the universe of every frame and the counters of the frames that were read last
+        self._frame_bank: Optional[Tuple[FrameBank, Tuple[int, ...], bytearray]] = None
+        # the bank is read by the sending thread and by flush on the thread of the caller
+        self._frame_bank_lock = threading.Lock()
+
+    def attach_frame_bank(self, frame_bank: Optional[FrameBank], universes: Tuple[int, ...] = ()) -> None:
+        """
+        Uses the frames of the bank as DMX data of the given universes. None to detach the current bank.
+        If the same bank is attached again, e.g. with other universes, only the frames whose universe did not change
+        are not read again.
+        """
+        universes = tuple(universes)
+        with self._frame_bank_lock:
+            if frame_bank is None:
+                self._frame_bank = None
+            elif self._frame_bank is not None and self._frame_bank[0] is frame_bank:
+                _, previous_universes, last_counters = self._frame_bank
+                # frames without a universe are attached to universe 0
+                for index in range(0, max(len(universes), len(previous_universes))):
+                    universe = universes[index] if index < len(universes) else 0
+                    previous_universe = previous_universes[index] if index < len(previous_universes) else 0
+                    if universe != previous_universe:
+                        last_counters[4 * index:4 * index + 4] = bytes(4)
+                self._frame_bank = (frame_bank, universes, last_counters)
+            else:
+                self._frame_bank = (frame_bank, universes, bytearray(4 * frame_bank.size))
+
+    def read_frame_bank(self) -> None:
+        """
+        Copies the frames that changed since the last call into the DMX data of their outputs.
+        Frames that are written at the same time or whose universe is not active are read again on the next call.
+        """
+        if self._frame_bank is None:
+            return
+        with self._frame_bank_lock:
+            if self._frame_bank is not None:
+                self._read_frame_bank(*self._frame_bank)
+
+    def _read_frame_bank(self, bank: FrameBank, universes: Tuple[int, ...], last_counters: bytearray) -> None:
+        # only the frames with universes are read, the rest of the bank is not used
+        counters = bank.read_counters(min(bank.size, len(universes)))
+        if last_counters.startswith(counters):
+            return
+        for index in _changed_frames(counters, memoryview(last_counters), 0, len(counters), 0):
+            output = self._outputs.get(universes[index])
+            if output is None:
+                continue
+            data = bank.read(index)
+            if data is None:
+                continue
+            output.dmx_data = data
+            last_counters[4 * index:4 * index + 4] = counters[4 * index:4 * index + 4]
 
     def on_periodic_callback(self, current_time: float) -> None:
+        self.read_frame_bank()
         # send out universe discovery packets if necessary
-        if self.universe_discovery and \
-              abs(current_time - self._last_time_universe_discover) >= E131_E131_UNIVERSE_DISCOVERY_INTERVAL:
-            self.send_universe_discovery_packets()
-            self._last_time_universe_discover = current_time
+        if self.universe_discovery:
+            self.send_due_universe_discovery_packets(current_time)
+
+        if self._outputs_changed:
+            self._schedule_new_outputs()
+        # only send if the manual flush feature is disabled
+        if self.manual_flush:
+            return
+
+        # send out the outputs with new DMX data or schedule them, if their rate does not allow it yet
+        # Note: the set is filled by other threads, so it is emptied element by element
+        dirty_outputs = self._dirty_outputs
+        while dirty_outputs:
+            output = dirty_outputs.pop()
+            if output._due_time is not None and self._is_active(output):
+                self._send_out_if_due(output, current_time)
+
+        # send out the outputs whose time is over
+        schedule = self._schedule
+        while schedule and schedule[0][0] <= current_time:
+            due_time, _, output = heapq.heappop(schedule)
+            if due_time != output._due_time:
+                continue  # the output was scheduled again in the meantime
+            output._due_time = None
+            if self._is_active(output):
+                self._send_out_if_due(output, current_time)
+
+    def _send_out_if_due(self, output: Output, current_time: float) -> None:
+        """
+        Sends out the output if it is changed and its rate allows it, or if its keep-alive interval is over.
+        Afterwards, the output is scheduled for the time of its next packet.
+        """
+        due_time = self._next_due_time(output)
+        # the time of the last packet can be in the future, if the clock was set back
+        if due_time <= current_time or output._last_time_send - current_time >= output._keep_alive_interval:
+            limited = output._changed and output._min_send_interval > 0
+            self.send_out(output, current_time)
+            if limited and current_time - due_time <= 2 * self._due_tolerance:
+                # the packet counts as send at its due time, so the rate is kept on average
+                output._last_time_send = due_time + self._due_tolerance
+            due_time = self._next_due_time(output)
+        if due_time != output._due_time:
+            self._push_schedule(output, due_time)
+
+    def _next_due_time(self, output: Output) -> float:
+        if output._changed and output._min_send_interval > 0:
+            interval = min(output._min_send_interval, output._keep_alive_interval)
+            return output._last_time_send + interval - self._due_tolerance
+        if output._changed:
+            return output._last_time_send
+        return output._last_time_send + output._keep_alive_interval
+
+    def _push_schedule(self, output: Output, due_time: float) -> None:
+        output._due_time = due_time
+        heapq.heappush(self._schedule, (due_time, next(self._schedule_counter), output))
 
-        # go through the list of outputs and send everything out that has to be send out
+    def _schedule_new_outputs(self) -> None:
+        self._outputs_changed = False
         # Note: dict may changes size during iteration (multithreading)
-        [self.send_out(output, current_time) for output in list(self._outputs.values())
-            # only send if the manual flush feature is disabled
-            # send out when the 1 second interval is over
-            if not self.manual_flush and
-            (output._changed or abs(current_time - output._last_time_send) >= SEND_OUT_INTERVAL)]
+        for output in list(self._outputs.values()):
+            if output._due_time is None:
+                output._dirty_outputs = self._dirty_outputs
+                self._push_schedule(output, output._last_time_send + output._keep_alive_interval)
+
+    def _is_active(self, output: Output) -> bool:
+        return self._outputs.get(output._packet.universe) is output
 
     def send_out(self, output: Output, current_time: float):
         # 1st: Destination (check if multicast)
@@ -62,18 +192,60 @@ class SenderHandler(SenderSocketListener):
         # the changed flag is not necessary any more
         output._changed = False
 
+    def on_outputs_changed(self) -> None:
+        """
+        Has to be called, when outputs were added, removed or moved to another universe.
+        """
+        self._universe_discovery_packets = None
+        self._outputs_changed = True
+
+    def get_universe_discovery_packets(self) -> List[UniverseDiscoveryPacket]:
+        if self._universe_discovery_packets is None:
+            self._universe_discovery_packets = UniverseDiscoveryPacket.make_multiple_uni_disc_packets(
+                cid=self._CID, sourceName=self._source_name, universes=list(self._outputs.keys()))
+        return self._universe_discovery_packets
+
     def send_universe_discovery_packets(self):
-        packets = UniverseDiscoveryPacket.make_multiple_uni_disc_packets(
-            cid=self._CID, sourceName=self._source_name, universes=list(self._outputs.keys()))
-        for packet in packets:
+        for packet in self.get_universe_discovery_packets():
             self.socket.send_broadcast(packet)
 
+    def send_due_universe_discovery_packets(self, current_time: float) -> None:
+        """
+        Spreads the universe discovery pages over the discovery interval instead of sending them in one frame.
+        The first page is send out at the start of the interval and the other pages evenly until the interval is over,
+        but never more than max_discovery_packets_per_frame in one frame. A new interval starts, when all pages of the
+        last interval were send out and the discovery interval is over.
+        Changes of the outputs are used in the next interval.
+        """
+        if self._next_discovery_page >= len(self._discovery_pages):
+            if abs(current_time - self._last_time_universe_discover) < E131_E131_UNIVERSE_DISCOVERY_INTERVAL:
+                return
+            self._discovery_pages = self.get_universe_discovery_packets()
+            self._next_discovery_page = 0
+            self._last_time_universe_discover = current_time
+
+        page_count = len(self._discovery_pages)
+        elapsed = abs(current_time - self._last_time_universe_discover)
+        due = min(page_count,
+                  int(elapsed / E131_E131_UNIVERSE_DISCOVERY_INTERVAL * page_count) + 1,
+                  self._next_discovery_page + self.max_discovery_packets_per_frame)
+        for packet in self._discovery_pages[self._next_discovery_page:due]:
+            self.socket.send_broadcast(packet)
+        self._next_discovery_page = max(self._next_discovery_page, due)
+
     def send_out_all_universes(self, sync_universe: int, universes: dict, current_time: float):
         """
         Sends out all universes in one go. This is not done by this thread! This is done by the caller's thread.
         This uses the E1.31 sync mechanism to try to sync all universes.
         Note that not all receivers support this feature.
         """
+        self.send_out_synchronized(sync_universe, universes, current_time)
+        self.send_sync_packet(sync_universe)
+
+    def send_out_synchronized(self, sync_universe: int, universes: dict, current_time: float):
+        """
+        Sends out the universes with the given sync address, but without the sync packet.
+        """
         # go through the list of outputs and send everything out
         # Note: dict may changes size during iteration (multithreading)
         for output in list(universes.values()):
@@ -81,6 +253,7 @@ class SenderHandler(SenderSocketListener):
             self.send_out(output, current_time)
             output._packet.syncAddr = 0
 
+    def send_sync_packet(self, sync_universe: int):
         sync_packet = SyncPacket(cid=self._CID, syncAddr=sync_universe, sequence=self._sync_sequence)
         # Increment sequence number for next time.
         self._sync_sequence += 1
@@ -93,3 +266,19 @@ class SenderHandler(SenderSocketListener):
 
     def stop(self):
         self.socket.stop()
+
+
+def _changed_frames(counters: bytes, last_counters: memoryview, start: int, end: int, level: int):
+    """
+    :return: the indices of the frames, whose counters differ between the byte offsets start and end
+    """
+    size = FRAME_BANK_CHUNK_SIZES[level]
+    for offset in range(start, end, size):
+        chunk_end = min(offset + size, end)
+        # compares the chunks without copying them
+        if counters.startswith(last_counters[offset:chunk_end], offset):
+            continue
+        if level == len(FRAME_BANK_CHUNK_SIZES) - 1:
+            yield offset // 4
+        else:
+            yield from _changed_frames(counters, last_counters, offset, chunk_end, level + 1)
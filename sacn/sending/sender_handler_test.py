@@ -1,6 +1,8 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
 from typing import Dict
+
+import pytest
 from sacn.messages.data_packet import DataPacket, calculate_multicast_addr
 from sacn.messages.sync_packet import SyncPacket
 from sacn.messages.universe_discovery import UniverseDiscoveryPacket
@@ -9,7 +11,7 @@ from sacn.sending.sender_handler import SenderHandler
 from sacn.sending.sender_socket_test import SenderSocketTest
 
 
-def get_handler():
+def get_handler(fps: int = 30):
     cid = tuple(range(0, 16))
     source_name = 'test'
     outputs: Dict[int, Output] = {
@@ -28,7 +30,7 @@ def get_handler():
         outputs=outputs,
         bind_address='0.0.0.0',
         bind_port=5568,
-        fps=30,
+        fps=fps,
         socket=socket,
     )
     handler.manual_flush = True
@@ -56,6 +58,62 @@ def test_universe_discovery_packets():
     assert socket.send_broadcast_called == UniverseDiscoveryPacket(cid, source_name, (1,))
 
 
+def test_universe_discovery_packets_cached():
+    handler, socket, cid, source_name, outputs = get_handler()
+    socket.call_on_periodic_callback(100.0)
+    packets = handler._universe_discovery_packets
+    assert len(packets) == 1
+
+    # the packets are not created again, if the outputs did not change
+    socket.call_on_periodic_callback(111.0)
+    assert handler._universe_discovery_packets is packets
+
+    # after a change of the outputs, the packets are created with the new universes
+    outputs[2] = Output(DataPacket(cid=cid, sourceName=source_name, universe=2))
+    handler.on_outputs_changed()
+    socket.call_on_periodic_callback(122.0)
+    assert handler._universe_discovery_packets is not packets
+    assert socket.send_broadcast_called == UniverseDiscoveryPacket(cid, source_name, (1, 2))
+
+
+def test_universe_discovery_packets_spread():
+    handler, socket, cid, source_name, outputs = get_handler()
+    # 1100 universes need three discovery pages
+    for universe in range(2, 1101):
+        outputs[universe] = Output(DataPacket(cid=cid, sourceName=source_name, universe=universe))
+    handler.on_outputs_changed()
+    pages = []
+    socket.send_broadcast = lambda packet: pages.append(packet.page)
+
+    # the first page is send out at the start of the interval
+    socket.call_on_periodic_callback(100.0)
+    assert pages == [0]
+    socket.call_on_periodic_callback(101.0)
+    assert pages == [0]
+    # the other pages are spread evenly over the interval
+    socket.call_on_periodic_callback(103.4)
+    assert pages == [0, 1]
+    socket.call_on_periodic_callback(106.7)
+    assert pages == [0, 1, 2]
+    # no new interval starts before the discovery interval is over
+    socket.call_on_periodic_callback(109.9)
+    assert pages == [0, 1, 2]
+    socket.call_on_periodic_callback(110.0)
+    assert pages == [0, 1, 2, 0]
+
+    # a late frame does not send out more pages than allowed
+    pages.clear()
+    socket.call_on_periodic_callback(119.9)
+    assert pages == [1]
+    handler.max_discovery_packets_per_frame = 5
+    socket.call_on_periodic_callback(120.0)
+    assert pages == [1, 2]
+    socket.call_on_periodic_callback(130.0)
+    assert pages == [1, 2, 0]
+    socket.call_on_periodic_callback(140.0)
+    assert pages == [1, 2, 0, 1, 2]
+
+
 def test_send_out_interval():
     handler, socket, cid, source_name, outputs = get_handler()
     handler.manual_flush = False
@@ -66,14 +124,148 @@ def test_send_out_interval():
 
     # first send packet due to interval
     socket.call_on_periodic_callback(current_time)
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=0).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(cid, source_name, 1, sequence=0)
     assert socket.send_unicast_called[1] == '127.0.0.1'
 
     # interval must be 1 seconds
     socket.call_on_periodic_callback(current_time+0.99)
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=0).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(cid, source_name, 1, sequence=0)
     socket.call_on_periodic_callback(current_time+1.01)
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=1).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(cid, source_name, 1, sequence=1)
+
+
+def test_schedule():
+    handler, socket, cid, source_name, outputs = get_handler()
+    handler.manual_flush = False
+    for universe in range(2, 11):
+        outputs[universe] = Output(DataPacket(cid=cid, sourceName=source_name, universe=universe))
+    handler.on_outputs_changed()
+    sent = []
+    socket.send_unicast = lambda packet, destination: sent.append(packet.universe)
+
+    # all outputs are send out on the first tick, afterwards only every second
+    socket.call_on_periodic_callback(100.0)
+    assert sorted(sent) == list(range(1, 11))
+    sent.clear()
+    socket.call_on_periodic_callback(100.5)
+    assert sent == []
+    assert len(handler._schedule) == 10
+
+    # changed outputs are send out on the next tick and their keep-alive starts again
+    outputs[3].dmx_data = (1, 2, 3)
+    outputs[5].dmx_data = (1, 2, 3)
+    assert handler._dirty_outputs == {outputs[3], outputs[5]}
+    socket.call_on_periodic_callback(100.6)
+    assert sorted(sent) == [3, 5]
+    assert handler._dirty_outputs == set()
+    sent.clear()
+    socket.call_on_periodic_callback(101.0)
+    assert sorted(sent) == [1, 2, 4, 6, 7, 8, 9, 10]
+    sent.clear()
+    socket.call_on_periodic_callback(101.6)
+    assert sorted(sent) == [3, 5]
+    sent.clear()
+
+    # deactivated outputs are removed from the schedule
+    del outputs[2]
+    handler.on_outputs_changed()
+    socket.call_on_periodic_callback(102.0)
+    assert 2 not in sent
+    assert len(handler._schedule) == 9
+    sent.clear()
+
+    # new outputs are send out on the next tick
+    outputs[11] = Output(DataPacket(cid=cid, sourceName=source_name, universe=11))
+    handler.on_outputs_changed()
+    socket.call_on_periodic_callback(102.1)
+    assert sent == [11]
+    assert len(handler._schedule) == 10
+
+
+def test_schedule_manual_flush():
+    handler, socket, cid, source_name, outputs = get_handler()
+    handler.manual_flush = False
+    socket.call_on_periodic_callback(100.0)
+    assert socket.send_unicast_called[0].sequence == 0
+
+    # changes are not send out while manual flush is enabled
+    handler.manual_flush = True
+    outputs[1].dmx_data = (1, 2, 3)
+    socket.call_on_periodic_callback(101.5)
+    assert socket.send_unicast_called[0].sequence == 0
+    handler.send_out_all_universes(63999, outputs, 101.5)
+    assert socket.send_unicast_called[0].sequence == 1
+
+    # the flushed change is not send out again
+    handler.manual_flush = False
+    socket.call_on_periodic_callback(101.6)
+    assert socket.send_unicast_called[0].sequence == 1
+    socket.call_on_periodic_callback(102.5)
+    assert socket.send_unicast_called[0].sequence == 2
+
+
+def test_schedule_max_fps():
+    handler, socket, cid, source_name, outputs = get_handler()
+    handler.manual_flush = False
+    outputs[1].max_fps = 10
+    socket.call_on_periodic_callback(100.0)
+    assert socket.send_unicast_called[0].sequence == 0
+
+    # a change is delayed until 1/10 s is over
+    outputs[1].dmx_data = (1,)
+    socket.call_on_periodic_callback(100.05)
+    assert socket.send_unicast_called[0].sequence == 0
+    # all changes until then are send out together
+    outputs[1].dmx_data = (2,)
+    socket.call_on_periodic_callback(100.08)
+    assert socket.send_unicast_called[0].sequence == 0
+    socket.call_on_periodic_callback(100.1)
+    assert socket.send_unicast_called[0].sequence == 1
+    assert socket.send_unicast_called[0].dmxData[0] == 2
+    # without further changes, only the keep-alive is send
+    socket.call_on_periodic_callback(100.5)
+    assert socket.send_unicast_called[0].sequence == 1
+    socket.call_on_periodic_callback(101.1)
+    assert socket.send_unicast_called[0].sequence == 2
+
+    # without a limit, every change is send out on the next tick
+    outputs[1].max_fps = None
+    outputs[1].dmx_data = (3,)
+    socket.call_on_periodic_callback(101.11)
+    assert socket.send_unicast_called[0].sequence == 3
+
+
+@pytest.mark.parametrize('fps, max_fps', [(44, 44), (30, 10), (44, 20)])
+def test_schedule_max_fps_jitter(fps, max_fps):
+    handler, socket, cid, source_name, outputs = get_handler(fps)
+    handler.manual_flush = False
+    outputs[1].max_fps = max_fps
+    # the ticks are up to 1ms early or late and the data changes on every tick
+    for tick in range(0, 5 * fps):
+        outputs[1].dmx_data = (tick % 256,)
+        socket.call_on_periodic_callback(100.0 + tick / fps + (0.001, -0.001, 0.0005, -0.0005)[tick % 4])
+    packets = socket.send_unicast_called[0].sequence + 1
+    assert 5 * max_fps - 1 <= packets <= 5 * max_fps + 1
+
+
+def test_schedule_keep_alive_interval():
+    handler, socket, cid, source_name, outputs = get_handler()
+    handler.manual_flush = False
+    outputs[1].keep_alive_interval = 2
+    socket.call_on_periodic_callback(100.0)
+    assert socket.send_unicast_called[0].sequence == 0
+    socket.call_on_periodic_callback(101.9)
+    assert socket.send_unicast_called[0].sequence == 0
+    socket.call_on_periodic_callback(102.0)
+    assert socket.send_unicast_called[0].sequence == 1
+
+    # a shorter interval is used right away
+    outputs[1].keep_alive_interval = 0.5
+    socket.call_on_periodic_callback(102.1)
+    assert socket.send_unicast_called[0].sequence == 1
+    socket.call_on_periodic_callback(102.5)
+    assert socket.send_unicast_called[0].sequence == 2
+    assert len(handler._schedule) <= 3
 
 
 def test_multicast():
@@ -90,22 +282,21 @@ def test_multicast():
 
     # first send packet due to interval
     socket.call_on_periodic_callback(current_time)
-    assert socket.send_multicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=0).__dict__
+    assert socket.send_multicast_called[0] == DataPacket(cid, source_name, 1, sequence=0)
     assert socket.send_multicast_called[1] == calculate_multicast_addr(1)
 
     # only send out on dmx change
     # test same data as before
-    # TODO: currently there is no "are the values different" check.
-    # If it is implemented, enable the following line:
-    # outputs[1].dmx_data = (0, 0)
+    outputs[1].change_detection = True
+    outputs[1].dmx_data = (0, 0)
     socket.call_on_periodic_callback(current_time)
-    assert socket.send_multicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=0).__dict__
+    assert socket.send_multicast_called[0] == DataPacket(cid, source_name, 1, sequence=0)
     assert socket.send_multicast_called[1] == calculate_multicast_addr(1)
 
     # test change in data as before
     outputs[1].dmx_data = (1, 2)
     socket.call_on_periodic_callback(current_time)
-    assert socket.send_multicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=1, dmxData=(1, 2)).__dict__
+    assert socket.send_multicast_called[0] == DataPacket(cid, source_name, 1, sequence=1, dmxData=(1, 2))
     assert socket.send_multicast_called[1] == calculate_multicast_addr(1)
 
     # assert that no unicast was send
@@ -126,22 +317,21 @@ def test_unicast():
 
     # first send packet due to interval
     socket.call_on_periodic_callback(current_time)
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=0).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(cid, source_name, 1, sequence=0)
     assert socket.send_unicast_called[1] == destination
 
     # only send out on dmx change
     # test same data as before
-    # TODO: currently there is no "are the values different" check.
-    # If it is implemented, enable the following line:
-    # outputs[1].dmx_data = (0, 0)
+    outputs[1].change_detection = True
+    outputs[1].dmx_data = (0, 0)
     socket.call_on_periodic_callback(current_time)
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=0).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(cid, source_name, 1, sequence=0)
     assert socket.send_unicast_called[1] == destination
 
     # test change in data as before
     outputs[1].dmx_data = (1, 2)
     socket.call_on_periodic_callback(current_time)
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=1, dmxData=(1, 2)).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(cid, source_name, 1, sequence=1, dmxData=(1, 2))
     assert socket.send_unicast_called[1] == destination
 
     # assert that no multicast was send
@@ -169,9 +359,9 @@ def test_send_out_all_universes():
     # after calling send_out_all_universes, the DataPackets need to send, as well as one SyncPacket
     sync_universe = 63999
     handler.send_out_all_universes(sync_universe, outputs, current_time)
-    assert socket.send_unicast_called[0].__dict__ == DataPacket(cid, source_name, 1, sequence=0, sync_universe=sync_universe).__dict__
+    assert socket.send_unicast_called[0] == DataPacket(cid, source_name, 1, sequence=0, sync_universe=sync_universe)
     assert socket.send_unicast_called[1] == destination
-    assert socket.send_multicast_called[0].__dict__ == SyncPacket(cid, sync_universe, 0).__dict__
+    assert socket.send_multicast_called[0] == SyncPacket(cid, sync_universe, 0)
     assert socket.send_multicast_called[1] == calculate_multicast_addr(sync_universe)
 
 
@@ -184,4 +374,4 @@ def test_send_out_all_universes_sequence_increment():
     # check that the sequence number never exceeds the range [0-255]
     for i in range(0, 300):
         handler.send_out_all_universes(sync_universe, outputs, current_time)
-        assert socket.send_multicast_called[0].__dict__ == SyncPacket(cid, sync_universe, (i % 256)).__dict__
+        assert socket.send_multicast_called[0] == SyncPacket(cid, sync_universe, (i % 256))
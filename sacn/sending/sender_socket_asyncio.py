@@ -0,0 +1,176 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import asyncio
+import socket
+from typing import Optional
+
+from sacn.messages.root_layer import RootLayer
+from sacn.sending.sender_socket_base import SenderSocketBase, SenderSocketListener, DEFAULT_PORT
+
+try:
+    _get_running_loop = asyncio.get_running_loop
+except AttributeError:  # Python < 3.7, where get_event_loop returns the running loop, when called in a coroutine
+    _get_running_loop = asyncio.get_event_loop
+
+# the proactor event loop of Windows only accepts numeric addresses, so '<broadcast>' can not be used
+BROADCAST_ADDRESS = '255.255.255.255'
+
+
+class _SenderProtocol(asyncio.DatagramProtocol):
+    def __init__(self, sender_socket: 'SenderSocketAsyncio'):
+        self._sender_socket = sender_socket
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._sender_socket._on_connection_lost()
+
+    def error_received(self, exc: Exception) -> None:
+        self._sender_socket._logger.exception('Failed to send packet', exc_info=exc)
+
+    def pause_writing(self) -> None:
+        self._sender_socket._writing_resumed = self._sender_socket._loop.create_future()
+
+    def resume_writing(self) -> None:
+        self._sender_socket._resume_writing()
+
+
+class SenderSocketAsyncio(SenderSocketBase):
+    """
+    Implements a sender socket with a datagram transport of an asyncio event loop.
+    The periodic callback is scheduled on the loop instead of a thread, so all methods must be called on the loop.
+    """
+
+    def __init__(self, listener: SenderSocketListener, bind_address: str, bind_port: int, fps: int):
+        super().__init__(listener=listener)
+
+        self._bind_address: str = bind_address
+        self._bind_port: int = bind_port
+        self.fps: int = fps
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # the deadline of the next frame in the time of the loop
+        self._deadline: float = 0
+        self._missed_frames: int = 0
+        # set while the buffer of the transport is full
+        self._writing_resumed: Optional[asyncio.Future] = None
+        self._closed: Optional[asyncio.Future] = None
+        # the socket options that are set at the moment, so that they are only set again if they change
+        self._multicast_ttl: Optional[int] = None
+        self._broadcast_enabled: bool = False
+
+        # the socket is created and bound right away, so that errors are raised by the constructor
+        self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        except socket.error:  # Not all systems support multiple sockets on the same port and interface
+            pass
+
+        try:
+            self._socket.bind((self._bind_address, self._bind_port))
+            self._logger.info(f'Bind sender socket to IP:{self._bind_address} Port:{self._bind_port}')
+        except socket.error:
+            self._logger.exception(f'Could not bind to IP:{self._bind_address} Port:{self._bind_port}')
+            self._socket.close()
+            raise
+        self._socket.setblocking(False)
+
+    async def open(self) -> None:
+        """
+        Creates the datagram transport on the running loop. Has to be awaited before start is called.
+        """
+        self._loop = _get_running_loop()
+        self._closed = self._loop.create_future()
+        self._transport, _ = await self._loop.create_datagram_endpoint(lambda: _SenderProtocol(self), sock=self._socket)
+
+    def start(self) -> None:
+        """
+        Schedules the periodic callback on the loop. The frames are scheduled against absolute deadlines of the
+        monotonic clock of the loop.
+        """
+        if self._transport is None:
+            raise RuntimeError('The socket has to be opened before it can be started!')
+        self.stop_frames()
+        self._deadline = self._loop.time()
+        self._missed_frames = 0
+        self._on_frame()
+
+    def _on_frame(self) -> None:
+        loop = self._loop
+        current_time = loop.time()
+        self.frame_statistics.record(int((current_time - self._deadline) * 1e9), self._missed_frames)
+        try:
+            self._listener.on_periodic_callback(current_time)
+        finally:
+            frame_time = 1 / self.fps
+            self._deadline += frame_time
+            now = loop.time()
+            # missed frames are skipped instead of sending them in a burst, like the thread of SenderSocketUDP does
+            self._missed_frames = int((now - self._deadline) // frame_time) if now > self._deadline else 0
+            self._deadline += self._missed_frames * frame_time
+            if self._transport is not None and not self._transport.is_closing():
+                self._timer = loop.call_at(self._deadline, self._on_frame)
+
+    def stop_frames(self) -> None:
+        """
+        Stops the periodic callback, but keeps the transport open.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def stop(self) -> None:
+        """
+        Stops the periodic callback and closes the transport. Use wait_closed to wait until it is closed.
+        Do not reuse the socket after calling stop once.
+        """
+        self.stop_frames()
+        if self._transport is not None:
+            self._transport.close()
+        else:
+            self._socket.close()
+
+    async def wait_closed(self) -> None:
+        if self._closed is not None:
+            await self._closed
+
+    async def drain(self) -> None:
+        """
+        Waits until the buffer of the transport is not full anymore.
+        """
+        if self._writing_resumed is not None:
+            await self._writing_resumed
+
+    def _resume_writing(self) -> None:
+        writing_resumed, self._writing_resumed = self._writing_resumed, None
+        if writing_resumed is not None and not writing_resumed.done():
+            writing_resumed.set_result(None)
+
+    def _on_connection_lost(self) -> None:
+        self._resume_writing()
+        if self._closed is not None and not self._closed.done():
+            self._closed.set_result(None)
+
+    def send_unicast(self, data: RootLayer, destination: str) -> None:
+        self.send_packet(data.getBuffer(), destination)
+
+    def send_multicast(self, data: RootLayer, destination: str, ttl: int) -> None:
+        # make socket multicast-aware: (set TTL)
+        if ttl != self._multicast_ttl:
+            self._socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+            self._multicast_ttl = ttl
+        self.send_packet(data.getBuffer(), destination)
+
+    def send_broadcast(self, data: RootLayer) -> None:
+        # hint: on windows a bind address must be set, to use broadcast
+        if not self._broadcast_enabled:
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            self._broadcast_enabled = True
+        self.send_packet(data.getBuffer(), destination=BROADCAST_ADDRESS)
+
+    def send_packet(self, data: bytes, destination: str) -> None:
+        if self._transport is None:
+            # the socket is not opened yet, e.g. an output is deactivated before the start
+            self._socket.sendto(data, (destination, DEFAULT_PORT))
+            return
+        # the transport sends right away or copies the data into its buffer, if the socket is busy
+        self._transport.sendto(data, (destination, DEFAULT_PORT))
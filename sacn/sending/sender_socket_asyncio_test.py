@@ -0,0 +1,81 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import asyncio
+import socket
+
+import pytest
+
+from sacn.messages.data_packet import DataPacket
+from sacn.sending import sender_socket_asyncio
+from sacn.sending.sender_socket_asyncio import SenderSocketAsyncio
+from sacn.sending.sender_socket_base import SenderSocketListener
+
+
+class Listener(SenderSocketListener):
+    def __init__(self):
+        self.times = []
+
+    def on_periodic_callback(self, time: float) -> None:
+        self.times.append(time)
+
+
+def test_periodic_callback():
+    listener = Listener()
+    sender_socket = SenderSocketAsyncio(listener, '127.0.0.1', 0, 50)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            sender_socket.start()
+        await sender_socket.open()
+        sender_socket.start()
+        await asyncio.sleep(0.2)
+        sender_socket.stop()
+        await sender_socket.wait_closed()
+        return asyncio.get_running_loop().time()
+
+    stop_time = asyncio.run(run())
+    # the first frame is called right away, the other frames every 20ms. No frame starts before its deadline
+    times = listener.times
+    assert 8 <= len(times) <= 12
+    assert all(time >= times[0] + index * 0.02 - 0.001 for index, time in enumerate(times))
+    assert 0.018 < (times[-1] - times[0]) / (len(times) - 1) < 0.022
+    assert listener.times[-1] <= stop_time
+    assert sender_socket.frame_statistics.frames == len(listener.times)
+
+
+def test_send(monkeypatch):
+    packet = DataPacket(tuple(range(0, 16)), 'Test', 1, dmxData=(1, 2, 3))
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    receiver.settimeout(1)
+    # the default port can not be used by the test
+    monkeypatch.setattr(sender_socket_asyncio, 'DEFAULT_PORT', receiver.getsockname()[1])
+    sender_socket = SenderSocketAsyncio(None, '127.0.0.1', 0, 30)
+    # packets can be send before the transport was opened
+    sender_socket.send_unicast(packet, '127.0.0.1')
+    packet.sequence_increase()
+
+    async def run():
+        await sender_socket.open()
+        sender_socket.send_multicast(packet, '127.0.0.1', 12)
+        await sender_socket.drain()
+        assert sender_socket._socket.getsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL) == 12
+        sender_socket.stop()
+        await sender_socket.wait_closed()
+
+    asyncio.run(run())
+    assert receiver.recv(1024)[111] == 0
+    assert receiver.recv(1024) == bytes(packet.getBuffer())
+    receiver.close()
+
+
+def test_send_broadcast():
+    packet = DataPacket(tuple(range(0, 16)), 'Test', 1)
+    sender_socket = SenderSocketAsyncio(None, '127.0.0.1', 0, 30)
+    destinations = []
+    sender_socket.send_packet = lambda data, destination: destinations.append(destination)
+    sender_socket.send_broadcast(packet)
+    # a numeric address, which every event loop accepts
+    assert destinations == ['255.255.255.255']
+    assert sender_socket._socket.getsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST)
+    sender_socket._socket.close()
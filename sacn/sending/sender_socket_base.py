@@ -2,6 +2,7 @@
 
 import logging
 from sacn.messages.root_layer import RootLayer
+from sacn.sending.frame_statistics import FrameStatistics
 
 DEFAULT_PORT = 5568
 
@@ -12,6 +13,9 @@ class SenderSocketListener:
     """
 
     def on_periodic_callback(self, time: float) -> None:
+        """
+        :param time: the current time in seconds of a monotonic clock
+        """
         raise NotImplementedError
 
 
@@ -23,6 +27,11 @@ class SenderSocketBase:
     def __init__(self, listener: SenderSocketListener):
         self._logger: logging.Logger = logging.getLogger('sacn')
         self._listener: SenderSocketListener = listener
+        # the timing of the periodic callbacks, recorded by implementations with their own sending loop
+        self.frame_statistics: FrameStatistics = FrameStatistics()
+        # the time in seconds before each deadline of the sending loop, that is waited without sleeping.
+        # This costs CPU time, but the OS might wake up a sleeping thread too late. Default: 0
+        self.spin_time: float = 0
 
     def start(self) -> None:
         raise NotImplementedError
@@ -1,14 +1,23 @@
 # This file is under MIT license. The license file can be obtained in the root directory of this module.
 
+import errno
 import socket
 import time
 import threading
+from typing import Dict, List, Optional, Tuple
 
 from sacn.messages.root_layer import RootLayer
+from sacn.sending import mmsg
 from sacn.sending.sender_socket_base import SenderSocketBase, SenderSocketListener, DEFAULT_PORT
 
 THREAD_NAME = 'sACN sending/sender thread'
 
+try:
+    _monotonic_ns = time.monotonic_ns
+except AttributeError:  # Python < 3.7
+    def _monotonic_ns() -> int:
+        return int(time.monotonic() * 1e9)
+
 
 class SenderSocketUDP(SenderSocketBase):
     """
@@ -22,6 +31,17 @@ class SenderSocketUDP(SenderSocketBase):
         self._bind_port: int = bind_port
         self._enabled_flag: bool = True
         self.fps: int = fps
+        # all packets of one frame are collected and send out with sendmmsg, if the system supports it
+        self.batch_sending: bool = mmsg.AVAILABLE
+        # the packets and destinations of the current frame grouped by their multicast TTL.
+        # None is used for unicast and broadcast
+        self._batch: Optional[Dict[Optional[int], Tuple[List[bytes], List[str]]]] = None
+        self._batch_thread: Optional[int] = None
+        # guards the batch, because packets of other threads are send after the collected packets
+        self._batch_lock = threading.Lock()
+        # the socket options that are set at the moment, so that they are only set again if they change
+        self._multicast_ttl: Optional[int] = None
+        self._broadcast_enabled: bool = False
 
         # initialize the UDP socket
         self._socket: socket.socket = socket.socket(socket.AF_INET,  # Internet
@@ -50,17 +70,36 @@ class SenderSocketUDP(SenderSocketBase):
     def send_loop(self) -> None:
         self._logger.info(f'Started {THREAD_NAME}')
         self._enabled_flag = True
+        # the frames are scheduled against absolute deadlines of a monotonic clock,
+        # so neither changes of the wall clock nor the overshoot of sleep add up over time
+        deadline = _monotonic_ns()
+        missed_frames = 0
         while self._enabled_flag:
-            time_stamp = time.time()
-            self._listener.on_periodic_callback(time_stamp)
-            time_to_sleep = (1 / self.fps) - (time.time() - time_stamp)
-            if time_to_sleep < 0:  # if time_to_sleep is negative (because the loop has too much work to do) set it to 0
-                time_to_sleep = 0
-            time.sleep(time_to_sleep)
-            # this sleeps nearly exactly so long that the loop is called every 1/fps seconds
+            time_stamp = _monotonic_ns()
+            self.frame_statistics.record(time_stamp - deadline, missed_frames)
+            self.start_batch()
+            self._listener.on_periodic_callback(time_stamp / 1e9)
+            self.send_batch()
+
+            frame_time = int(1e9 / self.fps)
+            deadline += frame_time
+            now = _monotonic_ns()
+            # a late frame starts right away, but if the loop had too much work to do for more than a whole frame,
+            # the missed frames are skipped instead of sending them in a burst
+            missed_frames = (now - deadline) // frame_time if now > deadline else 0
+            deadline += missed_frames * frame_time
+            self._wait_until(deadline)
 
         self._logger.info(f'Stopped {THREAD_NAME}')
 
+    def _wait_until(self, deadline: int) -> None:
+        spin_time = int(self.spin_time * 1e9)
+        time_to_sleep = deadline - spin_time - _monotonic_ns()
+        if time_to_sleep > 0:
+            time.sleep(time_to_sleep / 1e9)
+        while _monotonic_ns() < deadline:
+            pass
+
     def stop(self) -> None:
         """
         Stops a running thread and closes the underlying socket. If no thread was started, nothing happens.
@@ -75,23 +114,101 @@ class SenderSocketUDP(SenderSocketBase):
         except AttributeError:
             pass
 
+    def start_batch(self) -> None:
+        """
+        Starts to collect the packets that are send on the calling thread, until send_batch is called.
+        Packets from other threads are still send out immediately, but after the packets that were collected until
+        then. So the packets of a universe stay in order, e.g. stream termination packets are send last.
+        Does nothing if batch_sending is False.
+        """
+        if self.batch_sending:
+            with self._batch_lock:
+                self._batch = {}
+                self._batch_thread = threading.get_ident()
+
+    def send_batch(self) -> None:
+        """
+        Sends out all collected packets with as few syscalls as possible.
+        """
+        with self._batch_lock:
+            batch, self._batch = self._batch, None
+            self._send_packets(batch)
+
+    def _send_pending_packets(self) -> None:
+        with self._batch_lock:
+            batch = self._batch
+            if batch:
+                self._batch = {}
+                self._send_packets(batch)
+
+    def _send_packets(self, batch: Optional[Dict[Optional[int], Tuple[List[bytes], List[str]]]]) -> None:
+        if not batch:
+            return
+        for ttl, (packets, destinations) in batch.items():
+            if ttl is not None:
+                self._set_multicast_ttl(ttl)
+            try:
+                mmsg.send_batch(self._socket, packets, destinations, DEFAULT_PORT)
+            except OSError as e:
+                if e.errno != errno.ENOSYS:
+                    self._logger.exception('Failed to send packets', exc_info=e)
+                    raise
+                # the syscall is not allowed (e.g. in a sandbox), so every packet is send on its own from now on
+                self.batch_sending = False
+                for packet, destination in zip(packets, destinations):
+                    self.send_packet(packet, destination)
+
+    def _add_to_batch(self, data: RootLayer, destination: str, ttl: Optional[int]) -> bool:
+        if self._batch_thread is None:
+            return False  # no packets were collected yet
+        if threading.get_ident() != self._batch_thread:
+            # the packet is send out directly, after the packets that were collected by the other thread
+            self._send_pending_packets()
+            return False
+        with self._batch_lock:
+            batch = self._batch
+            if batch is None:
+                return False
+            group = batch.get(ttl)
+            if group is None:
+                group = batch[ttl] = ([], [])
+            # the buffer of a packet is changed after it was send (e.g. the sequence number), so it has to be copied
+            group[0].append(bytes(data.getBuffer()))
+            group[1].append(destination)
+        return True
+
     def send_unicast(self, data: RootLayer, destination: str) -> None:
-        self.send_packet(data.getBytes(), destination)
+        if self._add_to_batch(data, destination, None):
+            return
+        self.send_packet(data.getBuffer(), destination)
 
     def send_multicast(self, data: RootLayer, destination: str, ttl: int) -> None:
+        if self._add_to_batch(data, destination, ttl):
+            return
         # make socket multicast-aware: (set TTL)
-        self._socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
-        self.send_packet(data.getBytes(), destination)
+        self._set_multicast_ttl(ttl)
+        self.send_packet(data.getBuffer(), destination)
 
     def send_broadcast(self, data: RootLayer) -> None:
         # hint: on windows a bind address must be set, to use broadcast
-        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        self.send_packet(data.getBytes(), destination='<broadcast>')
-
-    def send_packet(self, data: bytearray, destination: str) -> None:
-        data_raw = bytearray(data)
+        self._enable_broadcast()
+        if self._add_to_batch(data, '<broadcast>', None):
+            return
+        self.send_packet(data.getBuffer(), destination='<broadcast>')
+
+    def _set_multicast_ttl(self, ttl: int) -> None:
+        if ttl != self._multicast_ttl:
+            self._socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+            self._multicast_ttl = ttl
+
+    def _enable_broadcast(self) -> None:
+        if not self._broadcast_enabled:
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            self._broadcast_enabled = True
+
+    def send_packet(self, data: bytes, destination: str) -> None:
         try:
-            self._socket.sendto(data_raw, (destination, DEFAULT_PORT))
+            self._socket.sendto(data, (destination, DEFAULT_PORT))
         except OSError as e:
             self._logger.exception('Failed to send packet', exc_info=e)
             raise
@@ -0,0 +1,213 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import errno
+import socket
+import threading
+import time
+from sacn.messages.data_packet import DataPacket
+from sacn.sending import mmsg
+from sacn.sending.sender_socket_base import DEFAULT_PORT, SenderSocketListener
+from sacn.sending.sender_socket_udp import SenderSocketUDP
+
+
+def get_socket(monkeypatch):
+    sender_socket = SenderSocketUDP(None, '127.0.0.1', 0, 30)
+    batches = []
+    packets = []
+    monkeypatch.setattr(mmsg, 'send_batch', lambda sock, data, destinations, port: batches.append((
+        sock.getsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL), data, destinations, port)))
+    monkeypatch.setattr(sender_socket, 'send_packet', lambda data, destination: packets.append((bytes(data), destination)))
+    return sender_socket, batches, packets
+
+
+def test_batch(monkeypatch):
+    sender_socket, batches, packets = get_socket(monkeypatch)
+    sender_socket.batch_sending = True
+    packet = DataPacket(tuple(range(0, 16)), 'Test', 1)
+
+    sender_socket.start_batch()
+    sender_socket.send_multicast(packet, '239.255.0.1', 8)
+    packet.sequence_increase()
+    sender_socket.send_unicast(packet, '127.0.0.1')
+    sender_socket.send_multicast(packet, '239.255.0.1', 12)
+    sender_socket.send_multicast(packet, '239.255.0.1', 8)
+    assert batches == []
+
+    sender_socket.send_batch()
+    # the packets are grouped by their TTL and copied when they were added
+    first = bytes(DataPacket(tuple(range(0, 16)), 'Test', 1).getBuffer())
+    second = bytes(packet.getBuffer())
+    assert batches == [
+        (8, [first, second], ['239.255.0.1', '239.255.0.1'], DEFAULT_PORT),
+        (8, [second], ['127.0.0.1'], DEFAULT_PORT),
+        (12, [second], ['239.255.0.1'], DEFAULT_PORT),
+    ]
+    # the batch is over
+    sender_socket.send_unicast(packet, '127.0.0.1')
+    assert packets[-1] == (second, '127.0.0.1')
+    sender_socket.send_batch()
+    assert len(batches) == 3
+    sender_socket._socket.close()
+
+
+def test_batch_other_thread(monkeypatch):
+    sender_socket, batches, packets = get_socket(monkeypatch)
+    sender_socket.batch_sending = True
+    packet = DataPacket(tuple(range(0, 16)), 'Test', 1)
+    sent = []
+
+    def send_packet(data, destination):
+        # the collected packets were send out before the packet of the other thread
+        sent.append(list(batches))
+        packets.append((bytes(data), destination))
+    sender_socket.send_packet = send_packet
+
+    sender_socket.start_batch()
+    sender_socket.send_unicast(packet, '127.0.0.1')
+    packet.sequence_increase()
+    packet.option_StreamTerminated = True
+    # packets from other threads are send out immediately
+    thread = threading.Thread(target=sender_socket.send_unicast, args=(packet, '127.0.0.1'))
+    thread.start()
+    thread.join()
+    first = bytes(DataPacket(tuple(range(0, 16)), 'Test', 1).getBuffer())
+    assert sent == [[(1, [first], ['127.0.0.1'], DEFAULT_PORT)]]
+    assert packets == [(bytes(packet.getBuffer()), '127.0.0.1')]
+    # the packets are not send twice
+    sender_socket.send_unicast(packet, '127.0.0.2')
+    sender_socket.send_batch()
+    assert len(batches) == 2
+    assert batches[1][2] == ['127.0.0.2']
+    sender_socket._socket.close()
+    sender_socket._socket.close()
+
+
+def test_batch_disabled(monkeypatch):
+    sender_socket, batches, packets = get_socket(monkeypatch)
+    sender_socket.batch_sending = False
+    packet = DataPacket(tuple(range(0, 16)), 'Test', 1)
+
+    sender_socket.start_batch()
+    sender_socket.send_multicast(packet, '239.255.0.1', 8)
+    sender_socket.send_batch()
+    assert batches == []
+    assert packets == [(bytes(packet.getBuffer()), '239.255.0.1')]
+    sender_socket._socket.close()
+
+
+def test_batch_not_supported(monkeypatch):
+    sender_socket, batches, packets = get_socket(monkeypatch)
+
+    def send_batch(sock, data, destinations, port):
+        raise OSError(errno.ENOSYS, 'Function not implemented')
+
+    monkeypatch.setattr(mmsg, 'send_batch', send_batch)
+    sender_socket.batch_sending = True
+    packet = DataPacket(tuple(range(0, 16)), 'Test', 1)
+
+    # the packets are send out on their own and batching is turned off
+    sender_socket.start_batch()
+    sender_socket.send_unicast(packet, '127.0.0.1')
+    sender_socket.send_batch()
+    assert packets == [(bytes(packet.getBuffer()), '127.0.0.1')]
+    assert sender_socket.batch_sending is False
+    sender_socket._socket.close()
+
+
+def test_send_loop():
+    times = []
+
+    class Listener(SenderSocketListener):
+        def on_periodic_callback(self, time: float) -> None:
+            times.append(time)
+            if len(times) == 10:
+                sender_socket._enabled_flag = False
+
+    sender_socket = SenderSocketUDP(Listener(), '127.0.0.1', 0, 100)
+    start = time.monotonic()
+    sender_socket.send_loop()
+    sender_socket._socket.close()
+    # the callback gets the time of the monotonic clock and is called every 1/fps seconds
+    assert len(times) == 10
+    assert start <= times[0] <= times[-1] <= time.monotonic()
+    assert times[-1] - times[0] >= 0.09 - 0.001
+    assert sender_socket.frame_statistics.frames == 10
+
+
+def test_send_loop_spin_time():
+    calls = []
+
+    class Listener(SenderSocketListener):
+        def on_periodic_callback(self, time: float) -> None:
+            calls.append(time)
+            if len(calls) == 3:
+                sender_socket._enabled_flag = False
+
+    sender_socket = SenderSocketUDP(Listener(), '127.0.0.1', 0, 100)
+    sender_socket.spin_time = 0.002
+    sender_socket.send_loop()
+    sender_socket._socket.close()
+    assert len(calls) == 3
+    assert sender_socket.frame_statistics.frames == 3
+
+
+class FakeSocket:
+    """
+    Records the calls that would be syscalls on a real socket.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def setsockopt(self, level: int, option: int, value: int) -> None:
+        self.calls.append(('setsockopt', option, value))
+
+    def sendto(self, data: bytes, address: tuple) -> None:
+        self.calls.append(('sendto', address[0]))
+
+
+def test_socket_options_only_set_on_change():
+    sender_socket = SenderSocketUDP(None, '127.0.0.1', 0, 30)
+    sender_socket._socket.close()
+    sender_socket._socket = fake_socket = FakeSocket()
+    packet = DataPacket(tuple(range(0, 16)), 'Test', 1)
+
+    sender_socket.send_multicast(packet, '239.255.0.1', 8)
+    sender_socket.send_multicast(packet, '239.255.0.1', 8)
+    sender_socket.send_multicast(packet, '239.255.0.2', 12)
+    sender_socket.send_multicast(packet, '239.255.0.1', 8)
+    sender_socket.send_broadcast(packet)
+    sender_socket.send_broadcast(packet)
+    assert fake_socket.calls == [
+        ('setsockopt', socket.IP_MULTICAST_TTL, 8),
+        ('sendto', '239.255.0.1'),
+        ('sendto', '239.255.0.1'),
+        ('setsockopt', socket.IP_MULTICAST_TTL, 12),
+        ('sendto', '239.255.0.2'),
+        ('setsockopt', socket.IP_MULTICAST_TTL, 8),
+        ('sendto', '239.255.0.1'),
+        ('setsockopt', socket.SO_BROADCAST, 1),
+        ('sendto', '<broadcast>'),
+        ('sendto', '<broadcast>'),
+    ]
+
+
+def test_batch_socket_options_only_set_on_change(monkeypatch):
+    sender_socket = SenderSocketUDP(None, '127.0.0.1', 0, 30)
+    sender_socket._socket.close()
+    sender_socket._socket = fake_socket = FakeSocket()
+    monkeypatch.setattr(mmsg, 'send_batch', lambda sock, data, destinations, port: fake_socket.calls.append(
+        ('sendmmsg', len(data))))
+    sender_socket.batch_sending = True
+    packet = DataPacket(tuple(range(0, 16)), 'Test', 1)
+
+    for _ in range(0, 2):
+        sender_socket.start_batch()
+        sender_socket.send_multicast(packet, '239.255.0.1', 8)
+        sender_socket.send_multicast(packet, '239.255.0.2', 8)
+        sender_socket.send_batch()
+    assert fake_socket.calls == [
+        ('setsockopt', socket.IP_MULTICAST_TTL, 8),
+        ('sendmmsg', 2),
+        ('sendmmsg', 2),
+    ]
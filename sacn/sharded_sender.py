@@ -0,0 +1,333 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+"""
+A sACN sender that splits its universes across multiple worker processes, so that the encoding and sending of
+packets is not limited by the GIL of one process.
+"""
+
+import collections
+import multiprocessing
+import threading
+import time
+from typing import Deque, Dict, List, Set
+
+from sacn.messages.data_packet import DataPacket
+from sacn.sender import sACNsender, check_universe
+from sacn.sending.frame_bank import FrameBank
+from sacn.sending.output import Output
+from sacn.sending.sender_handler import SenderHandler
+from sacn.sending.sender_socket_base import DEFAULT_PORT
+
+# the settings of an output, that are send to the worker process when they change
+_WORKER_SETTINGS = ('destination', 'multicast', 'ttl', 'priority', 'preview_data', 'variable_length', 'max_fps',
+                    'keep_alive_interval', 'change_detection')
+_OFFSET_DMX_DATA = 126
+
+
+class _DiscoveryHandler(SenderHandler):
+    """
+    The handler of the process of a ShardedSACNSender. The data packets are send out by the workers.
+    The frames of an attached frame bank are copied into the outputs, which hand them over to their workers.
+    """
+
+    def on_periodic_callback(self, current_time: float) -> None:
+        self.read_frame_bank()
+        if self.universe_discovery:
+            self.send_due_universe_discovery_packets(current_time)
+
+
+class ShardedSACNSender(sACNsender):
+    """
+    Note that all workers are started by the constructor, whether outputs are activated or not. Every worker has a
+    frame bank for ceil(63999 / workers) frames in shared memory, which is reserved but only used as far as the
+    worker has outputs.
+    """
+    _handler_class = _DiscoveryHandler
+
+    def __init__(self, bind_address: str = '0.0.0.0', bind_port: int = DEFAULT_PORT,
+                 source_name: str = 'default source name', cid: tuple = (),
+                 fps: int = 30, universeDiscovery: bool = True,
+                 sync_universe: int = 63999, workers: int = 2):
+        """
+        Creates a sender, that sends the DMX data of its universes with multiple worker processes. Every worker has its
+        own socket and sending thread and sends the packets of some universes, so the sequence numbers of a universe
+        are always counted by the same process. The DMX data is handed over to the workers via shared memory.
+        The universe discovery and sync packets are send by this process.
+        It has the same usage as sACNsender. Note that the workers are started with the spawn method of
+        multiprocessing, so the main module of the program must be importable without side effects.
+        :param workers: the number of worker processes. Has to be >0
+        """
+        # checked before the socket is created, so it is not leaked
+        if workers < 1:
+            raise ValueError(f'There has to be at least one worker! Value was {workers}')
+        super().__init__(bind_address, bind_port, source_name, cid, fps, universeDiscovery, sync_universe)
+        context = multiprocessing.get_context('spawn')
+        sender_args = {
+            'bind_address': bind_address, 'bind_port': bind_port, 'source_name': source_name,
+            'cid': self._sender_handler._CID, 'fps': fps, 'universeDiscovery': False, 'sync_universe': sync_universe,
+        }
+        # new outputs are added to the worker with the fewest outputs, so every worker has at most this many outputs
+        size = -(-63999 // workers)
+        self._shards: List[_Shard] = [_Shard(context, size, sender_args) for _ in range(workers)]
+
+    def activate_output(self, universe: int) -> None:
+        check_universe(universe)
+        if universe in self._outputs:
+            return
+        shard = min(self._shards, key=lambda shard: len(shard.universes))
+        output = _ShardedOutput(DataPacket(cid=self._sender_handler._CID, sourceName=self._sender_handler._source_name,
+                                           universe=universe), shard, shard.allocate(universe))
+        # the frame may still hold the data of the universe, that used it before
+        shard.bank.write(output._bank_index, output._dmx_slots())
+        shard.send('activate', universe, output._bank_index, output._settings(), bytes(output._dmx_slots()))
+        self._outputs[universe] = output
+        self._sender_handler.on_outputs_changed()
+
+    def deactivate_output(self, universe: int) -> None:
+        check_universe(universe)
+        output = self._outputs.pop(universe, None)
+        if output is None:
+            return
+        # the worker sends out the packets with the stream_termination bit
+        output._shard.send('deactivate', universe)
+        output._shard.free(universe, output._bank_index)
+        self._sender_handler.on_outputs_changed()
+
+    def move_universe(self, universe_from: int, universe_to: int) -> None:
+        check_universe(universe_from)
+        check_universe(universe_to)
+        output = self._outputs[universe_from]
+        self.deactivate_output(universe_from)
+        self.deactivate_output(universe_to)
+        # the output starts again on the new universe with the same settings and DMX data
+        self.activate_output(universe_to)
+        moved = self._outputs[universe_to]
+        for name in _WORKER_SETTINGS:
+            setattr(moved, name, getattr(output, name))
+        moved.dmx_data = output._dmx_slots()
+
+    @property
+    def manual_flush(self) -> bool:
+        return self._sender_handler.manual_flush
+
+    @manual_flush.setter
+    def manual_flush(self, manual_flush: bool) -> None:
+        self._sender_handler.manual_flush = manual_flush
+        for shard in self._shards:
+            shard.send('manual_flush', manual_flush)
+
+    @property
+    def spin_time(self) -> float:
+        return self._sender_handler.socket.spin_time
+
+    @spin_time.setter
+    def spin_time(self, spin_time: float) -> None:
+        if spin_time < 0:
+            raise ValueError(f'spin_time must not be negative! Value was {spin_time}')
+        self._sender_handler.socket.spin_time = spin_time
+        for shard in self._shards:
+            shard.send('spin_time', spin_time)
+
+    def flush(self, universes: List[int] = []):
+        """
+        Sends out all universes in one go. Every worker sends its universes, and when all workers are done,
+        the sync packet is send out. This uses the E1.31 sync mechanism to try to sync all universes.
+        :param universes: a list of universes to send. If not given, all will be sent.
+        :raises ValueError: when attempting to flush a universe that is not activated.
+        """
+        for uni in universes:
+            if uni not in self._outputs:
+                raise ValueError(f'Cannot flush universe {uni}, it is not active!')
+        self._sender_handler.read_frame_bank()
+        outputs = [self._outputs[uni] for uni in universes] if universes else list(self._outputs.values())
+        shard_universes: Dict[_Shard, List[int]] = {}
+        for output in outputs:
+            shard_universes.setdefault(output._shard, []).append(output._packet.universe)
+        for shard, universes_of_shard in shard_universes.items():
+            shard.request('flush', self._sync_universe, universes_of_shard)
+        self._sender_handler.send_sync_packet(self._sync_universe)
+
+    def start(self) -> None:
+        """
+        Starts or restarts the threads of this process and of all workers.
+        """
+        self._sender_handler.stop()
+        self._sender_handler.start()
+        for shard in self._shards:
+            shard.send('start')
+
+    def stop(self) -> None:
+        """
+        Stops all threads and worker processes and closes the underlying sockets.
+        Do not reuse the sender after calling stop once.
+        """
+        # the constructor may have failed before the socket or the workers were created
+        if hasattr(self, '_sender_handler'):
+            super().stop()
+        for shard in getattr(self, '_shards', ()):
+            shard.close()
+
+
+class _ShardedOutput(Output):
+    """
+    The output of a ShardedSACNSender. Changes of the DMX data are written into the frame bank of the worker, that
+    sends out the universe, and changes of the settings are send to it.
+    Note that the timing of the packets is handled by the worker, so dirty_range is always None. For the same reason,
+    this process does not know if a change is still waiting to be send out, so suppressed_sends is not supported.
+    """
+
+    __slots__ = ('_shard', '_bank_index')
+
+    def __init__(self, packet: DataPacket, shard: '_Shard', bank_index: int):
+        object.__setattr__(self, '_shard', None)
+        super().__init__(packet)
+        self._bank_index: int = bank_index
+        self._shard: _Shard = shard
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name in _WORKER_SETTINGS and self._shard is not None:
+            self._shard.send('set', self._packet.universe, name, value)
+
+    @property
+    def suppressed_sends(self) -> int:
+        raise RuntimeError('suppressed_sends is not supported by the outputs of a ShardedSACNSender!')
+
+    def _settings(self) -> dict:
+        return {name: getattr(self, name) for name in _WORKER_SETTINGS}
+
+    def _dmx_slots(self) -> bytearray:
+        return self._packet.getBuffer()[_OFFSET_DMX_DATA:]
+
+    def _mark_changed(self, start: int, end: int) -> None:
+        # the change is handed over to the worker, which sends it out
+        self._shard.bank.write(self._bank_index, self._dmx_slots())
+
+
+class _Shard:
+    """
+    The connection to one worker process.
+    """
+
+    def __init__(self, context, size: int, sender_args: dict):
+        self.bank: FrameBank = FrameBank(size)
+        self.universes: Set[int] = set()
+        # freed frames are used again as late as possible, so the worker stopped reading them for the old universe
+        self._free_indices: Deque[int] = collections.deque(range(0, size))
+        self._lock = threading.Lock()
+        self._connection, worker_connection = context.Pipe()
+        self._process = context.Process(target=_run_worker, args=(self.bank.name, worker_connection, sender_args),
+                                        name='sACN sending worker', daemon=True)
+        self._process.start()
+        worker_connection.close()
+        self._closed = False
+
+    def allocate(self, universe: int) -> int:
+        self.universes.add(universe)
+        return self._free_indices.popleft()
+
+    def free(self, universe: int, index: int) -> None:
+        self.universes.discard(universe)
+        self._free_indices.append(index)
+
+    def send(self, *message) -> None:
+        with self._lock:
+            self._connection.send(message)
+
+    def request(self, *message):
+        """
+        Sends the message and waits for the answer of the worker.
+        """
+        with self._lock:
+            self._connection.send(message)
+            return self._connection.recv()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.send('exit')
+        except OSError:  # the worker is not running anymore
+            pass
+        self._process.join(5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._connection.close()
+        self.bank.close()
+        self.bank.unlink()
+
+
+def _run_worker(bank_name: str, connection, sender_args: dict) -> None:
+    """
+    The main function of a worker process. The commands of the ShardedSACNSender are received from the connection.
+    """
+    worker = _Worker(FrameBank.attach(bank_name), sACNsender(**sender_args))
+    try:
+        while True:
+            try:
+                command, *args = connection.recv()
+            except EOFError:  # the process of the ShardedSACNSender exited
+                break
+            if command == 'exit':
+                break
+            result = getattr(worker, command)(*args)
+            if result is not None:
+                connection.send(result)
+    finally:
+        worker.close()
+
+
+class _Worker:
+    """
+    Executes the commands of a ShardedSACNSender in a worker process.
+    """
+
+    def __init__(self, bank: FrameBank, sender: sACNsender):
+        self._bank = bank
+        self._sender = sender
+        self._handler = sender._sender_handler
+        # the universe of every frame of the bank up to the last used one, 0 if a frame is not used.
+        # The frames behind the last used one are not read, so a big bank with few outputs is read fast
+        self._universes: List[int] = []
+        self._handler.attach_frame_bank(bank, ())
+
+    def set(self, universe: int, name: str, value) -> None:
+        setattr(self._sender[universe], name, value)
+
+    def activate(self, universe: int, index: int, settings: dict, dmx_data: bytes) -> None:
+        self._sender.activate_output(universe)
+        for name, value in settings.items():
+            setattr(self._sender[universe], name, value)
+        self._sender[universe].dmx_data = dmx_data
+        if index >= len(self._universes):
+            self._universes.extend([0] * (index + 1 - len(self._universes)))
+        self._universes[index] = universe
+        self._handler.attach_frame_bank(self._bank, tuple(self._universes))
+
+    def deactivate(self, universe: int) -> None:
+        self._universes[self._universes.index(universe)] = 0
+        while self._universes and not self._universes[-1]:
+            self._universes.pop()
+        self._handler.attach_frame_bank(self._bank, tuple(self._universes))
+        self._sender.deactivate_output(universe)
+
+    def flush(self, sync_universe: int, universes: List[int]) -> bool:
+        self._handler.read_frame_bank()
+        self._handler.send_out_synchronized(sync_universe, {universe: self._sender[universe] for universe in universes},
+                                            time.monotonic())
+        return True
+
+    def manual_flush(self, manual_flush: bool) -> None:
+        self._sender.manual_flush = manual_flush
+
+    def spin_time(self, spin_time: float) -> None:
+        self._sender.spin_time = spin_time
+
+    def start(self) -> None:
+        self._sender.start()
+
+    def close(self) -> None:
+        self._sender.stop()
+        self._handler.attach_frame_bank(None)
+        self._bank.close()
@@ -0,0 +1,114 @@
+# This file is under MIT license. The license file can be obtained in the root directory of this module.
+
+import socket
+import time
+
+import pytest
+
+import sacn
+from sacn.messages.data_packet import DataPacket
+from sacn.sending.sender_socket_base import DEFAULT_PORT
+
+
+@pytest.fixture
+def receiver():
+    # the workers always send to the default port
+    receiver_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        receiver_socket.bind(('127.0.0.1', DEFAULT_PORT))
+    except OSError:
+        pytest.skip('The default port is not available')
+    receiver_socket.settimeout(2)
+    yield receiver_socket
+    receiver_socket.close()
+
+
+def receive(receiver_socket, duration: float) -> list:
+    packets = []
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        try:
+            data = receiver_socket.recv(1024)
+        except socket.timeout:
+            break
+        packets.append(DataPacket.make_data_packet(data) if len(data) >= 126 else data)
+    return packets
+
+
+def test_invalid_workers(monkeypatch):
+    # no socket is created
+    monkeypatch.setattr(sacn.sACNsender, '__init__', lambda *args: pytest.fail('sACNsender was initialized'))
+    with pytest.raises(ValueError):
+        sacn.ShardedSACNSender(workers=0)
+
+
+def test_sharded_sender(receiver, monkeypatch):
+    sender = sacn.ShardedSACNSender(bind_address='127.0.0.1', bind_port=0, fps=40, universeDiscovery=False, workers=2)
+    try:
+        for universe in range(1, 5):
+            sender.activate_output(universe)
+            sender[universe].dmx_data = (universe,)
+        sender[4].priority = 150
+        # the outputs are split evenly across the workers
+        assert [len(shard.universes) for shard in sender._shards] == [2, 2]
+        # this process does not know when the workers send out a change
+        with pytest.raises(RuntimeError):
+            sender[1].suppressed_sends
+        sender.start()
+        receive(receiver, 0.3)
+        sender[1].set_channel(2, 7)
+        packets = receive(receiver, 1)
+
+        for universe in range(1, 5):
+            universe_packets = [packet for packet in packets if packet.universe == universe]
+            assert universe_packets[-1].dmxData[0] == universe
+            # every universe is counted by one worker, so its sequence numbers increase by one
+            sequences = [packet.sequence for packet in universe_packets]
+            assert all((b - a) % 256 == 1 for a, b in zip(sequences, sequences[1:]))
+        assert [packet for packet in packets if packet.universe == 1][-1].dmxData[0:2] == (1, 7)
+        assert [packet for packet in packets if packet.universe == 4][-1].priority == 150
+
+        # the frames of an attached bank are handed over to the workers
+        bank = sacn.FrameBank(2)
+        try:
+            sender.attach_frame_bank(bank, [3, 4])
+            bank.write(0, (11,))
+            bank.write(1, (12,))
+            packets = receive(receiver, 0.5)
+            assert [packet for packet in packets if packet.universe == 3][-1].dmxData[0] == 11
+            assert [packet for packet in packets if packet.universe == 4][-1].dmxData[0] == 12
+            sender.detach_frame_bank()
+        finally:
+            bank.close()
+            bank.unlink()
+
+        # with manual flush, the workers only send when flushed and the sync packet follows all data packets
+        sender.manual_flush = True
+        receiver.settimeout(0.2)
+        receive(receiver, 1)
+        receiver.settimeout(2)
+        sender[2].dmx_data = (9,)
+        sender[3].dmx_data = (10,)
+        # the sync packet is send via multicast by this process
+        sync_packets = []
+        monkeypatch.setattr(sender._sender_handler.socket, 'send_multicast',
+                            lambda data, destination, ttl: sync_packets.append(data))
+        sender.flush([2, 3])
+        packets = [DataPacket.make_data_packet(receiver.recv(1024)) for _ in range(0, 2)]
+        assert sorted(packet.dmxData[0] for packet in packets) == [9, 10]
+        assert all(packet.syncAddr == 63999 for packet in packets)
+        assert len(sync_packets) == 1
+        assert sync_packets[0].syncAddr == 63999
+        with pytest.raises(ValueError):
+            sender.flush([5])
+
+        # the worker sends the stream termination packets
+        sender.deactivate_output(2)
+        packet = DataPacket.make_data_packet(receiver.recv(1024))
+        assert packet.universe == 2
+        assert packet.option_StreamTerminated
+        assert sender.get_active_outputs() == (1, 3, 4)
+    finally:
+        sender.stop()
+    assert all(not shard._process.is_alive() for shard in sender._shards)